@@ -1,9 +1,60 @@
-from flask import Flask, jsonify
+import time
+from flask import Flask, Response, g, jsonify, request
 from flask_cors import CORS
 from config import Config
 from routes.translate_routes import translate_bp
 from routes.voice_routes import voice_bp
-from utils.db_helper import db, DATABASE_SCHEMA
+from utils.admission import Overloaded
+from utils.db_helper import DATABASE_SCHEMA
+from utils.metrics import finish_trace, metrics, sample_lines, start_trace
+from utils.services import ServiceContainer
+
+METRICS_MIMETYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def health_status(services: ServiceContainer) -> dict:
+    """Payload of /api/health (shared with the ASGI app)"""
+    model_status = services.ml.get_model_status()
+    return {
+        'status': 'healthy',
+        'ready': model_status['ready'],
+        'models': model_status['models'],
+        'inference': services.ml.get_inference_stats(),
+        'service': 'Garhwali-Kumaoni Voice Assistant API',
+        'version': '1.0.0',
+        'endpoints': {
+            'translate': '/api/translate',
+            'voice_to_text': '/api/voice-to-text',
+            'text_to_speech': '/api/text-to-speech',
+            'voice_translate': '/api/voice-translate'
+        },
+        'translation_cache': services.ml.get_cache_stats(),
+        'translation_batcher': services.ml.get_batcher_stats(),
+        'asr_cache': services.ml.get_asr_cache_stats(),
+        'tts_cache': services.ml.get_tts_cache_stats(),
+        'db_writer': services.get_db_writer_stats(),
+        'admission': services.get_admission_stats()
+    }
+
+
+def metrics_text(services: ServiceContainer) -> str:
+    """Payload of /api/metrics (shared with the ASGI app)"""
+    lines = [metrics.render().rstrip('\n')]
+    if services.admission is not None:
+        endpoints = services.admission.stats()['endpoints']
+        lines += sample_lines('voice_assistant_admission_active', 'gauge', 'Requests holding an admission slot',
+                              {(('endpoint', name),): stats['active'] for name, stats in endpoints.items()})
+        lines += sample_lines('voice_assistant_admission_waiting', 'gauge', 'Requests queued for an admission slot',
+                              {(('endpoint', name),): stats['waiting'] for name, stats in endpoints.items()})
+        lines += sample_lines('voice_assistant_admission_rejected_total', 'counter', 'Requests answered with 503',
+                              {(('endpoint', name),): stats['rejected'] + stats['timed_out']
+                               for name, stats in endpoints.items()})
+    if services.ml.translation_batcher is not None:
+        lines += sample_lines('voice_assistant_translation_batcher_queued', 'gauge',
+                              'Translations waiting for a micro-batch',
+                              {(): services.ml.translation_batcher.stats()['queued']})
+    return '\n'.join(lines) + '\n'
+
 
 def create_app():
     """Application factory"""
@@ -15,25 +66,71 @@ def create_app():
     # Enable CORS
     CORS(app, origins=Config.CORS_ORIGINS)
     
+    # Shared services (ML integration, database), built once per worker
+    services = ServiceContainer(Config)
+    services.init_app(app)
+    
+    # Load ASR/translation/TTS models once per process
+    if Config.PRELOAD_MODELS:
+        services.ml.models.preload(background=Config.PRELOAD_MODELS_IN_BACKGROUND)
+    
+    # Synthesize common phrases ahead of the first request
+    if Config.TTS_CACHE_PREWARM:
+        services.ml.warm_tts_cache(background=Config.PRELOAD_MODELS_IN_BACKGROUND)
+    
     # Register blueprints
     app.register_blueprint(translate_bp, url_prefix='/api')
     app.register_blueprint(voice_bp, url_prefix='/api')
     
+    # Request latency per endpoint, and optionally a Server-Timing header
+    # with the stages timed while handling the request
+    if Config.METRICS_ENABLED:
+        @app.before_request
+        def start_request_timer():
+            g.request_start = time.perf_counter()
+            if Config.METRICS_SERVER_TIMING:
+                start_trace()
+        
+        @app.after_request
+        def record_request_time(response):
+            start = g.pop('request_start', None)
+            if start is not None:
+                elapsed = time.perf_counter() - start
+                metrics.observe('request', request.endpoint or 'unmatched', elapsed)
+                if Config.METRICS_SERVER_TIMING:
+                    response.headers['Server-Timing'] = finish_trace(elapsed)
+            return response
+    
+    # Admission control: limited endpoints take a slot before the view runs
+    # and give it back once the response (streamed ones too) is closed
+    if services.admission is not None:
+        @app.before_request
+        def admit_request():
+            with metrics.stage('queue'):
+                g.admission_ticket = services.admission.acquire(request.endpoint)
+        
+        @app.after_request
+        def release_on_close(response):
+            ticket = g.pop('admission_ticket', None)
+            if ticket is not None:
+                response.call_on_close(lambda: services.admission.release(ticket))
+            return response
+        
+        @app.teardown_request
+        def release_on_error(error):
+            services.admission.release(g.pop('admission_ticket', None))
+    
     # Health check endpoint
     @app.route('/api/health', methods=['GET'])
     def health_check():
         """API health check"""
-        return jsonify({
-            'status': 'healthy',
-            'service': 'Garhwali-Kumaoni Voice Assistant API',
-            'version': '1.0.0',
-            'endpoints': {
-                'translate': '/api/translate',
-                'voice_to_text': '/api/voice-to-text',
-                'text_to_speech': '/api/text-to-speech',
-                'voice_translate': '/api/voice-translate'
-            }
-        }), 200
+        return jsonify(health_status(services)), 200
+    
+    # Prometheus metrics endpoint
+    @app.route('/api/metrics', methods=['GET'])
+    def get_metrics():
+        """Stage and request latency histograms in Prometheus text format"""
+        return Response(metrics_text(services), content_type=METRICS_MIMETYPE)
     
     # Database schema endpoint (for documentation)
     @app.route('/api/db-schema', methods=['GET'])
@@ -41,7 +138,7 @@ def create_app():
         """Get database schema"""
         return jsonify({
             'schema': DATABASE_SCHEMA,
-            'stats': db.get_stats()
+            'stats': services.db.get_stats()
         }), 200
     
     # Supported languages endpoint
@@ -68,6 +165,13 @@ def create_app():
             'message': 'Something went wrong on our end'
         }), 500
     
+    @app.errorhandler(Overloaded)
+    def overloaded(error):
+        return jsonify({
+            'error': 'Service Unavailable',
+            'message': str(error)
+        }), 503, {'Retry-After': str(error.retry_after)}
+    
     return app
 
 
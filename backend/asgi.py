@@ -0,0 +1,151 @@
+"""
+ASGI entry point: the same API served by Quart with async views.
+
+Uploads and streamed audio are received on the event loop and model calls
+are awaited on a bounded thread pool (Config.ASYNC_MODEL_WORKERS), so one
+process can hold many slow uploads and streaming connections.
+
+Run with:
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+"""
+import time
+from quart import Quart, Response, g, jsonify, request
+from quart_cors import cors
+from app import METRICS_MIMETYPE, health_status, metrics_text
+from config import Config
+from routes.async_translate_routes import translate_bp
+from routes.async_voice_routes import voice_bp
+from utils.admission import Overloaded
+from utils.db_helper import DATABASE_SCHEMA
+from utils.aio import call_on_close, run_blocking
+from utils.metrics import finish_trace, metrics, start_trace
+from utils.services import ServiceContainer
+
+
+def create_asgi_app():
+    """Application factory for ASGI servers"""
+    app = Quart(__name__)
+    
+    # Load configuration
+    app.config.from_object(Config)
+    app.config['BODY_TIMEOUT'] = Config.ASGI_BODY_TIMEOUT
+    app.config['RESPONSE_TIMEOUT'] = Config.ASGI_RESPONSE_TIMEOUT
+    
+    # Enable CORS
+    app = cors(app, allow_origin=Config.CORS_ORIGINS)
+    
+    # Shared services (ML integration, database), built once per worker
+    services = ServiceContainer(Config)
+    services.init_app(app)
+    
+    # Load ASR/translation/TTS models once per process
+    if Config.PRELOAD_MODELS:
+        services.ml.models.preload(background=Config.PRELOAD_MODELS_IN_BACKGROUND)
+    
+    # Synthesize common phrases ahead of the first request
+    if Config.TTS_CACHE_PREWARM:
+        services.ml.warm_tts_cache(background=Config.PRELOAD_MODELS_IN_BACKGROUND)
+    
+    # Flush queued database rows when the server stops, not only at exit
+    @app.after_serving
+    async def close_services():
+        services.close()
+    
+    # Register blueprints
+    app.register_blueprint(translate_bp, url_prefix='/api')
+    app.register_blueprint(voice_bp, url_prefix='/api')
+    
+    # Request latency per endpoint, and optionally a Server-Timing header
+    # with the stages timed while handling the request
+    if Config.METRICS_ENABLED:
+        @app.before_request
+        async def start_request_timer():
+            g.request_start = time.perf_counter()
+            if Config.METRICS_SERVER_TIMING:
+                start_trace()
+        
+        @app.after_request
+        async def record_request_time(response):
+            start = g.pop('request_start', None)
+            if start is not None:
+                elapsed = time.perf_counter() - start
+                metrics.observe('request', request.endpoint or 'unmatched', elapsed)
+                if Config.METRICS_SERVER_TIMING:
+                    response.headers['Server-Timing'] = finish_trace(elapsed)
+            return response
+    
+    # Admission control: queued requests wait on the event loop, not on a
+    # thread; the slot is given back once the response body has been sent
+    if services.admission is not None:
+        @app.before_request
+        async def admit_request():
+            with metrics.stage('queue'):
+                g.admission_ticket = await services.admission.acquire_async(request.endpoint)
+        
+        @app.after_request
+        async def release_on_close(response):
+            ticket = g.pop('admission_ticket', None)
+            if ticket is not None:
+                call_on_close(response, lambda: services.admission.release(ticket))
+            return response
+        
+        @app.teardown_request
+        async def release_on_error(error):
+            services.admission.release(g.pop('admission_ticket', None))
+    
+    # Health check endpoint
+    @app.route('/api/health', methods=['GET'])
+    async def health_check():
+        """API health check"""
+        return jsonify(await run_blocking(health_status, services)), 200
+    
+    # Prometheus metrics endpoint
+    @app.route('/api/metrics', methods=['GET'])
+    async def get_metrics():
+        """Stage and request latency histograms in Prometheus text format"""
+        return Response(await run_blocking(metrics_text, services), content_type=METRICS_MIMETYPE)
+    
+    # Database schema endpoint (for documentation)
+    @app.route('/api/db-schema', methods=['GET'])
+    async def get_db_schema():
+        """Get database schema"""
+        return jsonify({
+            'schema': DATABASE_SCHEMA,
+            'stats': await run_blocking(services.db.get_stats)
+        }), 200
+    
+    # Supported languages endpoint
+    @app.route('/api/languages', methods=['GET'])
+    async def get_languages():
+        """Get supported languages"""
+        return jsonify({
+            'input_languages': Config.SUPPORTED_INPUT_LANGUAGES,
+            'output_languages': Config.SUPPORTED_OUTPUT_LANGUAGES
+        }), 200
+    
+    # Error handlers
+    @app.errorhandler(404)
+    async def not_found(error):
+        return jsonify({
+            'error': 'Not Found',
+            'message': 'The requested endpoint does not exist'
+        }), 404
+    
+    @app.errorhandler(500)
+    async def internal_error(error):
+        return jsonify({
+            'error': 'Internal Server Error',
+            'message': 'Something went wrong on our end'
+        }), 500
+    
+    @app.errorhandler(Overloaded)
+    async def overloaded(error):
+        return jsonify({
+            'error': 'Service Unavailable',
+            'message': str(error)
+        }), 503, {'Retry-After': str(error.retry_after)}
+    
+    return app
+
+
+app = create_asgi_app()
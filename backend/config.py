@@ -3,6 +3,9 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# ml/ next to backend/, independent of the working directory
+ML_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ml'))
+
 class Config:
     """Application configuration"""
     
@@ -24,4 +27,118 @@ class Config:
     
     # File upload settings
     MAX_AUDIO_SIZE = 10 * 1024 * 1024  # 10MB
-    ALLOWED_AUDIO_FORMATS = ['wav', 'mp3', 'ogg']
\ No newline at end of file
+    ALLOWED_AUDIO_FORMATS = ['wav', 'mp3', 'ogg']
+    # Translation result cache
+    TRANSLATION_CACHE_ENABLED = True
+    TRANSLATION_CACHE_MAX_ENTRIES = 10000
+    TRANSLATION_CACHE_MAX_BYTES = 16 * 1024 * 1024  # 16MB
+    TRANSLATION_CACHE_TTL = 60 * 60  # seconds
+
+    # Batch translation
+    MAX_BATCH_SIZE = 64  # texts per /api/translate/batch request
+    TRANSLATION_MICRO_BATCH_SIZE = 16  # texts per model call
+
+    # Approximate phrase matching when ASR output is slightly off
+    TRANSLATION_FUZZY_MATCH = True
+    TRANSLATION_FUZZY_MAX_RATIO = 0.25  # grapheme edits allowed per grapheme of input
+
+    # Model loading
+    ASR_MODEL = 'mock'  # or a Whisper model size, e.g. 'base'
+    PRELOAD_MODELS = True
+    PRELOAD_MODELS_IN_BACKGROUND = True
+    MODEL_LOAD_RETRY_SECONDS = 1.0  # wait before retrying a failed load, doubled per failure
+    MODEL_LOAD_RETRY_MAX_SECONDS = 60.0
+
+    # Database
+    DATABASE_BACKEND = os.getenv('DATABASE_BACKEND', 'memory')  # 'memory' or 'sqlite'
+    DATABASE_PATH = os.getenv('DATABASE_PATH', 'voice_assistant.db')
+    RECENT_TRANSLATIONS_WINDOW = 1000  # rows kept for /api/translations/recent
+
+    # Write-behind logging of translations/voice samples
+    WRITE_BEHIND_ENABLED = True
+    WRITE_BEHIND_QUEUE_SIZE = 10000
+    WRITE_BEHIND_BATCH_SIZE = 200
+    WRITE_BEHIND_FLUSH_INTERVAL = 0.05  # seconds
+    WRITE_BEHIND_POLICY = 'block'  # 'block' or 'drop' when the queue is full
+    WRITE_BEHIND_BLOCK_TIMEOUT = 1.0  # seconds
+
+    # Streaming ASR (/api/voice-to-text/stream)
+    STREAM_READ_SIZE = 3200  # bytes per read, 100ms of 16kHz 16-bit mono
+    VAD_FRAME_MS = 30
+    VAD_ENERGY_THRESHOLD = 0.01  # RMS on a [-1, 1] scale (about -40 dBFS)
+    VAD_SILENCE_MS = 500  # silence that ends an utterance
+    STREAM_PARTIAL_INTERVAL_MS = 500
+    STREAM_MAX_SEGMENT_MS = 15000
+
+    # Voice translation pipeline: worker threads per stage
+    PIPELINE_ASR_WORKERS = 2
+    PIPELINE_TRANSLATION_WORKERS = 2
+    PIPELINE_TTS_WORKERS = 2
+
+    # Synthesized audio cache (memory LRU in front of a disk store)
+    TTS_CACHE_ENABLED = True
+    TTS_CACHE_MAX_ENTRIES = 1024
+    TTS_CACHE_MAX_BYTES = 64 * 1024 * 1024  # 64MB in memory
+    TTS_CACHE_DIR = os.getenv('TTS_CACHE_DIR', os.path.join(ML_DIR, 'tts_cache'))  # '' disables the disk tier
+    TTS_CACHE_DISK_MAX_BYTES = 1024 * 1024 * 1024  # 1GB on disk, shared by all workers using the directory
+    TTS_CACHE_DISK_RESCAN_SECONDS = 30  # how often a worker recounts files written by the others
+    TTS_CACHE_PREWARM = True  # synthesize phrasebook outputs at startup
+
+    # ASR result cache keyed by a hash of the decoded audio
+    ASR_CACHE_ENABLED = True
+    ASR_CACHE_MAX_ENTRIES = 1024
+    ASR_CACHE_NEAR_DUPLICATE = False  # also match re-recordings by spectral fingerprint
+    ASR_CACHE_MAX_DISTANCE = 6  # differing fingerprint bits (of 64) for a near-duplicate
+
+    # ASGI mode (uvicorn asgi:app)
+    ASYNC_MODEL_WORKERS = 8  # threads running blocking model/database calls
+    ASGI_BODY_TIMEOUT = 300  # seconds to receive a request body (slow uploads, live streams)
+    ASGI_RESPONSE_TIMEOUT = 300  # seconds to send a streamed response
+
+    # Where models run: 'inprocess' (each HTTP worker loads them) or 'pool'
+    # (shared inference worker processes behind a Unix socket)
+    INFERENCE_BACKEND = os.getenv('INFERENCE_BACKEND', 'inprocess')
+    # Socket and authkey live in a per-user directory that must be mode 0700
+    INFERENCE_RUNTIME_DIR = os.getenv('INFERENCE_RUNTIME_DIR', os.path.join(
+        os.getenv('XDG_RUNTIME_DIR') or os.getenv('TMPDIR', '/tmp'),
+        f'voice_assistant-{os.getuid()}' if hasattr(os, 'getuid') else 'voice_assistant'))
+    INFERENCE_SOCKET = os.getenv('INFERENCE_SOCKET', os.path.join(INFERENCE_RUNTIME_DIR, 'inference.sock'))
+    INFERENCE_AUTHKEY = os.getenv('INFERENCE_AUTHKEY', '')  # empty: random key kept next to the socket
+    INFERENCE_POOL_AUTOSTART = True  # first HTTP worker starts the server if it is not running
+    INFERENCE_STARTUP_TIMEOUT = 30  # seconds to wait for an autostarted server
+    INFERENCE_TIMEOUT = 120  # seconds per call
+    # Per model: worker processes (= concurrent batches), batch size, max wait for a batch to fill
+    INFERENCE_POOL = {
+        'asr': {'workers': 1, 'max_batch_size': 8, 'max_wait_ms': 10},
+        'translation': {'workers': 1, 'max_batch_size': 64, 'max_wait_ms': 5},
+        'tts': {'workers': 1, 'max_batch_size': 8, 'max_wait_ms': 10}
+    }
+
+    # Micro-batching of single /api/translate calls: concurrent requests for
+    # the same language pair are gathered into one translate_batch call
+    TRANSLATION_BATCHER_ENABLED = True
+    TRANSLATION_BATCHER_MAX_BATCH_SIZE = 16  # texts gathered per batch (one micro-batch)
+    TRANSLATION_BATCHER_MAX_WAIT_MS = 2  # longest a request waits for others to join (0: only while the model is busy)
+    TRANSLATION_BATCHER_WORKERS = 1  # batches run concurrently (>1 only helps if the model can overlap calls)
+
+    # Admission control: per-endpoint concurrency limits with a bounded wait
+    # queue; overflow is answered at once with 503 + Retry-After
+    ADMISSION_ENABLED = True
+    ADMISSION_MAX_CONCURRENT = 16  # limited requests running at once, all endpoints together
+    ADMISSION_RESERVED_SLOTS = 4  # of those, kept free for 'high' priority endpoints
+    ADMISSION_QUEUE_TIMEOUT = 10  # seconds a request may wait for a slot
+    ADMISSION_RETRY_AFTER = 1  # minimum Retry-After, seconds
+    # Endpoint -> running requests, waiting requests, priority ('high', 'normal' or 'low')
+    ADMISSION_LIMITS = {
+        'translate.translate': {'max_concurrent': 12, 'max_queue': 64, 'priority': 'high'},
+        'translate.translate_batch': {'max_concurrent': 4, 'max_queue': 16, 'priority': 'normal'},
+        'voice.text_to_speech': {'max_concurrent': 4, 'max_queue': 16, 'priority': 'normal'},
+        'voice.voice_to_text': {'max_concurrent': 4, 'max_queue': 8, 'priority': 'low'},
+        'voice.voice_to_text_stream': {'max_concurrent': 8, 'max_queue': 0, 'priority': 'low'},  # held for a whole recording
+        'voice.voice_translate': {'max_concurrent': 2, 'max_queue': 8, 'priority': 'low'}
+    }
+
+    # Stage timers and /api/metrics (Prometheus text format)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+    METRICS_SERVER_TIMING = False  # add a Server-Timing header with per-stage durations
+    METRICS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)  # seconds
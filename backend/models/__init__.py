@@ -1,7 +1,6 @@
-from .user import User
-from .task import Task
+from .schemas import TranslationRequest, TranslationResponse, VoiceRequest
 
 # models/__init__.py
 
 
-__all__ = ['User', 'Task']
\ No newline at end of file
+__all__ = ['TranslationRequest', 'TranslationResponse', 'VoiceRequest']
@@ -1,8 +1,27 @@
-from flask import Blueprint
-from .users import users_bp
-from .voice import voice_bp
+import importlib
 
-# Import your route modules
+# Blueprints are imported on first access: the WSGI app only needs the
+# Flask routes and the ASGI app only the Quart ones
+_EXPORTS = {
+    'translate_bp': 'routes.translate_routes',
+    'voice_bp': 'routes.voice_routes',
+    'async_translate_bp': ('routes.async_translate_routes', 'translate_bp'),
+    'async_voice_bp': ('routes.async_voice_routes', 'voice_bp')
+}
 
 # Export blueprints
-__all__ = ['users_bp', 'voice_bp']
\ No newline at end of file
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    target = _EXPORTS.get(name)
+    if target is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = target if isinstance(target, tuple) else (target, name)
+    value = getattr(importlib.import_module(module_name), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,73 @@
+from quart import Blueprint, request, jsonify
+from routes.common import (RequestError, batch_payload, internal_error, parse_batch,
+                           parse_translation, recent_payload, translation_payload, translation_row)
+from utils.aio import get_services, run_blocking
+
+# ASGI twin of routes/translate_routes.py: same endpoints and responses
+# (parsing and payloads come from routes.common), with model and database
+# calls awaited on the services' executor
+translate_bp = Blueprint('translate', __name__)
+
+
+@translate_bp.route('/translate', methods=['POST'])
+async def translate():
+    """Translate text from Garhwali/Kumaoni to Hindi/English (see translate_routes.translate)"""
+    services = get_services()
+    
+    try:
+        # Validate request
+        trans_request = parse_translation(await request.get_json())
+        
+        # Call ML translation service
+        translation_result = await run_blocking(
+            services.ml.translate_text,
+            text=trans_request.text,
+            input_lang=trans_request.input_language,
+            output_lang=trans_request.output_language
+        )
+        
+        # Save to database
+        await run_blocking(services.db_writer.save_translation,
+                           **translation_row(trans_request, translation_result))
+        
+        return jsonify(translation_payload(trans_request, translation_result)), 200
+    
+    except RequestError as e:
+        return jsonify(e.payload()), e.status
+    
+    except Exception as e:
+        return jsonify(internal_error(e)), 500
+
+
+@translate_bp.route('/translate/batch', methods=['POST'])
+async def translate_batch():
+    """Translate multiple texts at once (see translate_routes.translate_batch)"""
+    services = get_services()
+    
+    try:
+        texts, input_lang, output_lang = parse_batch(await request.get_json())
+        
+        translations = await run_blocking(services.ml.translate_batch, texts, input_lang, output_lang)
+        
+        return jsonify(batch_payload(texts, translations)), 200
+    
+    except RequestError as e:
+        return jsonify(e.payload()), e.status
+    
+    except Exception as e:
+        return jsonify(internal_error(e)), 500
+
+
+@translate_bp.route('/translations/recent', methods=['GET'])
+async def get_recent_translations():
+    """Get recent translations from database"""
+    services = get_services()
+    
+    try:
+        limit = request.args.get('limit', 10, type=int)
+        recent = await run_blocking(services.db.get_recent_translations, limit=limit)
+        
+        return jsonify(recent_payload(recent)), 200
+    
+    except Exception as e:
+        return jsonify(internal_error(e)), 500
@@ -0,0 +1,187 @@
+from quart import Blueprint, Response, request, jsonify, send_file, stream_with_context
+from routes.common import (JSON_MIMETYPE, MULTIPART_MIMETYPE, NDJSON_MIMETYPE, NEGOTIATED_ENDPOINTS,
+                           VOICE_TRANSLATE_OFFERS, RequestError, StreamTranscription, audio_format,
+                           base64_audio, check_audio_format, internal_error, multipart, ndjson, negotiate,
+                           parse_base64_audio, parse_tts, parse_voice_translate, stream_error_event,
+                           tts_payload, voice_to_text_payload, voice_translate_data, voice_translate_parts)
+from utils.aio import get_services, iterate_blocking, run_blocking
+from utils.audio import UnsupportedAudioFormat
+from utils.metrics import metrics
+
+# ASGI twin of routes/voice_routes.py: same endpoints and responses
+# (parsing and payloads come from routes.common). Uploads and streams are
+# received on the event loop, so only the model calls themselves occupy
+# executor threads.
+voice_bp = Blueprint('voice', __name__)
+
+
+@voice_bp.after_request
+async def _vary_on_accept(response):
+    if request.endpoint in NEGOTIATED_ENDPOINTS:
+        response.vary.add('Accept')
+    return response
+
+
+async def _read_upload():
+    """(audio_file, form) of a multipart upload, received without holding a thread"""
+    files = await request.files
+    form = await request.form
+    return files.get('audio_file'), form
+
+
+@voice_bp.route('/voice-to-text', methods=['POST'])
+async def voice_to_text():
+    """Convert voice audio to text using ASR (see voice_routes.voice_to_text)"""
+    services = get_services()
+    
+    try:
+        audio_file, form = await _read_upload()
+        if audio_file is not None:
+            # Audio sent as file
+            input_lang = form.get('input_language', 'garhwali').lower()
+            audio_path = audio_file.filename
+            fmt = check_audio_format(audio_format(audio_file.filename))
+            
+            # Process with ASR straight from the upload buffer
+            asr_result = await run_blocking(services.ml.speech_to_text, audio_file.stream,
+                                            input_lang, audio_format=fmt)
+        
+        else:
+            # Audio sent as base64
+            audio_bytes, input_lang, fmt, audio_path = parse_base64_audio(await request.get_json())
+            
+            # Process with ASR
+            asr_result = await run_blocking(services.ml.speech_to_text, audio_bytes,
+                                            input_lang, audio_format=fmt)
+        
+        # Save to database
+        await run_blocking(
+            services.db_writer.save_voice_sample,
+            audio_path=audio_path,
+            language=input_lang,
+            transcription=asr_result.get('text', '')
+        )
+        
+        return jsonify(voice_to_text_payload(asr_result, input_lang)), 200
+    
+    except RequestError as e:
+        return jsonify(e.payload()), e.status
+    
+    except Exception as e:
+        return jsonify(internal_error(e)), 500
+
+
+@voice_bp.route('/voice-to-text/stream', methods=['POST'])
+async def voice_to_text_stream():
+    """Streaming ASR with partial transcripts (see voice_routes.voice_to_text_stream)"""
+    services = get_services()
+    input_lang = request.args.get('input_language', 'garhwali').lower()
+    
+    @stream_with_context
+    async def events():
+        transcription = StreamTranscription(lambda audio: services.ml.speech_to_text(audio, input_lang))
+        
+        try:
+            async for chunk in request.body:
+                for event in await run_blocking(transcription.feed, chunk):
+                    yield ndjson(event).encode('utf-8')
+            
+            for event in await run_blocking(transcription.finish):
+                yield ndjson(event).encode('utf-8')
+        
+        except UnsupportedAudioFormat as e:
+            yield ndjson(stream_error_event(e)).encode('utf-8')
+            return
+        
+        await run_blocking(
+            services.db_writer.save_voice_sample,
+            audio_path='stream',
+            language=input_lang,
+            transcription=transcription.transcription
+        )
+        yield ndjson(transcription.end_event()).encode('utf-8')
+    
+    return Response(events(), mimetype=NDJSON_MIMETYPE)
+
+
+@voice_bp.route('/text-to-speech', methods=['POST'])
+async def text_to_speech():
+    """Convert text to speech audio (see voice_routes.text_to_speech)"""
+    services = get_services()
+    
+    try:
+        mimetype = negotiate(request.accept_mimetypes, await run_blocking(services.ml.tts_formats))
+        text, language = parse_tts(await request.get_json())
+        
+        if mimetype != JSON_MIMETYPE:
+            # Cached audio goes out straight from disk
+            cached_path = await run_blocking(services.ml.cached_speech_path, text, language, mimetype)
+            if cached_path is not None:
+                return await send_file(cached_path, mimetype=mimetype, conditional=True)
+            
+            # Raw audio, sent chunk by chunk as TTS produces it
+            audio_chunks = services.ml.text_to_speech_stream(text, language, mimetype)
+            return Response(stream_with_context(iterate_blocking)(audio_chunks), mimetype=mimetype)
+        
+        # Generate speech using TTS
+        audio_bytes = await run_blocking(services.ml.text_to_speech, text, language)
+        
+        return jsonify(tts_payload(audio_bytes, text, language)), 200
+    
+    except RequestError as e:
+        return jsonify(e.payload()), e.status
+    
+    except Exception as e:
+        return jsonify(internal_error(e)), 500
+
+
+@voice_bp.route('/voice-translate', methods=['POST'])
+async def voice_translate():
+    """Voice → ASR → Translation → TTS (see voice_routes.voice_translate)"""
+    services = get_services()
+    
+    try:
+        mimetype = negotiate(request.accept_mimetypes, VOICE_TRANSLATE_OFFERS)
+        
+        with metrics.stage('upload'):
+            audio_file, form = await _read_upload()
+        input_lang, output_lang, fmt = parse_voice_translate(audio_file, form)
+        
+        # ASR → Translation → TTS, pipelined per utterance
+        result = await run_blocking(services.ml.voice_translate, audio_file.stream,
+                                    input_lang, output_lang, audio_format=fmt)
+        
+        # Save to database
+        with metrics.stage('db_write'):
+            await run_blocking(
+                services.db_writer.save_translation,
+                input_text=result['input_text'],
+                output_text=result['output_text'],
+                input_lang=input_lang,
+                output_lang=output_lang,
+                confidence=result['translation_confidence']
+            )
+        
+        response_data = voice_translate_data(result, input_lang, output_lang)
+        
+        if mimetype == 'audio/wav':
+            return Response(result['output_audio'], mimetype=mimetype)
+        
+        if mimetype == MULTIPART_MIMETYPE:
+            with metrics.stage('encode'):
+                body, content_type = multipart(voice_translate_parts(response_data, result['output_audio']))
+                body = b''.join(body)
+            return Response(body, content_type=content_type)
+        
+        with metrics.stage('encode'):
+            response_data['output_audio'] = base64_audio(result['output_audio'])
+        return jsonify({
+            'success': True,
+            'data': response_data
+        }), 200
+    
+    except RequestError as e:
+        return jsonify(e.payload()), e.status
+    
+    except Exception as e:
+        return jsonify(internal_error(e)), 500
@@ -0,0 +1,344 @@
+"""
+Request parsing, validation and response payloads shared by the WSGI
+blueprints (translate_routes, voice_routes) and their ASGI twins
+(async_translate_routes, async_voice_routes).
+
+Nothing here touches Flask or Quart objects: views pass in the parsed
+JSON or form data and wrap the returned dicts with their framework's
+jsonify, so both apps validate and answer requests the same way.
+"""
+
+import base64
+import json
+import os
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from config import Config
+from models.schemas import TranslationRequest, TranslationResponse
+from utils.audio import UnsupportedAudioFormat, WavStreamParser
+from utils.streaming_asr import StreamingTranscriber
+
+JSON_MIMETYPE = 'application/json'
+MULTIPART_MIMETYPE = 'multipart/mixed'
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# Endpoints whose response type depends on the Accept header
+NEGOTIATED_ENDPOINTS = ('voice.text_to_speech', 'voice.voice_translate')
+
+# Response types of /voice-translate besides JSON
+VOICE_TRANSLATE_OFFERS = (MULTIPART_MIMETYPE, 'audio/wav')
+
+
+class RequestError(Exception):
+    """Invalid request, answered with status and {'error', 'message'}"""
+    
+    def __init__(self, error: str, message: Optional[str] = None, status: int = 400):
+        super().__init__(message or error)
+        self.error = error
+        self.message = message
+        self.status = status
+    
+    def payload(self) -> Dict:
+        if self.message is None:
+            return {'error': self.error}
+        return {'error': self.error, 'message': self.message}
+
+
+def internal_error(error: Exception) -> Dict:
+    """Payload of a 500 response"""
+    return {
+        'error': 'Internal server error',
+        'message': str(error)
+    }
+
+
+# ===== CONTENT NEGOTIATION =====
+
+def negotiate(accept_mimetypes, offers: Iterable[str]) -> str:
+    """
+    Response type for the request's Accept header.
+    
+    Base64 JSON is the first offer, so clients that send no Accept header,
+    */* or application/json keep getting JSON.
+    
+    Raises:
+        RequestError (406) when the client accepts none of the offers
+    """
+    offers = [JSON_MIMETYPE] + list(offers)
+    if not accept_mimetypes:
+        return JSON_MIMETYPE
+    mimetype = accept_mimetypes.best_match(offers)
+    if mimetype is None:
+        raise RequestError('Not acceptable', f'Response can be one of {", ".join(offers)}', status=406)
+    return mimetype
+
+
+def multipart(parts: Iterable[Tuple[str, bytes]]) -> Tuple[Iterator[bytes], str]:
+    """(body chunks, content type) of a multipart/mixed response with (mimetype, bytes) parts"""
+    boundary = uuid.uuid4().hex
+    
+    def body():
+        for mimetype, payload in parts:
+            yield (f'--{boundary}\r\nContent-Type: {mimetype}\r\n'
+                   f'Content-Length: {len(payload)}\r\n\r\n').encode('ascii')
+            yield payload
+            yield b'\r\n'
+        yield f'--{boundary}--\r\n'.encode('ascii')
+    
+    return body(), f'{MULTIPART_MIMETYPE}; boundary={boundary}'
+
+
+# ===== TRANSLATION =====
+
+def parse_translation(data: Optional[Dict]) -> TranslationRequest:
+    """Validated TranslationRequest from the JSON body of /translate"""
+    if not data:
+        raise RequestError('No data provided', 'Request body must be JSON')
+    
+    trans_request = TranslationRequest(
+        text=data.get('text', ''),
+        input_language=data.get('input_language', '').lower(),
+        output_language=data.get('output_language', '').lower()
+    )
+    try:
+        trans_request.validate()
+    except ValueError as e:
+        raise RequestError('Validation error', str(e))
+    return trans_request
+
+
+def translation_row(trans_request: TranslationRequest, result: Dict) -> Dict:
+    """Arguments of save_translation for a /translate result"""
+    return {
+        'input_text': trans_request.text,
+        'output_text': result['translated_text'],
+        'input_lang': trans_request.input_language,
+        'output_lang': trans_request.output_language,
+        'confidence': result.get('confidence')
+    }
+
+
+def translation_payload(trans_request: TranslationRequest, result: Dict) -> Dict:
+    response = TranslationResponse(
+        input_text=trans_request.text,
+        output_text=result['translated_text'],
+        input_language=trans_request.input_language,
+        output_language=trans_request.output_language,
+        timestamp=datetime.now().isoformat(),
+        confidence_score=result.get('confidence')
+    )
+    
+    return {
+        'success': True,
+        'data': {
+            'input': response.input_text,
+            'output': response.output_text,
+            'input_language': response.input_language,
+            'output_language': response.output_language,
+            'confidence': response.confidence_score,
+            'timestamp': response.timestamp
+        }
+    }
+
+
+def parse_batch(data: Dict) -> Tuple[List[str], str, str]:
+    """(texts, input_lang, output_lang) from the JSON body of /translate/batch"""
+    texts = data.get('texts', [])
+    input_lang = data.get('input_language', '').lower()
+    output_lang = data.get('output_language', '').lower()
+    
+    if not texts or not isinstance(texts, list):
+        raise RequestError('Invalid input', 'texts must be a non-empty list')
+    
+    if len(texts) > Config.MAX_BATCH_SIZE:
+        raise RequestError('Invalid input', f'texts must contain at most {Config.MAX_BATCH_SIZE} items')
+    
+    if not all(isinstance(text, str) for text in texts):
+        raise RequestError('Invalid input', 'texts must be a list of strings')
+    
+    return texts, input_lang, output_lang
+
+
+def batch_payload(texts: List[str], translations: List[Dict]) -> Dict:
+    results = [{
+        'input': text,
+        'output': translation['translated_text'],
+        'confidence': translation.get('confidence')
+    } for text, translation in zip(texts, translations)]
+    
+    return {
+        'success': True,
+        'data': {
+            'translations': results,
+            'count': len(results)
+        }
+    }
+
+
+def recent_payload(recent: List[Dict]) -> Dict:
+    return {
+        'success': True,
+        'data': {
+            'translations': recent,
+            'count': len(recent)
+        }
+    }
+
+
+# ===== VOICE =====
+
+def audio_format(filename: str) -> str:
+    """Audio format from the uploaded file name (defaults to wav)"""
+    _, ext = os.path.splitext(filename or '')
+    return ext[1:].lower() or 'wav'
+
+
+def check_audio_format(fmt: str) -> str:
+    if fmt not in Config.ALLOWED_AUDIO_FORMATS:
+        raise RequestError('Unsupported audio format',
+                           f'{fmt} is not one of {", ".join(Config.ALLOWED_AUDIO_FORMATS)}')
+    return fmt
+
+
+def parse_base64_audio(data: Dict) -> Tuple[bytes, str, str, str]:
+    """(audio_bytes, input_lang, audio_format, audio_path) from a base64 /voice-to-text body"""
+    audio_base64 = data.get('audio_data')
+    input_lang = data.get('input_language', 'garhwali').lower()
+    
+    if not audio_base64:
+        raise RequestError('No audio data provided')
+    
+    audio_bytes = base64.b64decode(audio_base64)
+    fmt = check_audio_format(data.get('audio_format', 'wav').lower())
+    return audio_bytes, input_lang, fmt, f'base64_audio.{fmt}'
+
+
+def voice_to_text_payload(asr_result: Dict, input_lang: str) -> Dict:
+    return {
+        'success': True,
+        'data': {
+            'text': asr_result.get('text'),
+            'confidence': asr_result.get('confidence'),
+            'language': input_lang
+        }
+    }
+
+
+def parse_tts(data: Dict) -> Tuple[str, str]:
+    """(text, language) from the JSON body of /text-to-speech"""
+    text = data.get('text', '')
+    language = data.get('language', 'hindi').lower()
+    
+    if not text:
+        raise RequestError('No text provided')
+    return text, language
+
+
+def base64_audio(audio_bytes: bytes) -> str:
+    """Audio as sent in JSON responses"""
+    return base64.b64encode(audio_bytes).decode('utf-8')
+
+
+def tts_payload(audio_bytes: bytes, text: str, language: str) -> Dict:
+    return {
+        'success': True,
+        'data': {
+            'audio_data': base64_audio(audio_bytes),
+            'text': text,
+            'language': language
+        }
+    }
+
+
+def parse_voice_translate(audio_file, form) -> Tuple[str, str, str]:
+    """(input_lang, output_lang, audio_format) of a /voice-translate upload"""
+    if audio_file is None:
+        raise RequestError('No audio file provided')
+    
+    input_lang = form.get('input_language', 'garhwali').lower()
+    output_lang = form.get('output_language', 'hindi').lower()
+    return input_lang, output_lang, check_audio_format(audio_format(audio_file.filename))
+
+
+def voice_translate_data(result: Dict, input_lang: str, output_lang: str) -> Dict:
+    """'data' of a /voice-translate response, without the audio"""
+    return {
+        'input_text': result['input_text'],
+        'output_text': result['output_text'],
+        'input_language': input_lang,
+        'output_language': output_lang,
+        'asr_confidence': result['asr_confidence'],
+        'translation_confidence': result['translation_confidence'],
+        'segments': result['segments'],
+        'timings': result['timings']
+    }
+
+
+def voice_translate_parts(response_data: Dict, audio: bytes) -> List[Tuple[str, bytes]]:
+    """Parts of a multipart /voice-translate response: the JSON, then the WAV"""
+    text_part = json.dumps({'success': True, 'data': response_data}, ensure_ascii=False)
+    return [
+        ('application/json; charset=utf-8', text_part.encode('utf-8')),
+        ('audio/wav', audio)
+    ]
+
+
+# ===== STREAMING ASR =====
+
+class StreamTranscription:
+    """
+    One /voice-to-text/stream request: WAV bytes in, transcript events out.
+    
+    feed() and finish() run ASR on finished utterances, so the ASGI view
+    calls them on the executor.
+    """
+    
+    def __init__(self, transcribe: Callable, config=Config):
+        self.transcribe = transcribe
+        self.config = config
+        self.parser = WavStreamParser()
+        self.transcriber = None
+        self.finals = []
+    
+    def feed(self, chunk: bytes) -> List[Dict]:
+        samples = self.parser.feed(chunk)
+        # Created with the header, so a header-only upload ends cleanly
+        if self.transcriber is None and self.parser.header_parsed:
+            self.transcriber = StreamingTranscriber(
+                self.transcribe,
+                sample_rate=self.parser.sample_rate,
+                frame_ms=self.config.VAD_FRAME_MS,
+                energy_threshold=self.config.VAD_ENERGY_THRESHOLD,
+                silence_ms=self.config.VAD_SILENCE_MS,
+                partial_interval_ms=self.config.STREAM_PARTIAL_INTERVAL_MS,
+                max_segment_ms=self.config.STREAM_MAX_SEGMENT_MS
+            )
+        if samples is None:
+            return []
+        return self._collect(self.transcriber.feed(samples))
+    
+    def finish(self) -> List[Dict]:
+        """Events of the last utterance; raises UnsupportedAudioFormat if no WAV header came"""
+        if self.transcriber is None:
+            raise UnsupportedAudioFormat('No WAVE audio received')
+        return self._collect(self.transcriber.finish())
+    
+    def _collect(self, events: List[Dict]) -> List[Dict]:
+        self.finals.extend(event['text'] for event in events if event['type'] == 'final')
+        return events
+    
+    @property
+    def transcription(self) -> str:
+        return ' '.join(self.finals)
+    
+    def end_event(self) -> Dict:
+        return {'type': 'end', 'segments': self.transcriber.segments}
+
+
+def stream_error_event(error: UnsupportedAudioFormat) -> Dict:
+    return {'type': 'error', 'error': 'Unsupported audio format', 'message': str(error)}
+
+
+def ndjson(event: Dict) -> str:
+    return json.dumps(event, ensure_ascii=False) + '\n'
@@ -1,15 +1,22 @@
-from flask import Blueprint, request, jsonify
-import base64
-import os
-from models.schemas import VoiceRequest
-from utils.ml_integration import MLIntegration
-from utils.db_helper import DatabaseHelper
+from flask import Blueprint, Response, request, jsonify, send_file, stream_with_context
+from config import Config
+from routes.common import (JSON_MIMETYPE, MULTIPART_MIMETYPE, NDJSON_MIMETYPE, NEGOTIATED_ENDPOINTS,
+                           VOICE_TRANSLATE_OFFERS, RequestError, StreamTranscription, audio_format,
+                           base64_audio, check_audio_format, internal_error, multipart, ndjson, negotiate,
+                           parse_base64_audio, parse_tts, parse_voice_translate, stream_error_event,
+                           tts_payload, voice_to_text_payload, voice_translate_data, voice_translate_parts)
+from utils.audio import UnsupportedAudioFormat
+from utils.metrics import metrics
+from utils.services import get_services
 
 voice_bp = Blueprint('voice', __name__)
 
-# Initialize services
-ml_integration = MLIntegration()
-db = DatabaseHelper()
+
+@voice_bp.after_request
+def _vary_on_accept(response):
+    if request.endpoint in NEGOTIATED_ENDPOINTS:
+        response.vary.add('Accept')
+    return response
 
 
 @voice_bp.route('/voice-to-text', methods=['POST'])
@@ -25,71 +32,87 @@ def voice_to_text():
     
     OR send as multipart/form-data with audio file
     """
+    services = get_services()
+    
     try:
         # Check if audio sent as file or base64
         if 'audio_file' in request.files:
             # Audio sent as file
             audio_file = request.files['audio_file']
             input_lang = request.form.get('input_language', 'garhwali').lower()
+            audio_path = audio_file.filename
+            fmt = check_audio_format(audio_format(audio_file.filename))
             
-            # Save temporarily
-            temp_path = f'/tmp/{audio_file.filename}'
-            audio_file.save(temp_path)
-            
-            # Process with ASR
-            asr_result = ml_integration.speech_to_text(temp_path, input_lang)
-            
-            # Clean up
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-            
+            # Process with ASR straight from the upload buffer
+            asr_result = services.ml.speech_to_text(audio_file.stream, input_lang, audio_format=fmt)
+        
         else:
             # Audio sent as base64
-            data = request.get_json()
-            audio_base64 = data.get('audio_data')
-            input_lang = data.get('input_language', 'garhwali').lower()
-            
-            if not audio_base64:
-                return jsonify({
-                    'error': 'No audio data provided'
-                }), 400
-            
-            # Decode base64
-            audio_bytes = base64.b64decode(audio_base64)
-            
-            # Save temporarily
-            temp_path = '/tmp/temp_audio.wav'
-            with open(temp_path, 'wb') as f:
-                f.write(audio_bytes)
+            audio_bytes, input_lang, fmt, audio_path = parse_base64_audio(request.get_json())
             
             # Process with ASR
-            asr_result = ml_integration.speech_to_text(temp_path, input_lang)
-            
-            # Clean up
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+            asr_result = services.ml.speech_to_text(audio_bytes, input_lang, audio_format=fmt)
         
         # Save to database
-        db.save_voice_sample(
-            audio_path='temp_audio.wav',
+        services.db_writer.save_voice_sample(
+            audio_path=audio_path,
             language=input_lang,
             transcription=asr_result.get('text', '')
         )
         
-        return jsonify({
-            'success': True,
-            'data': {
-                'text': asr_result.get('text'),
-                'confidence': asr_result.get('confidence'),
-                'language': input_lang
-            }
-        }), 200
-        
+        return jsonify(voice_to_text_payload(asr_result, input_lang)), 200
+    
+    except RequestError as e:
+        return jsonify(e.payload()), e.status
+    
     except Exception as e:
-        return jsonify({
-            'error': 'Internal server error',
-            'message': str(e)
-        }), 500
+        return jsonify(internal_error(e)), 500
+
+
+@voice_bp.route('/voice-to-text/stream', methods=['POST'])
+def voice_to_text_stream():
+    """
+    Streaming ASR with partial transcripts
+    
+    Request: WAV audio as the request body, typically sent with
+    Transfer-Encoding: chunked while it is being recorded
+    Query params: input_language (default garhwali)
+    
+    Response: newline-delimited JSON events, sent as soon as they are ready
+    {"type": "partial", "segment": 0, "text": "...", "start_ms": 0, "end_ms": 600}
+    {"type": "final", "segment": 0, "text": "...", "start_ms": 0, "end_ms": 1800}
+    {"type": "end", "segments": 1}
+    """
+    services = get_services()
+    input_lang = request.args.get('input_language', 'garhwali').lower()
+    stream = request.stream
+    
+    def events():
+        transcription = StreamTranscription(lambda audio: services.ml.speech_to_text(audio, input_lang))
+        
+        try:
+            while True:
+                chunk = stream.read(Config.STREAM_READ_SIZE)
+                if not chunk:
+                    break
+                for event in transcription.feed(chunk):
+                    yield ndjson(event)
+            
+            for event in transcription.finish():
+                yield ndjson(event)
+        
+        except UnsupportedAudioFormat as e:
+            yield ndjson(stream_error_event(e))
+            return
+        
+        services.db_writer.save_voice_sample(
+            audio_path='stream',
+            language=input_lang,
+            transcription=transcription.transcription
+        )
+        yield ndjson(transcription.end_event())
+    
+    return Response(stream_with_context(events()), mimetype=NDJSON_MIMETYPE)
 
 
 @voice_bp.route('/text-to-speech', methods=['POST'])
@@ -102,38 +125,37 @@ def text_to_speech():
         "text": "मुझे पेट दर्द है",
         "language": "hindi"
     }
+    
+    Response: base64 audio in JSON by default; with Accept: audio/wav
+    (or another type the TTS model supports) the raw audio is streamed
+    with chunked transfer encoding as it is synthesized.
     """
+    services = get_services()
+    
     try:
-        data = request.get_json()
-        
-        text = data.get('text', '')
-        language = data.get('language', 'hindi').lower()
-        
-        if not text:
-            return jsonify({
-                'error': 'No text provided'
-            }), 400
+        mimetype = negotiate(request.accept_mimetypes, services.ml.tts_formats())
+        text, language = parse_tts(request.get_json())
+        
+        if mimetype != JSON_MIMETYPE:
+            # Cached audio goes out straight from disk (sendfile where the server supports it)
+            cached_path = services.ml.cached_speech_path(text, language, mimetype)
+            if cached_path is not None:
+                return send_file(cached_path, mimetype=mimetype, conditional=True)
+            
+            # Raw audio, sent chunk by chunk as TTS produces it
+            audio_chunks = services.ml.text_to_speech_stream(text, language, mimetype)
+            return Response(stream_with_context(audio_chunks), mimetype=mimetype)
         
         # Generate speech using TTS
-        audio_bytes = ml_integration.text_to_speech(text, language)
-        
-        # Convert to base64 for response
-        audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'audio_data': audio_base64,
-                'text': text,
-                'language': language
-            }
-        }), 200
+        audio_bytes = services.ml.text_to_speech(text, language)
         
+        return jsonify(tts_payload(audio_bytes, text, language)), 200
+    
+    except RequestError as e:
+        return jsonify(e.payload()), e.status
+    
     except Exception as e:
-        return jsonify({
-            'error': 'Internal server error',
-            'message': str(e)
-        }), 500
+        return jsonify(internal_error(e)), 500
 
 
 @voice_bp.route('/voice-translate', methods=['POST'])
@@ -142,63 +164,57 @@ def voice_translate():
     Complete voice translation pipeline:
     Voice → ASR → Translation → TTS
     
+    Utterances found in the audio flow through the three stages
+    concurrently; per-stage timings are included in the response.
+    
     Request: audio file
-    Response: translated text + audio
+    Response: translated text + base64 audio in JSON by default;
+    Accept: multipart/mixed returns a JSON part followed by the raw WAV part,
+    Accept: audio/wav returns the translated audio alone
     """
+    services = get_services()
+    
     try:
-        if 'audio_file' not in request.files:
-            return jsonify({
-                'error': 'No audio file provided'
-            }), 400
-        
-        audio_file = request.files['audio_file']
-        input_lang = request.form.get('input_language', 'garhwali').lower()
-        output_lang = request.form.get('output_language', 'hindi').lower()
-        
-        # Save audio temporarily
-        temp_audio_path = f'/tmp/{audio_file.filename}'
-        audio_file.save(temp_audio_path)
-        
-        # Step 1: ASR (Voice → Text)
-        asr_result = ml_integration.speech_to_text(temp_audio_path, input_lang)
-        input_text = asr_result.get('text', '')
+        mimetype = negotiate(request.accept_mimetypes, VOICE_TRANSLATE_OFFERS)
         
-        # Step 2: Translation
-        translation = ml_integration.translate_text(input_text, input_lang, output_lang)
-        output_text = translation.get('translated_text', '')
+        # Receive and parse the upload
+        with metrics.stage('upload'):
+            audio_file = request.files.get('audio_file')
+        input_lang, output_lang, fmt = parse_voice_translate(audio_file, request.form)
         
-        # Step 3: TTS (Text → Voice)
-        output_audio = ml_integration.text_to_speech(output_text, output_lang)
-        output_audio_base64 = base64.b64encode(output_audio).decode('utf-8')
+        # ASR → Translation → TTS, pipelined per utterance
+        result = services.ml.voice_translate(audio_file.stream, input_lang, output_lang,
+                                             audio_format=fmt)
         
         # Save to database
-        db.save_translation(
-            input_text=input_text,
-            output_text=output_text,
-            input_lang=input_lang,
-            output_lang=output_lang,
-            confidence=translation.get('confidence')
-        )
-        
-        # Clean up
-        if os.path.exists(temp_audio_path):
-            os.remove(temp_audio_path)
-        
+        with metrics.stage('db_write'):
+            services.db_writer.save_translation(
+                input_text=result['input_text'],
+                output_text=result['output_text'],
+                input_lang=input_lang,
+                output_lang=output_lang,
+                confidence=result['translation_confidence']
+            )
+        
+        response_data = voice_translate_data(result, input_lang, output_lang)
+        
+        if mimetype == 'audio/wav':
+            return Response(result['output_audio'], mimetype=mimetype)
+        
+        if mimetype == MULTIPART_MIMETYPE:
+            with metrics.stage('encode'):
+                body, content_type = multipart(voice_translate_parts(response_data, result['output_audio']))
+            return Response(body, content_type=content_type)
+        
+        with metrics.stage('encode'):
+            response_data['output_audio'] = base64_audio(result['output_audio'])
         return jsonify({
             'success': True,
-            'data': {
-                'input_text': input_text,
-                'output_text': output_text,
-                'input_language': input_lang,
-                'output_language': output_lang,
-                'output_audio': output_audio_base64,
-                'asr_confidence': asr_result.get('confidence'),
-                'translation_confidence': translation.get('confidence')
-            }
+            'data': response_data
         }), 200
-        
+    
+    except RequestError as e:
+        return jsonify(e.payload()), e.status
+    
     except Exception as e:
-        return jsonify({
-            'error': 'Internal server error',
-            'message': str(e)
-        }), 500
\ No newline at end of file
+        return jsonify(internal_error(e)), 500
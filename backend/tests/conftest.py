@@ -0,0 +1,53 @@
+import os
+import sys
+
+import pytest
+
+# Tests import the backend the way app.py does (config, utils, routes)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config  # noqa: E402
+
+
+class AppConfig(Config):
+    """Config of apps built by the create_app fixture: nothing runs in the background"""
+    PRELOAD_MODELS_IN_BACKGROUND = False
+    TTS_CACHE_PREWARM = False
+    WRITE_BEHIND_ENABLED = False
+    TTS_CACHE_DIR = ''  # memory tier only, nothing written under ml/
+
+
+@pytest.fixture
+def create_app(monkeypatch):
+    """create_app() with AppConfig; the services of every app built are closed afterwards"""
+    import app as app_module
+    from utils.services import EXTENSION_NAME
+
+    monkeypatch.setattr(app_module, 'Config', AppConfig)
+    apps = []
+
+    def factory():
+        app = app_module.create_app()
+        apps.append(app)
+        return app
+
+    yield factory
+    for app in apps:
+        app.extensions[EXTENSION_NAME].close()
+
+
+@pytest.fixture
+def client(create_app):
+    return create_app().test_client()
+
+
+@pytest.fixture
+def asgi_client(monkeypatch):
+    """Test client of the ASGI app (create_asgi_app) built with AppConfig"""
+    import asgi
+    from utils.services import EXTENSION_NAME
+
+    monkeypatch.setattr(asgi, 'Config', AppConfig)
+    app = asgi.create_asgi_app()
+    yield app.test_client()
+    app.extensions[EXTENSION_NAME].close()
@@ -0,0 +1,15 @@
+from utils.db_helper import DatabaseHelper
+
+
+def test_recent_translations_newest_first():
+    db = DatabaseHelper(recent_window=3)
+    ids = [db.save_translation(str(i), 'out', 'garhwali', 'hindi') for i in range(5)]
+
+    assert [row['id'] for row in db.get_recent_translations(2)] == ids[:-3:-1]
+    # Beyond the recent window it falls back to the full table
+    assert [row['id'] for row in db.get_recent_translations(10)] == ids[::-1]
+    assert db.get_recent_translations(0) == []
+    assert db.get_translation_by_id(ids[2])['input_text'] == '2'
+    assert db.get_translation_by_id(0) is None
+    assert db.get_translation_by_id(6) is None
+
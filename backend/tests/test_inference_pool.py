@@ -0,0 +1,87 @@
+import os
+import threading
+import time
+from multiprocessing import AuthenticationError
+
+import pytest
+
+from conftest import AppConfig
+from utils.inference_pool import InferenceClient, InferenceServer, load_authkey
+
+
+class EchoModel:
+    version = 'echo'
+
+    def translate_batch(self, texts, input_lang, output_lang):
+        return [{'translated_text': text, 'confidence': 1.0} for text in texts]
+
+
+@pytest.fixture
+def pool_config(tmp_path):
+    class PoolConfig(AppConfig):
+        INFERENCE_SOCKET = str(tmp_path / 'run' / 'inference.sock')
+        INFERENCE_AUTHKEY = ''
+        INFERENCE_POOL = {name: {'workers': 1, 'max_batch_size': 4, 'max_wait_ms': 1}
+                          for name in ('asr', 'translation', 'tts')}
+    return PoolConfig
+
+
+@pytest.fixture
+def server(pool_config):
+    server = InferenceServer(pool_config, loaders={'translation': EchoModel})
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    deadline = time.monotonic() + 10
+    while not os.path.exists(pool_config.INFERENCE_SOCKET):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    yield server
+    server.close()
+
+
+def test_socket_directory_is_private(pool_config):
+    key = load_authkey(pool_config)
+
+    directory = os.path.dirname(pool_config.INFERENCE_SOCKET)
+    assert os.stat(directory).st_mode & 0o777 == 0o700
+    # Every process of this user reads the same key
+    assert load_authkey(pool_config) == key and len(key) == 32
+
+
+def test_shared_directory_is_refused(pool_config):
+    os.makedirs(os.path.dirname(pool_config.INFERENCE_SOCKET))
+    os.chmod(os.path.dirname(pool_config.INFERENCE_SOCKET), 0o777)
+
+    with pytest.raises(PermissionError):
+        load_authkey(pool_config)
+
+
+def test_clients_must_know_the_key(server, pool_config):
+    client = InferenceClient(pool_config.INFERENCE_SOCKET, load_authkey(pool_config), timeout=10)
+    assert client.call('translation', 'translate_batch', ['namaste'], 'garhwali', 'hindi') == [
+        {'translated_text': 'namaste', 'confidence': 1.0}]
+
+    with pytest.raises(AuthenticationError):
+        InferenceClient(pool_config.INFERENCE_SOCKET, b'guess', timeout=10).connect()
+
+
+class CrashingModel(EchoModel):
+    def translate_batch(self, texts, input_lang, output_lang):
+        if 'crash' in texts:
+            os._exit(3)
+        return super().translate_batch(texts, input_lang, output_lang)
+
+
+def test_dead_worker_is_replaced(pool_config):
+    server = InferenceServer(pool_config, loaders={'translation': CrashingModel})
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    while not os.path.exists(pool_config.INFERENCE_SOCKET):
+        time.sleep(0.01)
+    client = InferenceClient(pool_config.INFERENCE_SOCKET, load_authkey(pool_config), timeout=10)
+
+    with pytest.raises(RuntimeError, match='exited with code 3'):
+        client.call('translation', 'translate_batch', ['crash'], 'garhwali', 'hindi')
+    # The only worker's slot was freed and a new worker serves the next batch
+    assert client.call('translation', 'translate_batch', ['ok'], 'garhwali', 'hindi')[0]['translated_text'] == 'ok'
+    stats = server.pools['translation'].stats()
+    assert stats['restarts'] == 1 and stats['alive'] == 1 and stats['inflight_batches'] == 0
+    server.close()
@@ -0,0 +1,59 @@
+import pytest
+
+from utils.model_registry import ModelRegistry
+
+
+class FlakyLoader:
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError(f'load failed ({self.calls})')
+        return object()
+
+
+def test_failed_load_is_retried_after_backoff(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr('utils.model_registry.time.monotonic', lambda: now[0])
+    loader = FlakyLoader(failures=2)
+    registry = ModelRegistry({'asr': loader}, retry_after=1.0, max_retry_after=60.0)
+
+    with pytest.raises(RuntimeError, match=r'\(1\)'):
+        registry.get('asr')
+    # Within the backoff the recorded error is raised without reloading
+    with pytest.raises(RuntimeError, match=r'\(1\)'):
+        registry.get('asr')
+    assert loader.calls == 1
+
+    now[0] += 1.0
+    with pytest.raises(RuntimeError, match=r'\(2\)'):
+        registry.get('asr')
+    # Backoff doubled after the second failure
+    now[0] += 1.5
+    with pytest.raises(RuntimeError, match=r'\(2\)'):
+        registry.get('asr')
+    assert loader.calls == 2
+
+    now[0] += 0.5
+    model = registry.get('asr')
+    assert loader.calls == 3
+    assert registry.get('asr') is model
+    status = registry.status()['models']['asr']
+    assert status['ready'] and status['error'] is None and status['failures'] == 0
+
+
+def test_backoff_is_capped(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr('utils.model_registry.time.monotonic', lambda: now[0])
+    loader = FlakyLoader(failures=10)
+    registry = ModelRegistry({'tts': loader}, retry_after=1.0, max_retry_after=4.0)
+
+    for _ in range(5):
+        with pytest.raises(RuntimeError):
+            registry.get('tts')
+        now[0] += 4.0
+    assert loader.calls == 5
+    assert registry.status()['models']['tts']['failures'] == 5
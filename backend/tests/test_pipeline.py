@@ -0,0 +1,60 @@
+import threading
+
+import pytest
+
+from utils.pipeline import StagedPipeline
+
+
+def test_items_pass_through_all_stages_in_order():
+    pipeline = StagedPipeline([('double', 2), ('label', 1)])
+    try:
+        states, timings = pipeline.run([1, 2, 3], {
+            'double': lambda state: state['item'] * 2,
+            'label': lambda state: f"{state['item']}->{state['double']}"
+        })
+    finally:
+        pipeline.shutdown()
+
+    assert [state['label'] for state in states] == ['1->2', '2->4', '3->6']
+    assert set(timings) == {'double_ms', 'label_ms', 'double_max_ms', 'label_max_ms', 'wall_ms'}
+
+
+def test_handler_error_is_raised_from_run():
+    pipeline = StagedPipeline([('first', 1), ('second', 1)])
+
+    def fail(state):
+        raise ValueError(state['item'])
+
+    try:
+        with pytest.raises(ValueError, match='bad'):
+            pipeline.run(['bad'], {'first': lambda state: None, 'second': fail})
+    finally:
+        pipeline.shutdown()
+
+
+def test_next_stage_shut_down_fails_the_item():
+    pipeline = StagedPipeline([('first', 1), ('second', 1)])
+    release = threading.Event()
+
+    def first(state):
+        release.wait(5)
+
+    result = {}
+    runner = threading.Thread(target=lambda: result.update(
+        error=_run_error(pipeline, ['a'], {'first': first, 'second': lambda state: None})), daemon=True)
+    runner.start()
+    pipeline._executors['second'].shutdown()
+    release.set()
+    runner.join(5)
+
+    assert not runner.is_alive(), 'run() hung after the next stage could not be submitted'
+    assert isinstance(result['error'], RuntimeError)
+    pipeline.shutdown()
+
+
+def _run_error(pipeline, items, handlers):
+    try:
+        pipeline.run(items, handlers)
+    except Exception as e:
+        return e
+    return None
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+CASES = [
+    ('/api/translate', {'text': 'म्यर पेट दुखाण छ', 'input_language': 'garhwali', 'output_language': 'hindi'},
+     200, None),
+    ('/api/translate', {}, 400, {'error': 'No data provided', 'message': 'Request body must be JSON'}),
+    ('/api/translate', {'text': 'x', 'input_language': 'tamil', 'output_language': 'hindi'},
+     400, {'error': 'Validation error', 'message': 'Unsupported input language: tamil'}),
+    ('/api/translate/batch', {'texts': [], 'input_language': 'garhwali', 'output_language': 'hindi'},
+     400, {'error': 'Invalid input', 'message': 'texts must be a non-empty list'}),
+    ('/api/translate/batch', {'texts': [1], 'input_language': 'garhwali', 'output_language': 'hindi'},
+     400, {'error': 'Invalid input', 'message': 'texts must be a list of strings'}),
+    ('/api/voice-to-text', {'input_language': 'kumaoni'}, 400, {'error': 'No audio data provided'}),
+    ('/api/voice-to-text', {'audio_data': 'AAAA', 'audio_format': 'exe'},
+     400, {'error': 'Unsupported audio format', 'message': 'exe is not one of wav, mp3, ogg'}),
+    ('/api/text-to-speech', {'text': ''}, 400, {'error': 'No text provided'}),
+]
+
+
+def wsgi_post(client, url, body, headers):
+    response = client.post(url, json=body, headers=headers)
+    result = response.status_code, response.get_json(), response.headers.get('Vary', '')
+    response.close()
+    return result
+
+
+def asgi_post(client, url, body, headers):
+    async def post():
+        response = await client.post(url, json=body, headers=headers)
+        return response.status_code, await response.get_json(), response.headers.get('Vary', '')
+    return asyncio.run(post())
+
+
+@pytest.fixture(params=['wsgi', 'asgi'])
+def post(request):
+    """POST JSON to either app: (status, JSON body, Vary header)"""
+    if request.param == 'wsgi':
+        client, send = request.getfixturevalue('client'), wsgi_post
+    else:
+        client, send = request.getfixturevalue('asgi_client'), asgi_post
+    return lambda url, body, headers=None: send(client, url, body, headers or {})
+
+
+@pytest.mark.parametrize('url, body, status, expected', CASES)
+def test_both_apps_validate_alike(post, url, body, status, expected):
+    code, payload, _ = post(url, body)
+
+    assert code == status
+    if expected is not None:
+        assert payload == expected
+    else:
+        assert payload['success'] is True
+
+
+def test_not_acceptable(post):
+    code, payload, vary = post('/api/text-to-speech', {'text': 'पानी'}, {'Accept': 'image/png'})
+
+    assert code == 406
+    assert payload['error'] == 'Not acceptable'
+    assert 'Accept' in vary
@@ -0,0 +1,77 @@
+import pytest
+
+from conftest import AppConfig
+from utils import ml_integration
+from utils.services import EXTENSION_NAME, ServiceContainer
+
+
+@pytest.fixture
+def loader_calls(monkeypatch):
+    """Count model loads in a fresh process-wide model registry"""
+    calls = {}
+    loaders = ml_integration.model_loaders
+
+    def counting_loaders(config=AppConfig):
+        def counted(name, loader):
+            def load():
+                calls[name] = calls.get(name, 0) + 1
+                return loader()
+            return load
+        return {name: counted(name, loader) for name, loader in loaders(config).items()}
+
+    monkeypatch.setattr(ml_integration, 'model_loaders', counting_loaders)
+    monkeypatch.setattr(ml_integration, '_registry', None)
+    return calls
+
+
+def test_each_model_loads_once_per_process(loader_calls, create_app):
+    first = create_app()
+    second = create_app()
+
+    assert loader_calls == {'asr': 1, 'translation': 1, 'tts': 1}
+    assert first.extensions[EXTENSION_NAME].ml.models is second.extensions[EXTENSION_NAME].ml.models
+
+
+def test_blueprints_share_one_container(loader_calls, create_app):
+    app = create_app()
+    services = app.extensions[EXTENSION_NAME]
+    assert isinstance(services, ServiceContainer)
+    client = app.test_client()
+
+    response = client.post('/api/translate', json={
+        'text': 'म्यर पेट दुखाण छ',
+        'input_language': 'garhwali',
+        'output_language': 'hindi'
+    })
+    assert response.status_code == 200
+    response.close()
+    response = client.post('/api/text-to-speech', json={'text': 'पानी', 'language': 'hindi'})
+    assert response.status_code == 200
+    response.close()
+
+    # Built once, and the same instances the routes used
+    assert services.ml is services.get('ml')
+    assert services.db is services.get('db')
+    assert loader_calls == {'asr': 1, 'translation': 1, 'tts': 1}
+    response = client.get('/api/db-schema')
+    assert response.get_json()['stats']['total_translations'] == 1
+    response.close()
+
+
+def test_one_exit_hook_per_container(monkeypatch):
+    hooks = []
+    monkeypatch.setattr('utils.services.atexit.register', hooks.append)
+    monkeypatch.setattr('utils.services.atexit.unregister', hooks.remove)
+
+    class WriteBehindConfig(AppConfig):
+        WRITE_BEHIND_ENABLED = True
+
+    services = ServiceContainer(WriteBehindConfig)
+    writer, executor = services.db_writer, services.executor
+    assert hooks == [services.close]
+
+    writer.save_translation('a', 'b', 'garhwali', 'hindi')
+    services.close()
+    assert hooks == []
+    assert len(services.db.translations) == 1
+    assert executor._shutdown
@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+from config import Config
+from utils.tts_cache import DiskAudioCache
+
+
+@pytest.mark.skipif('TTS_CACHE_DIR' in os.environ, reason='TTS_CACHE_DIR is set')
+def test_default_dir_does_not_depend_on_cwd():
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    assert Config.TTS_CACHE_DIR == os.path.join(os.path.dirname(backend), 'ml', 'tts_cache')
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = DiskAudioCache(str(tmp_path), max_bytes=25)
+    cache.set('a', b'x' * 10)
+    cache.set('b', b'x' * 10)
+    assert cache.get('a') is not None
+    cache.set('c', b'x' * 10)
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert sorted(os.listdir(tmp_path)) == ['a.wav', 'c.wav']
+
+
+def test_cap_counts_files_of_other_processes(tmp_path):
+    # Two workers sharing the directory
+    first = DiskAudioCache(str(tmp_path), max_bytes=35, rescan_interval=0)
+    second = DiskAudioCache(str(tmp_path), max_bytes=35, rescan_interval=0)
+    for key in ('a', 'b', 'c'):
+        first.set(key, b'x' * 10)
+    second.set('d', b'x' * 10)
+
+    # The second worker saw the first one's files and evicted the oldest
+    assert second.stats()['bytes'] == 30
+    assert not (tmp_path / 'a.wav').exists()
+    assert sum(os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path)) <= 35
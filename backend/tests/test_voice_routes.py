@@ -0,0 +1,60 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from utils.audio import encode_wav
+
+
+STREAM_URL = '/api/voice-to-text/stream?input_language=garhwali'
+
+
+def wsgi_stream(client, body):
+    response = client.post(STREAM_URL, data=body, content_type='audio/wav')
+    assert response.status_code == 200
+    text = response.get_data(as_text=True)
+    response.close()
+    return text
+
+
+def asgi_stream(client, body):
+    async def post():
+        response = await client.post(STREAM_URL, data=body, headers={'Content-Type': 'audio/wav'})
+        assert response.status_code == 200
+        return await response.get_data(as_text=True)
+    return asyncio.run(post())
+
+
+@pytest.fixture(params=['wsgi', 'asgi'])
+def stream_events(request):
+    """POST a body to the streaming endpoint of either app and return its events"""
+    if request.param == 'wsgi':
+        client, post = request.getfixturevalue('client'), wsgi_stream
+    else:
+        client, post = request.getfixturevalue('asgi_client'), asgi_stream
+    return lambda body: [json.loads(line) for line in post(client, body).splitlines()]
+
+
+def test_stream_header_only_wav(stream_events):
+    header = encode_wav(np.zeros(0, dtype=np.int16), 16000)
+
+    assert stream_events(header) == [{'type': 'end', 'segments': 0}]
+
+
+def test_stream_empty_body(stream_events):
+    events = stream_events(b'')
+
+    assert [event['type'] for event in events] == ['error']
+    assert events[0]['error'] == 'Unsupported audio format'
+
+
+def test_stream_speech_ends_with_final(stream_events):
+    t = np.arange(16000) / 16000
+    tone = (np.sin(2 * np.pi * 220 * t) * 8000).astype(np.int16)
+    silence = np.zeros(16000, dtype=np.int16)
+
+    events = stream_events(encode_wav(np.concatenate([tone, silence]), 16000))
+
+    assert events[-1] == {'type': 'end', 'segments': 1}
+    assert [event['type'] for event in events].count('final') == 1
@@ -0,0 +1,44 @@
+import threading
+import time
+
+from utils.db_helper import DatabaseHelper
+from utils.write_behind import WriteBehindWriter
+
+
+class HangingDatabase(DatabaseHelper):
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def save_translations(self, rows):
+        self.release.wait()
+        return super().save_translations(rows)
+
+
+def save(writer, count):
+    for i in range(count):
+        writer.save_translation(str(i), 'out', 'garhwali', 'hindi')
+
+
+def test_close_flushes_queued_rows():
+    db = DatabaseHelper()
+    writer = WriteBehindWriter(db, batch_size=7, flush_interval=0.01)
+    save(writer, 50)
+
+    assert writer.close() is True
+    assert len(db.translations) == 50
+    assert writer.stats()['written'] == 50
+    # Closed writers drop new rows
+    assert writer.save_translation('late', 'out', 'garhwali', 'hindi') is False
+
+
+def test_close_gives_up_when_the_database_hangs():
+    db = HangingDatabase()
+    writer = WriteBehindWriter(db, max_queue=2, batch_size=1, policy='drop')
+    save(writer, 5)
+
+    start = time.monotonic()
+    assert writer.close(timeout=0.2) is False
+    assert time.monotonic() - start < 1.0
+
+    db.release.set()
@@ -0,0 +1,258 @@
+import itertools
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+PRIORITIES = ('high', 'normal', 'low')
+
+
+class Overloaded(Exception):
+    """Raised when a request can't be admitted; answered with 503 + Retry-After"""
+
+    def __init__(self, endpoint: str, reason: str, retry_after: int):
+        super().__init__(f"{endpoint} is overloaded ({reason}), retry in {retry_after}s")
+        self.endpoint = endpoint
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Limit:
+    def __init__(self, endpoint: str, max_concurrent: int, max_queue: int, priority: str):
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unsupported admission priority: {priority}")
+        self.endpoint = endpoint
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.priority = priority
+        self.rank = PRIORITIES.index(priority)
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.avg_seconds = 0.0  # moving average of time holding a slot
+        self.max_wait_ms = 0.0
+
+
+class _Waiter:
+    def __init__(self, limit: _Limit, seq: int, notify: Callable[[], None]):
+        self.limit = limit
+        self.seq = seq
+        self.notify = notify
+        self.granted = False
+        self.enqueued_at = time.monotonic()
+
+
+class Ticket:
+    """A held slot; pass it to AdmissionController.release() when the request ends"""
+
+    def __init__(self, limit: _Limit):
+        self.limit = limit
+        self.started = time.monotonic()
+        self.released = False
+
+
+class AdmissionController:
+    """
+    Per-endpoint concurrency limits in front of the model-heavy endpoints.
+
+    Each limited endpoint runs at most max_concurrent requests; further
+    requests wait in a bounded queue, and once the queue is full (or a
+    request has waited queue_timeout seconds) they are rejected with
+    Overloaded right away instead of piling up until they time out.
+
+    All limited endpoints also share max_concurrent_total slots. Waiters
+    are admitted in priority order ('high' before 'normal' before 'low'),
+    and the last reserved_slots slots are kept for 'high' requests, so
+    cheap translations keep flowing while long audio jobs fill the rest.
+    Endpoints without a limit are never queued.
+    """
+
+    def __init__(self, limits: Dict[str, Dict], max_concurrent_total: int = 16,
+                 reserved_slots: int = 0, queue_timeout: float = 10.0,
+                 retry_after: int = 1):
+        self._limits = {
+            endpoint: _Limit(endpoint, spec['max_concurrent'], spec['max_queue'],
+                             spec.get('priority', 'normal'))
+            for endpoint, spec in limits.items()
+        }
+        self.max_concurrent_total = max_concurrent_total
+        self.reserved_slots = reserved_slots
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        self.active = 0
+
+    # ===== ADMISSION =====
+
+    def acquire(self, endpoint: Optional[str]) -> Optional[Ticket]:
+        """
+        Take a slot for endpoint, waiting in its queue if needed.
+
+        Returns:
+            Ticket to release, or None if the endpoint is not limited
+
+        Raises:
+            Overloaded: the queue is full or the wait timed out
+        """
+        event = threading.Event()
+        admitted = self._enqueue(endpoint, event.set)
+        if not isinstance(admitted, _Waiter):
+            return admitted
+        if not event.wait(self.queue_timeout):
+            self._abandon(admitted, timed_out=True)
+        return self._granted(admitted)
+
+    async def acquire_async(self, endpoint: Optional[str]) -> Optional[Ticket]:
+        """acquire() for the event loop: waits without holding a thread"""
+        import asyncio  # only the ASGI app needs it; keeps WSGI startup lean
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def notify():
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+        admitted = self._enqueue(endpoint, notify)
+        if not isinstance(admitted, _Waiter):
+            return admitted
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._abandon(admitted, timed_out=True)
+        except asyncio.CancelledError:
+            # Client went away while queued
+            self._abandon(admitted, timed_out=False)
+            raise
+        return self._granted(admitted)
+
+    def release(self, ticket: Optional[Ticket]):
+        """Give a slot back and admit whoever is next"""
+        if ticket is None or ticket.released:
+            return
+        ticket.released = True
+        held = time.monotonic() - ticket.started
+        with self._lock:
+            limit = ticket.limit
+            limit.active -= 1
+            self.active -= 1
+            limit.avg_seconds = 0.9 * limit.avg_seconds + 0.1 * held if limit.avg_seconds else held
+            self._dispatch()
+
+    def _enqueue(self, endpoint: Optional[str], notify: Callable[[], None]):
+        limit = self._limits.get(endpoint)
+        if limit is None:
+            return None
+        with self._lock:
+            # Every waiter that could run has already been admitted by
+            # _dispatch, so a free slot here doesn't jump the queue
+            if self._can_run(limit):
+                self._admit(limit)
+                return Ticket(limit)
+            if limit.waiting >= limit.max_queue:
+                limit.rejected += 1
+                raise Overloaded(endpoint, 'queue full', self._retry_after(limit))
+            waiter = _Waiter(limit, next(self._seq), notify)
+            self._waiters.append(waiter)
+            limit.waiting += 1
+            limit.queued += 1
+            return waiter
+
+    def _granted(self, waiter: _Waiter) -> Ticket:
+        waited_ms = (time.monotonic() - waiter.enqueued_at) * 1000
+        with self._lock:
+            waiter.limit.max_wait_ms = max(waiter.limit.max_wait_ms, waited_ms)
+        return Ticket(waiter.limit)
+
+    def _abandon(self, waiter: _Waiter, timed_out: bool):
+        """Take a waiter out of the queue; if it was granted meanwhile, keep the slot (timeout) or hand it on"""
+        with self._lock:
+            limit = waiter.limit
+            if waiter.granted:
+                if timed_out:
+                    return
+                limit.active -= 1
+                self.active -= 1
+                self._dispatch()
+                return
+            self._waiters.remove(waiter)
+            limit.waiting -= 1
+            if timed_out:
+                limit.timed_out += 1
+                retry_after = self._retry_after(limit)
+        if timed_out:
+            raise Overloaded(limit.endpoint, 'queue timeout', retry_after)
+
+    def _can_run(self, limit: _Limit) -> bool:
+        capacity = self.max_concurrent_total - (self.reserved_slots if limit.rank else 0)
+        return limit.active < limit.max_concurrent and self.active < capacity
+
+    def _admit(self, limit: _Limit):
+        limit.active += 1
+        limit.admitted += 1
+        self.active += 1
+
+    def _dispatch(self):
+        """Admit queued requests in priority order while slots are free (lock held)"""
+        self._waiters.sort(key=lambda w: (w.limit.rank, w.seq))
+        remaining = []
+        for waiter in self._waiters:
+            # An endpoint at its own limit doesn't block other endpoints
+            if self._can_run(waiter.limit):
+                waiter.granted = True
+                waiter.limit.waiting -= 1
+                self._admit(waiter.limit)
+                waiter.notify()
+            else:
+                remaining.append(waiter)
+        self._waiters = remaining
+
+    def _retry_after(self, limit: _Limit) -> int:
+        """Seconds until the queue ahead has likely drained, from the average time per request"""
+        if not limit.avg_seconds:
+            return self.retry_after
+        rounds = (limit.waiting + 1) / limit.max_concurrent
+        return max(self.retry_after, math.ceil(rounds * limit.avg_seconds))
+
+    # ===== METRICS =====
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'active': self.active,
+                'max_concurrent_total': self.max_concurrent_total,
+                'reserved_slots': self.reserved_slots,
+                'waiting': len(self._waiters),
+                'endpoints': {
+                    limit.endpoint: {
+                        'priority': limit.priority,
+                        'active': limit.active,
+                        'max_concurrent': limit.max_concurrent,
+                        'waiting': limit.waiting,
+                        'max_queue': limit.max_queue,
+                        'admitted': limit.admitted,
+                        'queued': limit.queued,
+                        'rejected': limit.rejected,
+                        'timed_out': limit.timed_out,
+                        'avg_ms': round(limit.avg_seconds * 1000, 2),
+                        'max_wait_ms': round(limit.max_wait_ms, 2)
+                    }
+                    for limit in self._limits.values()
+                }
+            }
+
+
+def create_admission_controller(config) -> Optional[AdmissionController]:
+    """Admission controller from config, or None when admission control is disabled"""
+    if not config.ADMISSION_ENABLED:
+        return None
+    return AdmissionController(
+        config.ADMISSION_LIMITS,
+        max_concurrent_total=config.ADMISSION_MAX_CONCURRENT,
+        reserved_slots=config.ADMISSION_RESERVED_SLOTS,
+        queue_timeout=config.ADMISSION_QUEUE_TIMEOUT,
+        retry_after=config.ADMISSION_RETRY_AFTER
+    )
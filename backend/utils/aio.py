@@ -0,0 +1,60 @@
+import asyncio
+import contextvars
+import weakref
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Iterable
+from quart import Response, current_app
+from quart.wrappers.response import ResponseBody
+from utils.services import EXTENSION_NAME, ServiceContainer
+
+_DONE = object()
+
+
+def get_services() -> ServiceContainer:
+    """Service container of the current Quart app"""
+    return current_app.extensions[EXTENSION_NAME]
+
+
+async def run_blocking(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking model or database call on the services' executor, in the caller's context"""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(get_services().executor,
+                                      partial(context.run, func, *args, **kwargs))
+
+
+async def iterate_blocking(iterable: Iterable) -> AsyncIterator:
+    """Pull each item of a blocking iterator (e.g. streamed TTS) on the executor"""
+    loop = asyncio.get_running_loop()
+    executor = get_services().executor
+    iterator = iter(iterable)
+    while True:
+        item = await loop.run_in_executor(executor, next, iterator, _DONE)
+        if item is _DONE:
+            return
+        yield item
+
+
+class _CallOnCloseBody(ResponseBody):
+    """Response body that calls a function once it has been sent (or dropped)"""
+
+    def __init__(self, body: ResponseBody, callback: Callable[[], None]):
+        self.body = body
+        self.callback = callback
+        # Covers bodies the server never opens, e.g. when the client is gone
+        weakref.finalize(self, callback)
+
+    async def __aenter__(self):
+        return await self.body.__aenter__()
+
+    async def __aexit__(self, exc_type, exc_value, tb):
+        try:
+            await self.body.__aexit__(exc_type, exc_value, tb)
+        finally:
+            self.callback()
+
+
+def call_on_close(response: Response, callback: Callable[[], None]) -> Response:
+    """Quart counterpart of werkzeug's Response.call_on_close; callback may run twice"""
+    response.response = _CallOnCloseBody(response.response, callback)
+    return response
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional
+
+from utils.audio import PCMAudio
+from utils.cache import TTLCache
+from utils.lazy import lazy_import
+
+# Imported on first use, so starting a worker doesn't pay for it
+np = lazy_import('numpy')
+
+FINGERPRINT_RATE = 8000
+FINGERPRINT_BLOCKS = 9  # time blocks -> 8 rows of bits
+FINGERPRINT_BANDS = 9  # log-spaced bands -> 8 columns of bits
+FINGERPRINT_MIN_HZ = 100
+FINGERPRINT_MIN_SAMPLES = FINGERPRINT_BLOCKS * 256
+
+
+def pcm_hash(audio: PCMAudio) -> str:
+    """Content hash of decoded samples and their format"""
+    samples = np.ascontiguousarray(audio.samples)
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f'{audio.sample_rate}:{audio.channels}:{samples.dtype.str}:'.encode('ascii'))
+    digest.update(samples.data)
+    return digest.hexdigest()
+
+
+def spectral_fingerprint(audio: PCMAudio) -> Optional[int]:
+    """
+    64-bit fingerprint that survives small gain, noise and offset changes.
+
+    The trimmed signal is split into 9 time blocks and 9 log-spaced
+    frequency bands; each bit is the sign of how the energy difference
+    between neighbouring bands changes between neighbouring blocks.
+    Returns None for clips too short to fingerprint.
+    """
+    mono = audio.to_float32_mono(FINGERPRINT_RATE)
+    if not len(mono):
+        return None
+
+    # Drop leading/trailing silence so the blocks line up across recordings
+    loud = np.flatnonzero(np.abs(mono) > 0.05 * np.max(np.abs(mono)))
+    if not len(loud):
+        return None
+    mono = mono[loud[0]:loud[-1] + 1]
+    if len(mono) < FINGERPRINT_MIN_SAMPLES:
+        return None
+
+    block_len = len(mono) // FINGERPRINT_BLOCKS
+    blocks = mono[:block_len * FINGERPRINT_BLOCKS].reshape(FINGERPRINT_BLOCKS, block_len)
+    power = np.abs(np.fft.rfft(blocks, axis=1)) ** 2
+    freqs = np.fft.rfftfreq(block_len, 1.0 / FINGERPRINT_RATE)
+    edges = np.geomspace(FINGERPRINT_MIN_HZ, FINGERPRINT_RATE / 2, FINGERPRINT_BANDS + 1)
+    band_of = np.digitize(freqs, edges) - 1
+    energy = np.stack([
+        power[:, (band_of == band)].sum(axis=1) for band in range(FINGERPRINT_BANDS)
+    ], axis=1)
+
+    log_energy = np.log(energy + 1e-10)
+    band_diff = log_energy[:, :-1] - log_energy[:, 1:]
+    bits = (band_diff[:-1] - band_diff[1:]) > 0
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), 'big')
+
+
+class ASRCacheKey(NamedTuple):
+    model_version: str
+    language: str
+    digest: str
+    fingerprint: Optional[int]
+    duration: float
+
+
+class ASRCache:
+    """
+    Bounded cache of ASR results keyed by a hash of the decoded PCM.
+
+    With near_duplicate enabled, a miss on the exact hash falls back to
+    the cached recording with the closest spectral fingerprint (within
+    max_distance bits and a similar duration). All entries are dropped
+    when the ASR model version changes.
+    """
+
+    def __init__(self, max_entries: int = 1024, near_duplicate: bool = False,
+                 max_distance: int = 6, max_duration_ratio: float = 0.1):
+        self.near_duplicate = near_duplicate
+        self.max_distance = max_distance
+        self.max_duration_ratio = max_duration_ratio
+        # Results are small dicts, so the entry count is the real bound
+        self._results = TTLCache(max_entries=max_entries, max_bytes=max_entries * 64 * 1024)
+        self._lock = threading.Lock()
+        # digest -> (language, fingerprint, duration), oldest first
+        self._fingerprints = OrderedDict()
+        self._max_fingerprints = max_entries
+        self._model_version = None
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def make_key(self, audio: PCMAudio, language: str, model_version: str) -> ASRCacheKey:
+        fingerprint = spectral_fingerprint(audio) if self.near_duplicate else None
+        return ASRCacheKey(model_version, language, pcm_hash(audio), fingerprint, audio.duration)
+
+    def _check_version(self, model_version: str):
+        with self._lock:
+            if model_version == self._model_version:
+                return
+            if self._model_version is not None:
+                self.invalidations += 1
+            self._model_version = model_version
+            self._fingerprints.clear()
+        self._results.clear()
+
+    def get(self, key: ASRCacheKey) -> Optional[dict]:
+        """Cached result for the recording (or a near duplicate of it), else None"""
+        self._check_version(key.model_version)
+        result = self._results.get((key.language, key.digest))
+        near = False
+        if result is None and key.fingerprint is not None:
+            digest = self._nearest(key)
+            if digest is not None:
+                result = self._results.get((key.language, digest))
+                near = result is not None
+
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            if near:
+                self.near_hits += 1
+            else:
+                self.hits += 1
+        return dict(result)
+
+    def _nearest(self, key: ASRCacheKey) -> Optional[str]:
+        best, best_distance = None, self.max_distance + 1
+        with self._lock:
+            for digest, (language, fingerprint, duration) in self._fingerprints.items():
+                if language != key.language:
+                    continue
+                if abs(duration - key.duration) > self.max_duration_ratio * max(duration, key.duration):
+                    continue
+                distance = (fingerprint ^ key.fingerprint).bit_count()
+                if distance < best_distance:
+                    best, best_distance = digest, distance
+        return best
+
+    def set(self, key: ASRCacheKey, result: dict):
+        self._check_version(key.model_version)
+        self._results.set((key.language, key.digest), dict(result))
+        if key.fingerprint is None:
+            return
+        with self._lock:
+            self._fingerprints[key.digest] = (key.language, key.fingerprint, key.duration)
+            self._fingerprints.move_to_end(key.digest)
+            while len(self._fingerprints) > self._max_fingerprints:
+                self._fingerprints.popitem(last=False)
+
+    def stats(self) -> Dict:
+        results = self._results.stats()
+        with self._lock:
+            lookups = self.hits + self.near_hits + self.misses
+            return {
+                'entries': results['entries'],
+                'max_entries': results['max_entries'],
+                'model_version': self._model_version,
+                'near_duplicate': self.near_duplicate,
+                'hits': self.hits,
+                'near_hits': self.near_hits,
+                'misses': self.misses,
+                'evictions': results['evictions'],
+                'invalidations': self.invalidations,
+                'hit_rate': round((self.hits + self.near_hits) / lookups, 4) if lookups else 0.0
+            }
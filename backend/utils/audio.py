@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import io
+import os
+import struct
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import List, Optional, Union
+from utils.lazy import lazy_import
+
+# Imported on first use, so starting a worker doesn't pay for it
+np = lazy_import('numpy')
+
+AudioInput = Union[str, os.PathLike, bytes, bytearray, memoryview, io.IOBase]
+
+WAVE_FORMAT_PCM = 1
+WAVE_FORMAT_IEEE_FLOAT = 3
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# (format tag, bits per sample) -> dtype that can view the bytes directly
+_SAMPLE_DTYPES = {
+    (WAVE_FORMAT_PCM, 8): 'u1',
+    (WAVE_FORMAT_PCM, 16): '<i2',
+    (WAVE_FORMAT_PCM, 32): '<i4',
+    (WAVE_FORMAT_IEEE_FLOAT, 32): '<f4',
+}
+
+ASR_SAMPLE_RATE = 16000
+
+
+class UnsupportedAudioFormat(ValueError):
+    """Audio that can't be decoded in memory (needs an external decoder)"""
+
+
+@dataclass
+class PCMAudio:
+    """Decoded PCM audio; samples is a (frames, channels) view of the input buffer"""
+    samples: np.ndarray
+    sample_rate: int
+
+    @property
+    def channels(self) -> int:
+        return self.samples.shape[1]
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / self.sample_rate
+
+    def to_float32_mono(self, sample_rate: int = ASR_SAMPLE_RATE) -> np.ndarray:
+        """Float32 mono samples in [-1, 1] at the given rate (the format ASR models expect)"""
+        samples = self.samples
+        if samples.dtype == np.uint8:
+            audio = (samples.astype(np.float32) - 128.0) / 128.0
+        elif samples.dtype.kind == 'i':
+            audio = samples.astype(np.float32) / float(np.iinfo(samples.dtype).max + 1)
+        else:
+            audio = samples.astype(np.float32, copy=False)
+
+        audio = audio.mean(axis=1) if self.channels > 1 else audio[:, 0]
+
+        if self.sample_rate != sample_rate and len(audio):
+            # Linear resampling is enough for speech at these rates
+            target_len = int(round(len(audio) * sample_rate / self.sample_rate))
+            positions = np.linspace(0, len(audio) - 1, target_len)
+            audio = np.interp(positions, np.arange(len(audio)), audio).astype(np.float32)
+        return audio
+
+
+def as_buffer(audio: AudioInput) -> memoryview:
+    """Bytes-like view of in-memory audio, without copying where possible"""
+    if isinstance(audio, memoryview):
+        return audio
+    if isinstance(audio, (bytes, bytearray)):
+        return memoryview(audio)
+    if hasattr(audio, 'getbuffer'):
+        # io.BytesIO: view of its internal buffer
+        return audio.getbuffer()
+    return memoryview(audio.read())
+
+
+def is_path(audio: AudioInput) -> bool:
+    return isinstance(audio, (str, os.PathLike))
+
+
+class _IncompleteHeader(UnsupportedAudioFormat):
+    """The buffer ends before the WAVE data chunk starts"""
+
+
+def _parse_wav_header(buffer: memoryview):
+    """
+    Locate the PCM data of a RIFF/WAVE buffer.
+    
+    Returns:
+        (dtype, channels, sample_rate, data_offset, data_size);
+        data_size is None when the header doesn't give a length
+    """
+    if len(buffer) < 12:
+        raise _IncompleteHeader('WAVE header is incomplete')
+    if buffer[0:4] != b'RIFF' or buffer[8:12] != b'WAVE':
+        raise UnsupportedAudioFormat('Not a RIFF/WAVE file')
+
+    fmt = None
+    offset = 12
+    while offset + 8 <= len(buffer):
+        chunk_id = bytes(buffer[offset:offset + 4])
+        chunk_size = struct.unpack_from('<I', buffer, offset + 4)[0]
+        body = offset + 8
+
+        if chunk_id == b'fmt ':
+            if body + 16 > len(buffer):
+                break
+            format_tag, channels, sample_rate = struct.unpack_from('<HHI', buffer, body)
+            bits = struct.unpack_from('<H', buffer, body + 14)[0]
+            if format_tag == WAVE_FORMAT_EXTENSIBLE and chunk_size >= 40:
+                if body + 26 > len(buffer):
+                    break
+                # The real format tag is the first field of the subformat GUID
+                format_tag = struct.unpack_from('<H', buffer, body + 24)[0]
+            fmt = (format_tag, channels, sample_rate, bits)
+
+        elif chunk_id == b'data':
+            if fmt is None:
+                raise UnsupportedAudioFormat('WAVE data chunk before fmt chunk')
+            format_tag, channels, sample_rate, bits = fmt
+            dtype = _SAMPLE_DTYPES.get((format_tag, bits))
+            if dtype is None or channels == 0:
+                raise UnsupportedAudioFormat(f'Unsupported WAVE encoding: format {format_tag}, {bits} bits')
+            # Streams written without a known length may carry 0 or 0xFFFFFFFF here
+            data_size = None if chunk_size in (0, 0xFFFFFFFF) else chunk_size
+            return np.dtype(dtype), channels, sample_rate, body, data_size
+
+        # Chunks are word aligned
+        offset = body + chunk_size + (chunk_size & 1)
+
+    raise _IncompleteHeader('WAVE file has no data chunk')
+
+
+def decode_wav(buffer: memoryview) -> PCMAudio:
+    """
+    Decode a RIFF/WAVE buffer into a NumPy view of its PCM samples.
+    No sample data is copied; the array shares memory with the buffer.
+    """
+    buffer = buffer.cast('B') if buffer.format != 'B' else buffer
+    dtype, channels, sample_rate, offset, data_size = _parse_wav_header(buffer)
+
+    end = len(buffer) if data_size is None else min(offset + data_size, len(buffer))
+    frames = (end - offset) // (dtype.itemsize * channels)
+    samples = np.frombuffer(buffer, dtype=dtype, count=frames * channels, offset=offset)
+    return PCMAudio(samples.reshape(frames, channels), sample_rate)
+
+
+class WavStreamParser:
+    """
+    Incremental WAV decoder for audio that arrives in chunks.
+    feed() returns the complete sample frames received so far.
+    """
+
+    MAX_HEADER_SIZE = 64 * 1024
+
+    def __init__(self):
+        self._pending = bytearray()
+        self.dtype = None
+        self.channels = None
+        self.sample_rate = None
+
+    @property
+    def header_parsed(self) -> bool:
+        return self.dtype is not None
+
+    def feed(self, data: bytes) -> Optional[np.ndarray]:
+        """Add bytes; returns a (frames, channels) array, or None if no frames are complete"""
+        self._pending += data
+
+        if not self.header_parsed:
+            try:
+                self.dtype, self.channels, self.sample_rate, offset, _ = \
+                    _parse_wav_header(memoryview(self._pending))
+            except _IncompleteHeader:
+                if len(self._pending) > self.MAX_HEADER_SIZE:
+                    raise UnsupportedAudioFormat('WAVE header too large')
+                return None
+            del self._pending[:offset]
+
+        frame_size = self.dtype.itemsize * self.channels
+        usable = len(self._pending) - len(self._pending) % frame_size
+        if not usable:
+            return None
+        samples = np.frombuffer(bytes(self._pending[:usable]), dtype=self.dtype)
+        del self._pending[:usable]
+        return samples.reshape(-1, self.channels)
+
+
+def encode_wav(samples: np.ndarray, sample_rate: int) -> bytes:
+    """Encode int16 samples of shape (frames,) or (frames, channels) as a WAV file"""
+    samples = np.asarray(samples, dtype='<i2')
+    channels = 1 if samples.ndim == 1 else samples.shape[1]
+    data = samples.tobytes()
+    header = struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + len(data), b'WAVE', b'fmt ', 16, WAVE_FORMAT_PCM, channels,
+        sample_rate, sample_rate * channels * 2, channels * 2, 16, b'data', len(data)
+    )
+    return header + data
+
+
+def concat_wav(parts: List[bytes]) -> bytes:
+    """Join 16-bit WAV clips of the same format into one WAV; other audio is joined as is"""
+    parts = [part for part in parts if part]
+    if len(parts) <= 1:
+        return parts[0] if parts else b''
+    try:
+        clips = [decode_wav(memoryview(part)) for part in parts]
+    except UnsupportedAudioFormat:
+        return b''.join(parts)
+
+    first = clips[0]
+    if any(clip.sample_rate != first.sample_rate or clip.channels != first.channels
+           or clip.samples.dtype != np.dtype('<i2') for clip in clips):
+        return b''.join(parts)
+    return encode_wav(np.concatenate([clip.samples for clip in clips]), first.sample_rate)
+
+
+@contextmanager
+def temporary_audio_file(buffer: memoryview, audio_format: Optional[str] = None):
+    """Write audio to a unique temporary file, removed afterwards"""
+    suffix = f'.{audio_format}' if audio_format else ''
+    fd, path = tempfile.mkstemp(suffix=suffix, prefix='voice_')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(buffer)
+        yield path
+    finally:
+        os.remove(path)
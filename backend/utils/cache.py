@@ -0,0 +1,110 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def estimate_size(value: Any) -> int:
+    """Rough in-memory size of a cached value in bytes"""
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(k) + estimate_size(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with TTL expiry.
+    Bounded both by number of entries and by an approximate byte budget.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 16 * 1024 * 1024,
+                 ttl_seconds: Optional[float] = None,
+                 sizeof: Callable[[Any], int] = estimate_size):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._sizeof = sizeof
+        self._lock = threading.Lock()
+        # key -> (value, size, expires_at)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return cached value (marking it recently used) or default"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, size, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """Insert or replace a value, evicting least recently used entries"""
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            return
+
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Whether key holds an unexpired value, without counting a lookup"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (entry[2] is None or entry[2] > time.monotonic())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
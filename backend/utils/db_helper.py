@@ -1,4 +1,8 @@
+import sqlite3
+import threading
+from collections import Counter, deque
 from datetime import datetime
+from itertools import islice
 from typing import List, Dict, Optional
 
 class DatabaseHelper:
@@ -6,14 +10,22 @@ class DatabaseHelper:
     Database helper for storing translations and voice samples.
     For Round-2, this uses in-memory storage (mock database).
     In production, this would connect to PostgreSQL/MySQL.
+    
+    Ids are assigned densely from 1, so a row is found at index id - 1.
+    The most recent translations are kept in a bounded deque and
+    per-language counts are updated on insert, so lookups and stats do
+    not scan the whole table.
     """
     
-    def __init__(self):
-        # Mock database (in-memory storage)
-        self.translations = []
-        self.voice_samples = []
+    def __init__(self, recent_window: int = 1000):
+        # Mock database (in-memory storage), rows in id order
+        self.translations: List[Dict] = []
+        self.voice_samples: List[Dict] = []
+        self.recent_translations = deque(maxlen=recent_window)
+        self.language_counts = Counter()
         self.next_translation_id = 1
         self.next_voice_id = 1
+        self._lock = threading.Lock()
     
     # ===== TRANSLATION TABLE OPERATIONS =====
     
@@ -21,6 +33,24 @@ class DatabaseHelper:
                         input_lang: str, output_lang: str, 
                         confidence: Optional[float] = None) -> int:
         """Save translation to database"""
+        with self._lock:
+            return self._insert_translation(input_text, output_text, input_lang,
+                                            output_lang, confidence)
+    
+    def save_translations(self, rows: List[Dict]) -> int:
+        """
+        Save many translations at once.
+        Each row holds save_translation's arguments, optionally with a 'timestamp'.
+        """
+        with self._lock:
+            for row in rows:
+                self._insert_translation(**row)
+        return len(rows)
+    
+    def _insert_translation(self, input_text: str, output_text: str,
+                            input_lang: str, output_lang: str,
+                            confidence: Optional[float] = None,
+                            timestamp: Optional[str] = None) -> int:
         translation = {
             'id': self.next_translation_id,
             'input_text': input_text,
@@ -28,38 +58,56 @@ class DatabaseHelper:
             'input_language': input_lang,
             'output_language': output_lang,
             'confidence_score': confidence,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': timestamp or datetime.now().isoformat()
         }
         
         self.translations.append(translation)
+        self.recent_translations.append(translation)
+        self.language_counts[input_lang] += 1
         self.next_translation_id += 1
         
         return translation['id']
     
     def get_translation_by_id(self, translation_id: int) -> Optional[Dict]:
         """Get translation by ID"""
-        for translation in self.translations:
-            if translation['id'] == translation_id:
-                return translation
-        return None
+        return _row(self.translations, translation_id)
     
     def get_recent_translations(self, limit: int = 10) -> List[Dict]:
         """Get recent translations"""
-        return sorted(self.translations, 
-                     key=lambda x: x['timestamp'], 
-                     reverse=True)[:limit]
+        limit = max(limit, 0)
+        # Writers append from other threads (e.g. the write-behind flush)
+        with self._lock:
+            if limit <= len(self.recent_translations):
+                return list(islice(reversed(self.recent_translations), limit))
+            # Older than the recent window: ids are assigned in time order
+            return self.translations[:-limit - 1:-1]
     
     # ===== VOICE SAMPLE TABLE OPERATIONS =====
     
     def save_voice_sample(self, audio_path: str, language: str, 
                          transcription: str) -> int:
         """Save voice sample to database"""
+        with self._lock:
+            return self._insert_voice_sample(audio_path, language, transcription)
+    
+    def save_voice_samples(self, rows: List[Dict]) -> int:
+        """
+        Save many voice samples at once.
+        Each row holds save_voice_sample's arguments, optionally with a 'timestamp'.
+        """
+        with self._lock:
+            for row in rows:
+                self._insert_voice_sample(**row)
+        return len(rows)
+    
+    def _insert_voice_sample(self, audio_path: str, language: str,
+                             transcription: str, timestamp: Optional[str] = None) -> int:
         voice_sample = {
             'id': self.next_voice_id,
             'audio_file_path': audio_path,
             'language': language,
             'transcription': transcription,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': timestamp or datetime.now().isoformat()
         }
         
         self.voice_samples.append(voice_sample)
@@ -69,10 +117,7 @@ class DatabaseHelper:
     
     def get_voice_sample_by_id(self, sample_id: int) -> Optional[Dict]:
         """Get voice sample by ID"""
-        for sample in self.voice_samples:
-            if sample['id'] == sample_id:
-                return sample
-        return None
+        return _row(self.voice_samples, sample_id)
     
     # ===== STATISTICS =====
     
@@ -82,12 +127,158 @@ class DatabaseHelper:
             'total_translations': len(self.translations),
             'total_voice_samples': len(self.voice_samples),
             'languages': {
-                'garhwali': len([t for t in self.translations if t['input_language'] == 'garhwali']),
-                'kumaoni': len([t for t in self.translations if t['input_language'] == 'kumaoni'])
+                'garhwali': self.language_counts['garhwali'],
+                'kumaoni': self.language_counts['kumaoni']
             }
         }
 
 
+def _row(rows: List[Dict], row_id) -> Optional[Dict]:
+    if isinstance(row_id, int) and 1 <= row_id <= len(rows):
+        return rows[row_id - 1]
+    return None
+
+
+class SQLiteDatabaseHelper:
+    """
+    Persistent SQLite storage with the same API as DatabaseHelper.
+    Runs in WAL mode so readers don't block the writer, keeps one
+    connection per thread and reuses its prepared statements (the
+    sqlite3 statement cache is keyed on the SQL text below).
+    """
+    
+    INSERT_TRANSLATION = (
+        'INSERT INTO translations (input_text, output_text, input_language, '
+        'output_language, confidence_score, timestamp) VALUES (?, ?, ?, ?, ?, ?)'
+    )
+    INSERT_VOICE_SAMPLE = (
+        'INSERT INTO voice_samples (audio_file_path, language, transcription, timestamp) '
+        'VALUES (?, ?, ?, ?)'
+    )
+    SELECT_TRANSLATION = 'SELECT * FROM translations WHERE id = ?'
+    SELECT_VOICE_SAMPLE = 'SELECT * FROM voice_samples WHERE id = ?'
+    # Uses idx_translations_timestamp
+    SELECT_RECENT = 'SELECT * FROM translations ORDER BY timestamp DESC, id DESC LIMIT ?'
+    # Uses idx_translations_language
+    COUNT_BY_LANGUAGE = 'SELECT input_language, COUNT(*) FROM translations GROUP BY input_language'
+    COUNT_TRANSLATIONS = 'SELECT COUNT(*) FROM translations'
+    COUNT_VOICE_SAMPLES = 'SELECT COUNT(*) FROM voice_samples'
+    
+    def __init__(self, path: str, cached_statements: int = 64):
+        self.path = path
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._connection().executescript(SQLITE_SCHEMA)
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Connection of the current thread"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10,
+                                   cached_statements=self.cached_statements)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+    
+    def close(self):
+        """Close the current thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+    
+    # ===== TRANSLATION TABLE OPERATIONS =====
+    
+    def save_translation(self, input_text: str, output_text: str, 
+                        input_lang: str, output_lang: str, 
+                        confidence: Optional[float] = None) -> int:
+        """Save translation to database"""
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute(self.INSERT_TRANSLATION, (
+                input_text, output_text, input_lang, output_lang,
+                confidence, datetime.now().isoformat()
+            ))
+        return cursor.lastrowid
+    
+    def save_translations(self, rows: List[Dict]) -> int:
+        """
+        Save many translations in one transaction (group commit).
+        Each row holds save_translation's arguments, optionally with a 'timestamp'.
+        """
+        conn = self._connection()
+        with conn:
+            conn.executemany(self.INSERT_TRANSLATION, [(
+                row['input_text'], row['output_text'], row['input_lang'], row['output_lang'],
+                row.get('confidence'), row.get('timestamp') or datetime.now().isoformat()
+            ) for row in rows])
+        return len(rows)
+    
+    def get_translation_by_id(self, translation_id: int) -> Optional[Dict]:
+        """Get translation by ID"""
+        row = self._connection().execute(self.SELECT_TRANSLATION, (translation_id,)).fetchone()
+        return dict(row) if row is not None else None
+    
+    def get_recent_translations(self, limit: int = 10) -> List[Dict]:
+        """Get recent translations"""
+        rows = self._connection().execute(self.SELECT_RECENT, (max(limit, 0),))
+        return [dict(row) for row in rows]
+    
+    # ===== VOICE SAMPLE TABLE OPERATIONS =====
+    
+    def save_voice_sample(self, audio_path: str, language: str, 
+                         transcription: str) -> int:
+        """Save voice sample to database"""
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute(self.INSERT_VOICE_SAMPLE, (
+                audio_path, language, transcription, datetime.now().isoformat()
+            ))
+        return cursor.lastrowid
+    
+    def save_voice_samples(self, rows: List[Dict]) -> int:
+        """
+        Save many voice samples in one transaction (group commit).
+        Each row holds save_voice_sample's arguments, optionally with a 'timestamp'.
+        """
+        conn = self._connection()
+        with conn:
+            conn.executemany(self.INSERT_VOICE_SAMPLE, [(
+                row['audio_path'], row['language'], row['transcription'],
+                row.get('timestamp') or datetime.now().isoformat()
+            ) for row in rows])
+        return len(rows)
+    
+    def get_voice_sample_by_id(self, sample_id: int) -> Optional[Dict]:
+        """Get voice sample by ID"""
+        row = self._connection().execute(self.SELECT_VOICE_SAMPLE, (sample_id,)).fetchone()
+        return dict(row) if row is not None else None
+    
+    # ===== STATISTICS =====
+    
+    def get_stats(self) -> Dict:
+        """Get database statistics"""
+        conn = self._connection()
+        counts = dict(conn.execute(self.COUNT_BY_LANGUAGE).fetchall())
+        return {
+            'total_translations': conn.execute(self.COUNT_TRANSLATIONS).fetchone()[0],
+            'total_voice_samples': conn.execute(self.COUNT_VOICE_SAMPLES).fetchone()[0],
+            'languages': {
+                'garhwali': counts.get('garhwali', 0),
+                'kumaoni': counts.get('kumaoni', 0)
+            }
+        }
+
+
+def create_database_helper(config):
+    """Database helper for the backend selected in config"""
+    if config.DATABASE_BACKEND == 'sqlite':
+        return SQLiteDatabaseHelper(config.DATABASE_PATH)
+    return DatabaseHelper(recent_window=config.RECENT_TRANSLATIONS_WINDOW)
+
+
 # Database schema design (for documentation)
 DATABASE_SCHEMA = """
 -- Table: translations
@@ -123,4 +314,12 @@ CREATE TABLE language_metadata (
 CREATE INDEX idx_translations_timestamp ON translations(timestamp);
 CREATE INDEX idx_translations_language ON translations(input_language, output_language);
 CREATE INDEX idx_voice_language ON voice_samples(language);
-"""
\ No newline at end of file
+"""
+
+# The same schema, in SQLite dialect, used by SQLiteDatabaseHelper
+SQLITE_SCHEMA = (
+    DATABASE_SCHEMA
+    .replace('SERIAL PRIMARY KEY', 'INTEGER PRIMARY KEY')
+    .replace('CREATE TABLE ', 'CREATE TABLE IF NOT EXISTS ')
+    .replace('CREATE INDEX ', 'CREATE INDEX IF NOT EXISTS ')
+)
@@ -0,0 +1,539 @@
+"""
+Inference server: ASR, translation and TTS models in a pool of worker
+processes, shared by all HTTP workers over a Unix socket.
+
+Each model gets its own worker processes (so its weights are loaded once
+per worker, not once per HTTP worker) and a dispatcher that groups queued
+calls into batches: a batch is sent once it reaches max_batch_size or
+max_wait_ms after its first call arrived. At most `workers` batches of a
+model run at once. A worker that dies is restarted; the calls of the batch
+it was running fail.
+
+Run standalone with:
+    python -m utils.inference_pool [--socket PATH]
+or let the first HTTP worker start it (Config.INFERENCE_POOL_AUTOSTART).
+
+Connections carry pickles, so the socket sits in a private (0700)
+directory and both ends authenticate with a shared key (load_authkey).
+"""
+import argparse
+import itertools
+import os
+import pickle
+import queue
+import signal
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent import futures
+from multiprocessing import AuthenticationError, get_context
+from multiprocessing.connection import Client, Listener, wait
+from typing import Any, Callable, Dict, Optional
+from config import Config
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Pseudo-model addressing the server itself (stats)
+SERVER = '__server__'
+DESCRIBE = '__describe__'
+
+# Methods forwarded to each pooled model, and attributes copied to its proxy
+MODEL_METHODS = {
+    'asr': ('transcribe',),
+    'translation': ('translate_batch',),
+    'tts': ('synthesize',)
+}
+MODEL_ATTRIBUTES = ('version', 'formats', 'voice_params')
+
+AUTHKEY_FILE = 'inference.key'
+
+
+def _default_loader(name: str) -> Callable[[], Any]:
+    from utils.ml_integration import model_loaders
+    return model_loaders(Config)[name]
+
+
+def _private_dir(path: str) -> str:
+    """Create path with mode 0700, or check that an existing one is ours and private"""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f'{path} must be a directory owned by this user with mode 0700')
+    return path
+
+
+def load_authkey(config=Config, address: Optional[str] = None) -> bytes:
+    """
+    Key the server and its clients authenticate with: INFERENCE_AUTHKEY, or
+    a random key created once next to the socket, in its private directory
+    """
+    directory = _private_dir(os.path.dirname(os.path.abspath(address or config.INFERENCE_SOCKET)))
+    if config.INFERENCE_AUTHKEY:
+        return config.INFERENCE_AUTHKEY.encode('utf-8')
+
+    path = os.path.join(directory, AUTHKEY_FILE)
+    if not os.path.exists(path):
+        # Written under a temporary name and linked into place, so processes
+        # racing here all end up reading the same complete key
+        fd, temp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(os.urandom(32))
+            os.link(temp_path, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.unlink(temp_path)
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _picklable(error: BaseException) -> BaseException:
+    try:
+        pickle.dumps(error)
+        return error
+    except Exception:
+        return RuntimeError(repr(error))
+
+
+def _run_batch(model, calls):
+    """Run one batch of (method, args, kwargs) calls; returns (ok, value) per call"""
+    results = [None] * len(calls)
+
+    # Translation already takes lists: merge calls for the same language pair
+    groups = {}
+    for index, (method, args, kwargs) in enumerate(calls):
+        if method == 'translate_batch' and not kwargs and len(args) == 3:
+            groups.setdefault(tuple(args[1:]), []).append(index)
+    for (input_lang, output_lang), indexes in groups.items():
+        texts = [text for index in indexes for text in calls[index][1][0]]
+        try:
+            translations = model.translate_batch(texts, input_lang, output_lang)
+        except Exception as e:
+            for index in indexes:
+                results[index] = (False, _picklable(e))
+            continue
+        offset = 0
+        for index in indexes:
+            count = len(calls[index][1][0])
+            results[index] = (True, translations[offset:offset + count])
+            offset += count
+
+    for index, (method, args, kwargs) in enumerate(calls):
+        if results[index] is not None:
+            continue
+        try:
+            if method == DESCRIBE:
+                value = {attr: getattr(model, attr) for attr in MODEL_ATTRIBUTES if hasattr(model, attr)}
+            else:
+                value = getattr(model, method)(*args, **kwargs)
+            results[index] = (True, value)
+        except Exception as e:
+            results[index] = (False, _picklable(e))
+    return results
+
+
+def _worker_main(name: str, loader: Optional[Callable[[], Any]], conn):
+    """Inference worker process: load the model once, then run batches sent on conn"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    model, error = None, None
+
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            # Exit with the server, even if it was killed
+            return
+        if task is None:
+            return
+
+        batch_id, calls = task
+        if model is None and error is None:
+            try:
+                model = (loader or _default_loader(name))()
+            except Exception as e:
+                error = _picklable(e)
+        if error is not None:
+            conn.send((batch_id, [(False, error)] * len(calls)))
+        else:
+            conn.send((batch_id, _run_batch(model, calls)))
+
+
+class ModelPool:
+    """Worker processes, dynamic batcher and concurrency limit for one model"""
+
+    def __init__(self, name: str, workers: int = 1, max_batch_size: int = 8,
+                 max_wait_ms: float = 10, loader: Optional[Callable[[], Any]] = None,
+                 context=None):
+        self._context = context or get_context('spawn')
+        self.name = name
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._loader = loader
+        self._pending = queue.Queue()
+        # Indexes of idle workers: one batch per worker at a time; calls queue
+        # up (and batch up) meanwhile
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._inflight = {}  # batch id -> (worker index, batch)
+        self._batch_ids = itertools.count()
+        self._processes = [None] * workers
+        self._conns = [None] * workers
+        self.calls = 0
+        self.batches = 0
+        self.max_batch_seen = 0
+        self.restarts = 0
+
+    def _spawn(self, index: int):
+        """Start worker `index`; returns the process and the server's end of its pipe"""
+        conn, worker_conn = self._context.Pipe()
+        process = self._context.Process(target=_worker_main, args=(self.name, self._loader, worker_conn),
+                                        name=f'inference-{self.name}-{index}', daemon=True)
+        process.start()
+        # Only the worker holds its end now, so it sees EOF when the server dies
+        worker_conn.close()
+        return process, conn
+
+    def start(self):
+        for index in range(len(self._processes)):
+            self._processes[index], self._conns[index] = self._spawn(index)
+            self._idle.put(index)
+        threading.Thread(target=self._dispatch, name=f'dispatch-{self.name}', daemon=True).start()
+        threading.Thread(target=self._collect, name=f'collect-{self.name}', daemon=True).start()
+
+    def submit(self, method: str, args: tuple, kwargs: dict, reply: Callable[[bool, Any], None]):
+        self._pending.put((time.monotonic(), method, args, kwargs, reply))
+
+    def _dispatch(self):
+        while True:
+            first = self._pending.get()
+            index = self._idle.get()
+
+            # Wait up to max_wait after the first call arrived for more calls
+            batch = [first]
+            deadline = first[0] + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    batch.append(self._pending.get(timeout=timeout) if timeout > 0
+                                 else self._pending.get_nowait())
+                except queue.Empty:
+                    break
+
+            batch_id = next(self._batch_ids)
+            with self._lock:
+                self._inflight[batch_id] = (index, batch)
+                conn = self._conns[index]
+                self.calls += len(batch)
+                self.batches += 1
+                self.max_batch_seen = max(self.max_batch_seen, len(batch))
+            try:
+                conn.send((batch_id, [(method, args, kwargs) for _, method, args, kwargs, _ in batch]))
+            except OSError:
+                pass  # the worker died: _collect fails the batch when it restarts it
+            except Exception as e:
+                self._finish(batch_id, itertools.repeat((False, _picklable(e))))
+
+    def _collect(self):
+        while True:
+            # Results and exits of the current workers (only this thread replaces them)
+            conns = {conn: index for index, conn in enumerate(self._conns)}
+            sentinels = {process.sentinel: index for index, process in enumerate(self._processes)}
+            exited = set()
+            for ready in wait(list(conns) + list(sentinels)):
+                if ready in conns:
+                    try:
+                        batch_id, results = ready.recv()
+                    except (EOFError, OSError):
+                        exited.add(conns[ready])
+                        continue
+                    self._finish(batch_id, results)
+                else:
+                    exited.add(sentinels[ready])
+            for index in exited:
+                self._restart(index)
+
+    def _finish(self, batch_id: int, results):
+        """Free the batch's worker and reply to its calls, unless that was done already"""
+        with self._lock:
+            index, batch = self._inflight.pop(batch_id, (None, None))
+        if batch is None:
+            return
+        self._idle.put(index)
+        for (*_, reply), (ok, value) in zip(batch, results):
+            reply(ok, value)
+
+    def _restart(self, index: int):
+        """Replace a worker that exited, failing the batch it was running"""
+        process = self._processes[index]
+        if process.is_alive():
+            process.kill()
+        process.join()
+        # The old pipe is dropped, not closed: _dispatch may still be sending on it
+        new_process, new_conn = self._spawn(index)
+        with self._lock:
+            self._processes[index], self._conns[index] = new_process, new_conn
+            lost = [batch_id for batch_id, (worker, _) in self._inflight.items() if worker == index]
+            self.restarts += 1
+        error = RuntimeError(f'{self.name} inference worker exited with code {process.exitcode}')
+        for batch_id in lost:
+            self._finish(batch_id, itertools.repeat((False, error)))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'workers': len(self._processes),
+                'alive': sum(process is not None and process.is_alive() for process in self._processes),
+                'restarts': self.restarts,
+                'queued': self._pending.qsize(),
+                'inflight_batches': len(self._inflight),
+                'calls': self.calls,
+                'batches': self.batches,
+                'avg_batch_size': round(self.calls / self.batches, 2) if self.batches else 0.0,
+                'max_batch_size_seen': self.max_batch_seen
+            }
+
+
+class InferenceServer:
+    """Accepts calls from HTTP workers on a Unix socket and routes them to model pools"""
+
+    def __init__(self, config=Config, address: Optional[str] = None,
+                 loaders: Optional[Dict[str, Callable[[], Any]]] = None):
+        self.config = config
+        self.address = address or config.INFERENCE_SOCKET
+        loaders = loaders or {}
+        self.pools = {
+            name: ModelPool(name, loader=loaders.get(name), **config.INFERENCE_POOL[name])
+            for name in MODEL_METHODS
+        }
+        self._listener = None
+
+    def _listen(self) -> Listener:
+        authkey = load_authkey(self.config, self.address)
+        try:
+            return Listener(self.address, family='AF_UNIX', authkey=authkey)
+        except OSError:
+            # Socket file left behind by a dead server, or a live server?
+            try:
+                Client(self.address, family='AF_UNIX', authkey=authkey).close()
+            except (AuthenticationError, EOFError):
+                pass  # live, with another key
+            except OSError:
+                os.unlink(self.address)
+                return Listener(self.address, family='AF_UNIX', authkey=authkey)
+            raise
+
+    def serve_forever(self):
+        self._listener = self._listen()
+        # Worker processes first, before this process runs any more threads
+        for pool in self.pools.values():
+            pool.start()
+        try:
+            while True:
+                try:
+                    conn = self._listener.accept()
+                except (OSError, EOFError, AuthenticationError):
+                    # Closed listener, or a client that failed the handshake
+                    if self._listener is None:
+                        return
+                    continue
+                threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+        finally:
+            self.close()
+
+    def close(self):
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.close()
+
+    def _serve_connection(self, conn):
+        send_lock = threading.Lock()
+
+        def replier(request_id):
+            def reply(ok, value):
+                with send_lock:
+                    try:
+                        conn.send((request_id, ok, value))
+                    except (OSError, EOFError):
+                        pass
+            return reply
+
+        while True:
+            try:
+                request_id, model, method, args, kwargs = conn.recv()
+            except (EOFError, OSError):
+                break
+            reply = replier(request_id)
+            if model == SERVER:
+                reply(True, self.stats())
+            elif model not in self.pools:
+                reply(False, KeyError(f'Unknown model {model}'))
+            else:
+                self.pools[model].submit(method, args, kwargs, reply)
+        conn.close()
+
+    def stats(self) -> Dict:
+        return {'backend': 'pool', 'models': {name: pool.stats() for name, pool in self.pools.items()}}
+
+
+class InferenceClient:
+    """
+    Thread-safe connection from an HTTP worker to the inference server.
+    Calls from many threads share one socket; replies are matched by id.
+    """
+
+    def __init__(self, address: str, authkey: bytes, timeout: float = 60.0):
+        self.address = address
+        self.authkey = authkey
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pending: Dict[int, futures.Future] = {}
+        self._ids = itertools.count()
+
+    def connect(self):
+        with self._lock:
+            if self._conn is None:
+                self._open()
+
+    def _open(self):
+        conn = Client(self.address, family='AF_UNIX', authkey=self.authkey)
+        self._conn = conn
+        threading.Thread(target=self._read, args=(conn,), name='inference-client', daemon=True).start()
+
+    def call(self, model: str, method: str, *args, **kwargs) -> Any:
+        future = futures.Future()
+        with self._lock:
+            if self._conn is None:
+                self._open()
+            request_id = next(self._ids)
+            self._pending[request_id] = future
+            try:
+                self._conn.send((request_id, model, method, args, kwargs))
+            except OSError as e:
+                self._pending.pop(request_id, None)
+                self._conn = None
+                raise ConnectionError(f'Inference server unavailable: {e}') from e
+
+        try:
+            ok, value = future.result(timeout=self.timeout)
+        except futures.TimeoutError:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise
+        if not ok:
+            raise value
+        return value
+
+    def _read(self, conn):
+        while True:
+            try:
+                request_id, ok, value = conn.recv()
+            except (EOFError, OSError):
+                break
+            with self._lock:
+                future = self._pending.pop(request_id, None)
+            if future is not None:
+                future.set_result((ok, value))
+
+        # Connection lost: fail everything still waiting on it
+        with self._lock:
+            if self._conn is conn:
+                self._conn = None
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(ConnectionError('Inference server connection closed'))
+
+    def stats(self) -> Dict:
+        return self.call(SERVER, 'stats')
+
+
+class RemoteModel:
+    """Model proxy: forwards MODEL_METHODS calls to the inference server"""
+
+    def __init__(self, client: InferenceClient, name: str):
+        self.name = name
+        for attr, value in client.call(name, DESCRIBE).items():
+            setattr(self, attr, value)
+        for method in MODEL_METHODS[name]:
+            setattr(self, method, self._forward(client, name, method))
+
+    @staticmethod
+    def _forward(client, name, method):
+        def call(*args, **kwargs):
+            return client.call(name, method, *args, **kwargs)
+        return call
+
+
+def start_server_process(config=Config) -> subprocess.Popen:
+    """Start the inference server detached, so it outlives the HTTP worker that started it"""
+    return subprocess.Popen(
+        [sys.executable, '-m', 'utils.inference_pool', '--socket', config.INFERENCE_SOCKET],
+        cwd=BACKEND_DIR, start_new_session=True
+    )
+
+
+def connect(config=Config) -> InferenceClient:
+    """Client connected to the inference server, starting the server if allowed"""
+    client = InferenceClient(config.INFERENCE_SOCKET, load_authkey(config), timeout=config.INFERENCE_TIMEOUT)
+    try:
+        client.connect()
+        return client
+    except OSError:
+        if not config.INFERENCE_POOL_AUTOSTART:
+            raise
+
+    # Several HTTP workers may race here; all but one server exit on bind
+    start_server_process(config)
+    deadline = time.monotonic() + config.INFERENCE_STARTUP_TIMEOUT
+    while True:
+        time.sleep(0.1)
+        try:
+            client.connect()
+            return client
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_inference_client(config=Config) -> InferenceClient:
+    """Process-wide inference client"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = connect(config)
+        return _client
+
+
+def create_remote_loaders(config=Config) -> Dict[str, Callable[[], RemoteModel]]:
+    """Model registry loaders that return proxies to the inference server"""
+    return {
+        name: (lambda name=name: RemoteModel(get_inference_client(config), name))
+        for name in MODEL_METHODS
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the inference worker pool')
+    parser.add_argument('--socket', default=Config.INFERENCE_SOCKET, help='Unix socket path')
+    args = parser.parse_args()
+
+    # Exit cleanly on SIGTERM so worker processes are stopped too
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    server = InferenceServer(Config, args.socket)
+    try:
+        server.serve_forever()
+    except OSError as e:
+        print(f'Inference server not started: {e}', file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+import importlib
+import sys
+import threading
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a heavy module (e.g. numpy) that is imported on first
+    attribute access instead of at startup.
+
+    After loading, the real module's attributes are copied onto the proxy,
+    so later lookups are plain attribute hits with no extra cost; names
+    the real module adds later are still forwarded through __getattr__.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_lock'] = threading.Lock()
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            with self.__dict__['_lazy_lock']:
+                module = self.__dict__['_lazy_module']
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__.update(module.__dict__)
+                    self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, name: str):
+        # Only called for names not (yet) on the proxy
+        return getattr(self._load(), name)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """The module itself if it is already imported, otherwise a LazyModule"""
+    module = sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
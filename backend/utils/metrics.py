@@ -0,0 +1,197 @@
+import functools
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from config import Config
+
+# Histogram families: name -> (metric name, label name, help text)
+FAMILIES = {
+    'stage': ('voice_assistant_stage_seconds', 'stage',
+              'Time spent in one stage of request handling'),
+    'request': ('voice_assistant_request_seconds', 'endpoint',
+                'Time from request start to response headers')
+}
+
+# Stages timed during the current request, for the Server-Timing header
+_trace: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar('server_timing', default=None)
+
+_NULL_STAGE = nullcontext()
+
+
+class _Stage:
+    """Times a with-block into the stage histogram and the request's trace"""
+    __slots__ = ('metrics', 'name', 'start')
+
+    def __init__(self, metrics: 'Metrics', name: str):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        elapsed = time.perf_counter() - self.start
+        self.metrics.observe('stage', self.name, elapsed)
+        trace = _trace.get()
+        if trace is not None:
+            trace.append((self.name, elapsed))
+
+
+class _Owner:
+    """Lives in a thread's local storage; collected when the thread exits"""
+    __slots__ = ('__weakref__',)
+
+
+class Metrics:
+    """
+    Latency histograms recorded without locks on the hot path.
+
+    Every thread writes to its own shard of bucket counters; shards are only
+    summed when the metrics are rendered. When a thread exits, its counts
+    are folded into a shared total so short-lived request threads don't pile
+    up. When disabled, stage() returns a shared no-op context manager and
+    timed() functions call straight through.
+    """
+
+    def __init__(self, enabled: bool = True, buckets: Iterable[float] = Config.METRICS_BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(sorted(buckets))
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: List[Dict] = []
+        self._retired: Dict = {}
+
+    # ===== RECORDING =====
+
+    def stage(self, name: str):
+        """Context manager timing a stage, e.g. with metrics.stage('asr'): ..."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def timed(self, name: str) -> Callable:
+        """Decorator timing every call of a function as a stage"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Stage(self, name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def observe(self, family: str, label: str, seconds: float):
+        """Record one observation in the calling thread's shard"""
+        if not self.enabled:
+            return
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._new_shard()
+        counts = shard.get((family, label))
+        if counts is None:
+            # One counter per bucket, +Inf, then the sum of observations
+            counts = shard[(family, label)] = [0] * (len(self.buckets) + 1) + [0.0]
+        counts[bisect_left(self.buckets, seconds)] += 1
+        counts[-1] += seconds
+
+    def _new_shard(self) -> Dict:
+        shard = {}
+        owner = _Owner()
+        self._local.shard = shard
+        self._local.owner = owner
+        with self._lock:
+            self._shards.append(shard)
+        weakref.finalize(owner, self._retire, shard)
+        return shard
+
+    def _retire(self, shard: Dict):
+        with self._lock:
+            self._shards.remove(shard)
+            _merge(self._retired, shard)
+
+    # ===== EXPORT =====
+
+    def snapshot(self) -> Dict[Tuple[str, str], List]:
+        """Counts of all threads summed per (family, label)"""
+        with self._lock:
+            total = {}
+            _merge(total, self._retired)
+            for shard in self._shards:
+                _merge(total, shard)
+        return total
+
+    def render(self) -> str:
+        """Histograms in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = []
+        for family, (metric, label_name, help_text) in FAMILIES.items():
+            series = sorted((label, counts) for (fam, label), counts in snapshot.items() if fam == family)
+            lines.append(f'# HELP {metric} {help_text}')
+            lines.append(f'# TYPE {metric} histogram')
+            for label, counts in series:
+                label = _escape(label)
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float('inf'),), counts):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'{metric}_bucket{{{label_name}="{label}",le="{le}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{{label_name}="{label}"}} {counts[-1]:.6f}')
+                lines.append(f'{metric}_count{{{label_name}="{label}"}} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+
+def _merge(total: Dict, shard: Dict):
+    # list() copies are atomic under the GIL while the owner keeps writing
+    for key, counts in list(shard.items()):
+        counts = list(counts)
+        current = total.get(key)
+        if current is None:
+            total[key] = counts
+        else:
+            total[key] = [a + b for a, b in zip(current, counts)]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def sample_lines(metric: str, metric_type: str, help_text: str,
+                 samples: Dict[Tuple[Tuple[str, str], ...], float]) -> List[str]:
+    """Prometheus lines for a gauge or counter; samples map label pairs to values"""
+    lines = [f'# HELP {metric} {help_text}', f'# TYPE {metric} {metric_type}']
+    for labels, value in samples.items():
+        label_text = ','.join(f'{name}="{_escape(label)}"' for name, label in labels)
+        lines.append(f'{metric}{{{label_text}}} {value}' if label_text else f'{metric} {value}')
+    return lines
+
+
+# ===== SERVER-TIMING =====
+
+def start_trace():
+    """Start collecting stage timings for the current request"""
+    _trace.set([])
+
+
+def finish_trace(total_seconds: float) -> str:
+    """
+    Stop collecting and format the request's stages as a Server-Timing
+    header value; repeated stages (one per utterance) are summed.
+    """
+    trace = _trace.get() or []
+    _trace.set(None)
+    durations = {}
+    for name, seconds in trace:
+        durations[name] = durations.get(name, 0.0) + seconds
+    parts = [f'{name};dur={seconds * 1000:.2f}' for name, seconds in durations.items()]
+    parts.append(f'total;dur={total_seconds * 1000:.2f}')
+    return ', '.join(parts)
+
+
+# Process-wide metrics used by the hot-path timers
+metrics = Metrics(enabled=Config.METRICS_ENABLED)
@@ -0,0 +1,121 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List
+
+
+class MicroBatcher:
+    """
+    Gathers concurrent single-item requests into batches.
+
+    Requests are grouped by key (e.g. a language pair). A group is run as
+    one batch once it holds max_batch_size items or max_wait_ms after its
+    first item arrived, whichever comes first; each caller gets a Future
+    for its own result. Batches run on a small thread pool and a batch is
+    only formed when one of its workers is free, so under load requests
+    keep gathering while the model is busy.
+    """
+
+    def __init__(self, run_batch: Callable[[Hashable, List[Any]], List[Any]],
+                 max_batch_size: int = 32, max_wait_ms: float = 5.0, workers: int = 2,
+                 name: str = 'micro-batch'):
+        self._run_batch = run_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self._slots = threading.Semaphore(workers)
+        self._cond = threading.Condition()
+        # key -> [(item, future)], and when each group must be sent
+        self._groups: Dict[Hashable, List] = {}
+        self._deadlines: Dict[Hashable, float] = {}
+        self._thread = None
+        self._closed = False
+        self.requests = 0
+        self.batches = 0
+        self.max_batch_seen = 0
+
+    def submit(self, key: Hashable, item: Any) -> Future:
+        """Queue one item; the future resolves to its entry of the batch result"""
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError('MicroBatcher is closed')
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._schedule, name='micro-batch-scheduler',
+                                                daemon=True)
+                self._thread.start()
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = []
+                self._deadlines[key] = time.monotonic() + self.max_wait
+            group.append((item, future))
+            self.requests += 1
+            if len(group) == 1 or len(group) >= self.max_batch_size:
+                self._cond.notify()
+        return future
+
+    def _schedule(self):
+        while True:
+            # Only form a batch once a worker can take it: while all workers
+            # are busy, new requests keep joining the waiting groups
+            self._slots.acquire()
+            with self._cond:
+                while True:
+                    now = time.monotonic()
+                    ready = [key for key, group in self._groups.items()
+                             if len(group) >= self.max_batch_size
+                             or self._deadlines[key] <= now or self._closed]
+                    if ready:
+                        break
+                    if self._closed:
+                        self._slots.release()
+                        return
+                    timeout = min(self._deadlines.values()) - now if self._deadlines else None
+                    self._cond.wait(timeout)
+
+                # Oldest group first; anything beyond a full batch stays queued
+                key = min(ready, key=self._deadlines.__getitem__)
+                group = self._groups[key]
+                batch = group[:self.max_batch_size]
+                if len(group) > self.max_batch_size:
+                    del group[:self.max_batch_size]
+                else:
+                    del self._groups[key]
+                    del self._deadlines[key]
+                self.batches += 1
+                self.max_batch_seen = max(self.max_batch_seen, len(batch))
+
+            self._executor.submit(self._run, key, batch)
+
+    def _run(self, key: Hashable, batch: List):
+        try:
+            results = self._run_batch(key, [item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        finally:
+            self._slots.release()
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def close(self):
+        """Send whatever is queued, then stop accepting requests"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                'queued': sum(len(group) for group in self._groups.values()),
+                'requests': self.requests,
+                'batches': self.batches,
+                'avg_batch_size': round(self.requests / self.batches, 2) if self.batches else 0.0,
+                'max_batch_size_seen': self.max_batch_seen,
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait * 1000
+            }
@@ -1,5 +1,203 @@
+import math
 import os
 import sys
+import threading
+from typing import Iterator, List, Optional, Union
+from config import Config
+from utils.asr_cache import ASRCache
+from utils.audio import (AudioInput, PCMAudio, UnsupportedAudioFormat, as_buffer,
+                         concat_wav, decode_wav, is_path, temporary_audio_file)
+from utils.cache import TTLCache
+from utils.metrics import metrics
+from utils.micro_batcher import MicroBatcher
+from utils.model_registry import ModelRegistry
+from utils.pipeline import StagedPipeline
+from utils.streaming_asr import split_utterances
+from utils.tts_cache import create_tts_cache, tts_cache_key
+
+ML_PATH = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..', 'ml'))
+
+
+def add_ml_path() -> bool:
+    """Make the ML packages importable; False if the ml/ directory is missing"""
+    if not os.path.exists(ML_PATH):
+        return False
+    # Once per process; every entry added here slows later imports
+    if ML_PATH not in sys.path:
+        sys.path.insert(0, ML_PATH)
+    return True
+
+
+# Phrase lookups, cache keys and the ML translator share one normalization
+add_ml_path()
+from translation.normalize import normalize_text
+
+# Mock phrase tables (until ML teammate provides their translation model)
+MOCK_TRANSLATIONS = {
+    ('garhwali', 'hindi'): {
+        'म्यर पेट दुखाण छ': 'मुझे पेट दर्द है',
+        'केदारनाथ सै नजदीक लोकल मंदिर कठां छ?': 'केदारनाथ के पास स्थानीय मंदिर कहाँ है?',
+        'यख असली गढ़वाली खान कठां मिल्ली?': 'यहाँ असली गढ़वाली खाना कहाँ मिलेगा?'
+    },
+    ('garhwali', 'english'): {
+        'म्यर पेट दुखाण छ': 'I have stomach pain',
+        'केदारनाथ सै नजदीक लोकल मंदिर कठां छ?': 'Where is the local temple near Kedarnath?',
+        'यख असली गढ़वाली खान कठां मिल्ली?': 'Where can I get authentic Garhwali food?'
+    },
+    ('kumaoni', 'hindi'): {
+        'केदारनाथ कै पास लोकल मंदिर कत छ?': 'केदारनाथ के पास स्थानीय मंदिर कहाँ है?',
+        'यख असली कुमाऊँनी खान कां मिलछे?': 'यहाँ असली कुमाऊँनी खाना कहाँ मिलेगा?'
+    },
+    ('kumaoni', 'english'): {
+        'केदारनाथ कै पास लोकल मंदिर कत छ?': 'Where is the local temple near Kedarnath?',
+        'यख असली कुमाऊँनी खान कां मिलछे?': 'Where can I get authentic Kumaoni food?'
+    }
+}
+
+
+# Lookup tables keyed on normalized text, built once at import
+_TRANSLATION_TABLES = {
+    pair: {normalize_text(source): target for source, target in phrases.items()}
+    for pair, phrases in MOCK_TRANSLATIONS.items()
+}
+
+
+class MockTranslationModel:
+    """Phrase-table stand-in for the translation model"""
+    
+    def __init__(self, config=Config):
+        # Closest phrase for near misses, e.g. ASR output missing a matra
+        self.fuzzy_indexes = {}
+        if config.TRANSLATION_FUZZY_MATCH:
+            from translation.fuzzy_index import FuzzyIndex
+            self.fuzzy_indexes = {
+                pair: FuzzyIndex(table, max_ratio=config.TRANSLATION_FUZZY_MAX_RATIO)
+                for pair, table in _TRANSLATION_TABLES.items()
+            }
+    
+    def translate_batch(self, texts: List[str], input_lang: str, output_lang: str) -> List[dict]:
+        table = _TRANSLATION_TABLES.get((input_lang, output_lang), {})
+        fuzzy_index = self.fuzzy_indexes.get((input_lang, output_lang))
+        results = []
+        for text in texts:
+            if text in table:
+                results.append({
+                    'translated_text': table[text],
+                    'confidence': 0.90
+                })
+                continue
+            match = fuzzy_index.search(text) if fuzzy_index is not None else None
+            if match is not None:
+                # Confidence falls with the grapheme edit distance
+                results.append({
+                    'translated_text': table[match.phrase],
+                    'confidence': round(0.90 * match.similarity, 2)
+                })
+            else:
+                results.append({
+                    'translated_text': f'[Translation for: {text}]',
+                    'confidence': 0.70
+                })
+        return results
+
+
+class MockASRModel:
+    """Stand-in for the ASR model"""
+    
+    # Cached transcripts are dropped when this changes
+    version = 'mock-1'
+    
+    def transcribe(self, audio: Union[str, PCMAudio], language: str) -> dict:
+        return {
+            'text': 'म्यर पेट दुखाण छ',  # Sample Garhwali text
+            'confidence': 0.85,
+            'language_detected': language
+        }
+
+
+class WhisperASRModel:
+    """OpenAI Whisper ASR (prototype in ml/asr_test.py)"""
+    
+    def __init__(self, model_name: str):
+        import whisper
+        self.model = whisper.load_model(model_name)
+        self.version = f'whisper-{model_name}'
+    
+    def transcribe(self, audio: Union[str, PCMAudio], language: str) -> dict:
+        """Transcribe an audio file path or decoded PCM"""
+        if isinstance(audio, PCMAudio):
+            audio = audio.to_float32_mono()
+        result = self.model.transcribe(audio)
+        segments = result.get('segments') or []
+        confidence = 0.0
+        if segments:
+            avg_logprob = sum(s['avg_logprob'] for s in segments) / len(segments)
+            confidence = round(math.exp(avg_logprob), 4)
+        return {
+            'text': result['text'].strip(),
+            'confidence': confidence,
+            'language_detected': language
+        }
+
+
+class MockTTSModel:
+    """Stand-in for the TTS model"""
+    
+    # Audio types synthesize_stream can produce
+    formats = ('audio/wav',)
+    
+    def synthesize(self, text: str, language: str) -> bytes:
+        return b''
+    
+    def synthesize_stream(self, text: str, language: str,
+                          mimetype: str = 'audio/wav') -> Iterator[bytes]:
+        """Yield audio chunks as they are produced"""
+        audio = self.synthesize(text, language)
+        if audio:
+            yield audio
+
+
+def _load_asr_model(config=Config):
+    if config.ASR_MODEL == 'mock':
+        return MockASRModel()
+    return WhisperASRModel(config.ASR_MODEL)
+
+
+def model_loaders(config=Config) -> dict:
+    """Loaders of the ASR, translation and TTS models in this process"""
+    return {
+        'asr': lambda: _load_asr_model(config),
+        'translation': lambda: MockTranslationModel(config),
+        'tts': MockTTSModel
+    }
+
+
+def create_model_registry(config=Config) -> ModelRegistry:
+    """
+    Registry with the models selected in config: loaded in this process,
+    or proxies to the inference worker pool (INFERENCE_BACKEND = 'pool')
+    """
+    if config.INFERENCE_BACKEND == 'pool':
+        from utils.inference_pool import create_remote_loaders
+        loaders = create_remote_loaders(config)
+    else:
+        loaders = model_loaders(config)
+    return ModelRegistry(loaders, retry_after=config.MODEL_LOAD_RETRY_SECONDS,
+                         max_retry_after=config.MODEL_LOAD_RETRY_MAX_SECONDS)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Process-wide model registry, so every model is loaded once per worker"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = create_model_registry()
+        return _registry
+
 
 class MLIntegration:
     """
@@ -7,42 +205,120 @@ class MLIntegration:
     This acts as a bridge between backend API and ML code.
     """
     
-    def __init__(self):
+    def __init__(self, config=Config, registry: Optional[ModelRegistry] = None):
+        self.config = config
         self.asr_available = False
         self.translation_available = False
+        self._pipeline = None
+        self._pipeline_lock = threading.Lock()
+        self.models = registry if registry is not None else get_model_registry()
+        self.micro_batch_size = config.TRANSLATION_MICRO_BATCH_SIZE
+        self.translation_cache = None
+        if config.TRANSLATION_CACHE_ENABLED:
+            self.translation_cache = TTLCache(
+                max_entries=config.TRANSLATION_CACHE_MAX_ENTRIES,
+                max_bytes=config.TRANSLATION_CACHE_MAX_BYTES,
+                ttl_seconds=config.TRANSLATION_CACHE_TTL
+            )
+        self.translation_batcher = None
+        if config.TRANSLATION_BATCHER_ENABLED:
+            self.translation_batcher = MicroBatcher(
+                lambda langs, texts: self.translate_batch(texts, *langs),
+                max_batch_size=config.TRANSLATION_BATCHER_MAX_BATCH_SIZE,
+                max_wait_ms=config.TRANSLATION_BATCHER_MAX_WAIT_MS,
+                workers=config.TRANSLATION_BATCHER_WORKERS,
+                name='translate-batch'
+            )
+        self.tts_cache = create_tts_cache(config)
+        self.asr_cache = None
+        if config.ASR_CACHE_ENABLED:
+            self.asr_cache = ASRCache(
+                max_entries=config.ASR_CACHE_MAX_ENTRIES,
+                near_duplicate=config.ASR_CACHE_NEAR_DUPLICATE,
+                max_distance=config.ASR_CACHE_MAX_DISTANCE
+            )
         self._setup_ml_paths()
     
     def _setup_ml_paths(self):
         """Add ML module to Python path"""
-        ml_path = os.path.join(os.path.dirname(__file__), '..', '..', 'ml')
-        if os.path.exists(ml_path):
-            sys.path.insert(0, ml_path)
+        if add_ml_path():
             self.asr_available = True
             self.translation_available = True
     
-    def speech_to_text(self, audio_file_path: str, language: str) -> dict:
+    def get_model_status(self) -> dict:
+        """Get model readiness and load timings"""
+        return self.models.status()
+    
+    def get_inference_stats(self) -> dict:
+        """Where models run, with batching stats of the inference pool"""
+        if self.config.INFERENCE_BACKEND != 'pool':
+            return {'backend': 'inprocess'}
+        try:
+            from utils.inference_pool import get_inference_client
+            return get_inference_client(self.config).stats()
+        except Exception as e:
+            return {'backend': 'pool', 'error': str(e)}
+    
+    def get_cache_stats(self) -> dict:
+        """Get translation cache statistics"""
+        if self.translation_cache is None:
+            return {'enabled': False}
+        return {'enabled': True, **self.translation_cache.stats()}
+    
+    def get_batcher_stats(self) -> dict:
+        """Get micro-batching statistics of single translations"""
+        if self.translation_batcher is None:
+            return {'enabled': False}
+        return {'enabled': True, **self.translation_batcher.stats()}
+    
+    def get_asr_cache_stats(self) -> dict:
+        """Get ASR result cache statistics"""
+        if self.asr_cache is None:
+            return {'enabled': False}
+        return {'enabled': True, **self.asr_cache.stats()}
+    
+    def get_tts_cache_stats(self) -> dict:
+        """Get TTS audio cache statistics per tier"""
+        if self.tts_cache is None:
+            return {'enabled': False}
+        return {'enabled': True, **self.tts_cache.stats()}
+    
+    @metrics.timed('asr')
+    def speech_to_text(self, audio: AudioInput, language: str,
+                       audio_format: Optional[str] = None) -> dict:
         """
         Call ML teammate's ASR (Automatic Speech Recognition) model.
         
+        WAV audio passed in memory is decoded straight into a NumPy view
+        of the buffer. Other formats are written to a unique temporary
+        file for the model's external decoder. Results for decoded audio
+        are cached by a hash of the PCM samples.
+        
         Args:
-            audio_file_path: Path to audio file
+            audio: Path to audio file, audio bytes/memoryview/file-like,
+                or already decoded PCMAudio
             language: Input language (garhwali/kumaoni)
+            audio_format: File extension hint for in-memory audio (wav/mp3/ogg)
         
         Returns:
             dict with 'text' and 'confidence'
         """
         try:
-            # Try to import ML teammate's ASR module
-            # from asr_model import recognize_speech
-            # result = recognize_speech(audio_file_path, language)
-            # return result
+            # Loaded once per process by the model registry
+            # (mock until ML teammate provides their code)
+            model = self.models.get('asr')
+            if isinstance(audio, PCMAudio):
+                return self._transcribe_pcm(model, audio, language)
+            if is_path(audio):
+                return model.transcribe(os.fspath(audio), language)
             
-            # FOR NOW: Mock response (until ML teammate provides their code)
-            return {
-                'text': 'म्यर पेट दुखाण छ',  # Sample Garhwali text
-                'confidence': 0.85,
-                'language_detected': language
-            }
+            buffer = as_buffer(audio)
+            try:
+                pcm = decode_wav(buffer)
+            except UnsupportedAudioFormat:
+                with temporary_audio_file(buffer, audio_format) as path:
+                    return model.transcribe(path, language)
+            return self._transcribe_pcm(model, pcm, language)
             
         except ImportError:
             # Fallback if ML code not available yet
@@ -52,10 +328,29 @@ class MLIntegration:
                 'error': 'ASR module not found'
             }
     
+    def _transcribe_pcm(self, model, audio: PCMAudio, language: str) -> dict:
+        if self.asr_cache is None:
+            return model.transcribe(audio, language)
+        
+        version = getattr(model, 'version', type(model).__name__)
+        key = self.asr_cache.make_key(audio, language, version)
+        cached = self.asr_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        result = model.transcribe(audio, language)
+        if not result.get('error'):
+            self.asr_cache.set(key, result)
+        return result
+    
+    @metrics.timed('translation')
     def translate_text(self, text: str, input_lang: str, output_lang: str) -> dict:
         """
         Call ML teammate's translation model.
         
+        Cache misses are handed to the micro-batcher, which runs concurrent
+        calls for the same language pair as one batch.
+        
         Args:
             text: Input text to translate
             input_lang: Source language (garhwali/kumaoni)
@@ -64,57 +359,87 @@ class MLIntegration:
         Returns:
             dict with 'translated_text' and 'confidence'
         """
-        try:
-            # Try to import ML teammate's translation module
-            # from translation_model import translate
-            # result = translate(text, input_lang, output_lang)
-            # return result
-            
-            # FOR NOW: Mock translation (until ML teammate provides their code)
-            mock_translations = {
-                ('garhwali', 'hindi'): {
-                    'म्यर पेट दुखाण छ': 'मुझे पेट दर्द है',
-                    'केदारनाथ सै नजदीक लोकल मंदिर कठां छ?': 'केदारनाथ के पास स्थानीय मंदिर कहाँ है?',
-                    'यख असली गढ़वाली खान कठां मिल्ली?': 'यहाँ असली गढ़वाली खाना कहाँ मिलेगा?'
-                },
-                ('garhwali', 'english'): {
-                    'म्यर पेट दुखाण छ': 'I have stomach pain',
-                    'केदारनाथ सै नजदीक लोकल मंदिर कठां छ?': 'Where is the local temple near Kedarnath?',
-                    'यख असली गढ़वाली खान कठां मिल्ली?': 'Where can I get authentic Garhwali food?'
-                },
-                ('kumaoni', 'hindi'): {
-                    'केदारनाथ कै पास लोकल मंदिर कत छ?': 'केदारनाथ के पास स्थानीय मंदिर कहाँ है?',
-                    'यख असली कुमाऊँनी खान कां मिलछे?': 'यहाँ असली कुमाऊँनी खाना कहाँ मिलेगा?'
-                },
-                ('kumaoni', 'english'): {
-                    'केदारनाथ कै पास लोकल मंदिर कत छ?': 'Where is the local temple near Kedarnath?',
-                    'यख असली कुमाऊँनी खान कां मिलछे?': 'Where can I get authentic Kumaoni food?'
-                }
-            }
-            
-            key = (input_lang, output_lang)
-            if key in mock_translations and text in mock_translations[key]:
-                return {
-                    'translated_text': mock_translations[key][text],
-                    'confidence': 0.90
-                }
+        if self.translation_batcher is None:
+            return self.translate_batch([text], input_lang, output_lang)[0]
+        
+        # Cache hits don't wait for a batch to fill
+        if self.translation_cache is not None:
+            cached = self.translation_cache.get((normalize_text(text), input_lang, output_lang))
+            if cached is not None:
+                return dict(cached)
+        return self.translation_batcher.submit((input_lang, output_lang), text).result()
+    
+    @metrics.timed('translation_batch')
+    def translate_batch(self, texts: List[str], input_lang: str, output_lang: str) -> List[dict]:
+        """
+        Translate many texts with batched model calls.
+        
+        Inputs are deduplicated on normalized text, cache hits are served
+        directly, and the remaining texts are sorted by length into
+        micro-batches so each padded batch wastes as little as possible.
+        
+        Args:
+            texts: Input texts to translate
+            input_lang: Source language (garhwali/kumaoni)
+            output_lang: Target language (hindi/english)
+        
+        Returns:
+            list of dicts with 'translated_text' and 'confidence',
+            in the same order as texts
+        """
+        # normalized text -> positions in the input
+        positions = {}
+        for i, text in enumerate(texts):
+            positions.setdefault(normalize_text(text), []).append(i)
+        
+        results = {}
+        pending = []
+        for normalized in positions:
+            cached = None
+            if self.translation_cache is not None:
+                cached = self.translation_cache.get((normalized, input_lang, output_lang))
+            if cached is not None:
+                results[normalized] = cached
             else:
-                return {
-                    'translated_text': f'[Translation for: {text}]',
-                    'confidence': 0.70
-                }
+                pending.append(normalized)
+        
+        pending.sort(key=len)
+        for start in range(0, len(pending), self.micro_batch_size):
+            batch = pending[start:start + self.micro_batch_size]
+            for normalized, result in zip(batch, self._run_translation_batch(batch, input_lang, output_lang)):
+                results[normalized] = result
+                if self.translation_cache is not None and 'error' not in result:
+                    self.translation_cache.set((normalized, input_lang, output_lang), result)
+        
+        # Scatter back to input order
+        output = [None] * len(texts)
+        for normalized, indexes in positions.items():
+            for i in indexes:
+                output[i] = dict(results[normalized])
+        return output
+    
+    def _run_translation_batch(self, texts: List[str], input_lang: str, output_lang: str) -> List[dict]:
+        """Run one micro-batch through the translation model"""
+        try:
+            # Loaded once per process by the model registry
+            # (mock until ML teammate provides their code)
+            return self.models.get('translation').translate_batch(texts, input_lang, output_lang)
                 
         except ImportError:
-            return {
+            return [{
                 'translated_text': '[Translation module not integrated yet]',
                 'confidence': 0.0,
                 'error': 'Translation module not found'
-            }
+            } for _ in texts]
     
+    @metrics.timed('tts')
     def text_to_speech(self, text: str, language: str) -> bytes:
         """
         Call ML teammate's TTS (Text-to-Speech) model.
         
+        Synthesized audio is cached by a hash of text, language and the
+        model's voice params, in memory and on disk.
+        
         Args:
             text: Text to convert to speech
             language: Output language
@@ -123,13 +448,174 @@ class MLIntegration:
             Audio bytes
         """
         try:
-            # Try to import ML teammate's TTS module
-            # from tts_model import generate_speech
-            # audio_bytes = generate_speech(text, language)
-            # return audio_bytes
+            key = None
+            if self.tts_cache is not None:
+                key = self._tts_cache_key(text, language)
+                cached = self.tts_cache.get(key)
+                if cached is not None:
+                    return cached
             
-            # FOR NOW: Return empty bytes (until ML teammate provides TTS)
-            return b''
+            # Loaded once per process by the model registry
+            # (returns empty bytes until ML teammate provides TTS)
+            audio = self.models.get('tts').synthesize(text, language)
+            if key is not None and audio:
+                self.tts_cache.set(key, audio)
+            return audio
             
         except ImportError:
-            return b''
\ No newline at end of file
+            return b''
+    
+    def tts_formats(self) -> tuple:
+        """Audio types the TTS model can stream"""
+        return getattr(self.models.get('tts'), 'formats', ('audio/wav',))
+    
+    def text_to_speech_stream(self, text: str, language: str,
+                              mimetype: str = 'audio/wav') -> Iterator[bytes]:
+        """
+        Stream TTS audio chunk by chunk as the model produces it.
+        
+        Models without synthesize_stream yield their whole output at once.
+        Cached audio is yielded in one piece; freshly synthesized audio is
+        cached once the stream completes.
+        
+        Args:
+            text: Text to convert to speech
+            language: Output language
+            mimetype: One of tts_formats()
+        
+        Yields:
+            Audio bytes
+        """
+        key = None
+        if self.tts_cache is not None:
+            key = self._tts_cache_key(text, language, mimetype)
+            cached = self.tts_cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+        
+        tts = self.models.get('tts')
+        if hasattr(tts, 'synthesize_stream'):
+            chunks = tts.synthesize_stream(text, language, mimetype)
+        else:
+            chunks = [tts.synthesize(text, language)]
+        
+        audio = []
+        for chunk in chunks:
+            audio.append(chunk)
+            yield chunk
+        if key is not None and any(audio):
+            self.tts_cache.set(key, b''.join(audio), mimetype)
+    
+    def cached_speech_path(self, text: str, language: str,
+                           mimetype: str = 'audio/wav') -> Optional[str]:
+        """File with previously synthesized audio, so it can be sent with sendfile"""
+        if self.tts_cache is None:
+            return None
+        return self.tts_cache.get_path(self._tts_cache_key(text, language, mimetype))
+    
+    def _tts_cache_key(self, text: str, language: str, mimetype: str = 'audio/wav') -> str:
+        voice = getattr(self.models.get('tts'), 'voice_params', None)
+        # Punctuation stays, it changes the intonation
+        return tts_cache_key(normalize_text(text, strip_punctuation=False), language, mimetype, voice)
+    
+    def warm_tts_cache(self, background: bool = False) -> Optional[threading.Thread]:
+        """Synthesize every phrase-table output into the TTS cache, optionally in a daemon thread"""
+        if self.tts_cache is None:
+            return None
+        
+        def warm():
+            for (_, output_lang), phrases in MOCK_TRANSLATIONS.items():
+                for text in set(phrases.values()):
+                    try:
+                        if self._tts_cache_key(text, output_lang) not in self.tts_cache:
+                            self.text_to_speech(text, output_lang)
+                    except Exception:
+                        # A broken TTS model shows up in get_model_status()
+                        return
+        
+        if not background:
+            warm()
+            return None
+        
+        thread = threading.Thread(target=warm, name='tts-cache-warm', daemon=True)
+        thread.start()
+        return thread
+    
+    # ===== VOICE TRANSLATION PIPELINE (ASR → MT → TTS) =====
+    
+    @property
+    def pipeline(self) -> StagedPipeline:
+        """Worker pools per stage, created on first use"""
+        if self._pipeline is None:
+            with self._pipeline_lock:
+                if self._pipeline is None:
+                    self._pipeline = StagedPipeline([
+                        ('asr', self.config.PIPELINE_ASR_WORKERS),
+                        ('translation', self.config.PIPELINE_TRANSLATION_WORKERS),
+                        ('tts', self.config.PIPELINE_TTS_WORKERS)
+                    ])
+        return self._pipeline
+    
+    @metrics.timed('vad')
+    def split_audio(self, audio: AudioInput) -> List[AudioInput]:
+        """
+        Split WAV audio into utterances with the VAD; other formats
+        (or audio without detected speech) stay one segment.
+        """
+        if is_path(audio) or isinstance(audio, PCMAudio):
+            pcm = audio if isinstance(audio, PCMAudio) else None
+        else:
+            audio = as_buffer(audio)
+            try:
+                pcm = decode_wav(audio)
+            except UnsupportedAudioFormat:
+                pcm = None
+        
+        if pcm is None:
+            return [audio]
+        segments = split_utterances(
+            pcm,
+            frame_ms=self.config.VAD_FRAME_MS,
+            energy_threshold=self.config.VAD_ENERGY_THRESHOLD,
+            silence_ms=self.config.VAD_SILENCE_MS,
+            max_segment_ms=self.config.STREAM_MAX_SEGMENT_MS
+        )
+        return [segment for segment, _ in segments] or [pcm]
+    
+    def voice_translate(self, audio: AudioInput, input_lang: str, output_lang: str,
+                        audio_format: Optional[str] = None) -> dict:
+        """
+        Voice → ASR → Translation → TTS, pipelined per utterance.
+        
+        The audio is split into utterances which flow through the ASR,
+        translation and TTS worker pools concurrently, so TTS of the first
+        utterance overlaps with ASR of the next ones.
+        
+        Returns:
+            dict with input/output text, output audio bytes, confidences,
+            the number of segments and per-stage timings
+        """
+        segments = self.split_audio(audio)
+        states, timings = self.pipeline.run(segments, {
+            'asr': lambda state: self.speech_to_text(state['item'], input_lang, audio_format),
+            'translation': lambda state: self.translate_text(
+                state['asr'].get('text', ''), input_lang, output_lang),
+            'tts': lambda state: self.text_to_speech(
+                state['translation'].get('translated_text', ''), output_lang)
+        })
+        
+        return {
+            'input_text': ' '.join(state['asr'].get('text', '') for state in states),
+            'output_text': ' '.join(state['translation'].get('translated_text', '') for state in states),
+            'output_audio': concat_wav([state['tts'] for state in states]),
+            'asr_confidence': _mean(state['asr'].get('confidence') for state in states),
+            'translation_confidence': _mean(state['translation'].get('confidence') for state in states),
+            'segments': len(states),
+            'timings': timings
+        }
+
+
+def _mean(values) -> Optional[float]:
+    values = [value for value in values if value is not None]
+    return round(sum(values) / len(values), 4) if values else None
@@ -0,0 +1,105 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class ModelRegistry:
+    """
+    Loads each ML model once per process and tracks its load status.
+    Models can be preloaded (optionally in a background thread) or are
+    loaded on first use; concurrent callers wait for the same load.
+
+    A failed load is retried by the first request after a backoff that
+    doubles with each consecutive failure; until then requests get the
+    recorded error without calling the loader again.
+    """
+
+    def __init__(self, loaders: Dict[str, Callable[[], Any]],
+                 retry_after: float = 1.0, max_retry_after: float = 60.0):
+        self._loaders = dict(loaders)
+        self._models = {}
+        self._errors = {}
+        self._failures = {}
+        self._retry_at = {}
+        self._load_times = {}
+        self._locks = {name: threading.Lock() for name in self._loaders}
+        self.retry_after = retry_after
+        self.max_retry_after = max_retry_after
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        """Add or replace a model loader (before the model is loaded)"""
+        self._loaders[name] = loader
+        self._locks.setdefault(name, threading.Lock())
+        self._models.pop(name, None)
+        self._errors.pop(name, None)
+        self._failures.pop(name, None)
+        self._retry_at.pop(name, None)
+        self._load_times.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        """Return the loaded model, loading it now if needed"""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        with self._locks[name]:
+            if name in self._models:
+                return self._models[name]
+            if name in self._errors and time.monotonic() < self._retry_at[name]:
+                raise self._errors[name]
+
+            start = time.perf_counter()
+            try:
+                model = self._loaders[name]()
+            except Exception as e:
+                failures = self._failures[name] = self._failures.get(name, 0) + 1
+                backoff = min(self.retry_after * 2 ** (failures - 1), self.max_retry_after)
+                self._errors[name] = e
+                self._retry_at[name] = time.monotonic() + backoff
+                raise
+            finally:
+                self._load_times[name] = round((time.perf_counter() - start) * 1000, 2)
+
+            self._errors.pop(name, None)
+            self._failures.pop(name, None)
+            self._retry_at.pop(name, None)
+            self._models[name] = model
+            return model
+
+    def preload(self, background: bool = False) -> Optional[threading.Thread]:
+        """Load every registered model, optionally in a daemon thread"""
+        def load_all():
+            for name in list(self._loaders):
+                try:
+                    self.get(name)
+                except Exception:
+                    # Recorded in status(); the request path reports it too
+                    pass
+
+        if not background:
+            load_all()
+            return None
+
+        thread = threading.Thread(target=load_all, name='model-preload', daemon=True)
+        thread.start()
+        return thread
+
+    def is_ready(self, name: Optional[str] = None) -> bool:
+        if name is not None:
+            return name in self._models
+        return all(name in self._models for name in self._loaders)
+
+    def status(self) -> Dict:
+        """Get readiness and load timings of all models"""
+        return {
+            'ready': self.is_ready(),
+            'models': {
+                name: {
+                    'ready': name in self._models,
+                    'load_time_ms': self._load_times.get(name),
+                    'error': str(self._errors[name]) if name in self._errors else None,
+                    'failures': self._failures.get(name, 0)
+                }
+                for name in self._loaders
+            }
+        }
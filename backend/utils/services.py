@@ -0,0 +1,127 @@
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from flask import Flask, current_app
+from config import Config
+from utils.admission import AdmissionController, create_admission_controller
+from utils.db_helper import DatabaseHelper, create_database_helper
+from utils.ml_integration import MLIntegration
+from utils.write_behind import WriteBehindWriter
+
+EXTENSION_NAME = 'voice_assistant'
+
+
+class ServiceContainer:
+    """
+    Heavy per-worker services shared by all blueprints.
+    Each service is built exactly once, on first use, and attached to
+    the Flask app as app.extensions['voice_assistant'].
+    """
+
+    def __init__(self, config=Config):
+        self.config = config
+        self._lock = threading.RLock()
+        self._services: Dict[str, Any] = {}
+        self._cleanup_registered = False
+        self._factories: Dict[str, Callable[[], Any]] = {
+            'ml': lambda: MLIntegration(self.config),
+            'db': lambda: create_database_helper(self.config),
+            'db_writer': self._create_db_writer,
+            'executor': self._create_executor,
+            'admission': lambda: create_admission_controller(self.config)
+        }
+
+    def _create_db_writer(self):
+        if not self.config.WRITE_BEHIND_ENABLED:
+            return self.db
+        writer = WriteBehindWriter(
+            self.db,
+            max_queue=self.config.WRITE_BEHIND_QUEUE_SIZE,
+            batch_size=self.config.WRITE_BEHIND_BATCH_SIZE,
+            flush_interval=self.config.WRITE_BEHIND_FLUSH_INTERVAL,
+            policy=self.config.WRITE_BEHIND_POLICY,
+            block_timeout=self.config.WRITE_BEHIND_BLOCK_TIMEOUT
+        )
+        self._register_cleanup()
+        return writer
+
+    def _create_executor(self):
+        executor = ThreadPoolExecutor(max_workers=self.config.ASYNC_MODEL_WORKERS,
+                                      thread_name_prefix='model')
+        self._register_cleanup()
+        return executor
+
+    def _register_cleanup(self):
+        # One exit hook per container, however many services need cleanup
+        if not self._cleanup_registered:
+            self._cleanup_registered = True
+            atexit.register(self.close)
+
+    def close(self):
+        """
+        Flush queued database rows and stop the executor threads.
+        Runs at interpreter exit; call it directly when discarding an app
+        (e.g. in tests) so its services don't live until exit.
+        """
+        with self._lock:
+            writer = self._services.pop('db_writer', None)
+            executor = self._services.pop('executor', None)
+            if self._cleanup_registered:
+                self._cleanup_registered = False
+                atexit.unregister(self.close)
+        if isinstance(writer, WriteBehindWriter):
+            writer.close()
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def init_app(self, app: Flask):
+        app.extensions[EXTENSION_NAME] = self
+
+    def get(self, name: str) -> Any:
+        # Membership, not truthiness: a disabled service is built as None
+        if name not in self._services:
+            with self._lock:
+                if name not in self._services:
+                    self._services[name] = self._factories[name]()
+        return self._services[name]
+
+    @property
+    def ml(self) -> MLIntegration:
+        return self.get('ml')
+
+    @property
+    def db(self) -> DatabaseHelper:
+        return self.get('db')
+
+    @property
+    def db_writer(self):
+        """Where request handlers log rows: the write-behind queue, or the db itself"""
+        return self.get('db_writer')
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Threads that run blocking model and database calls for the ASGI app"""
+        return self.get('executor')
+
+    @property
+    def admission(self) -> Optional[AdmissionController]:
+        """Concurrency limits of the model-heavy endpoints, or None when disabled"""
+        return self.get('admission')
+
+    def get_db_writer_stats(self) -> Dict:
+        """Write-behind queue metrics, if enabled"""
+        if not isinstance(self.db_writer, WriteBehindWriter):
+            return {'enabled': False}
+        return {'enabled': True, **self.db_writer.stats()}
+
+    def get_admission_stats(self) -> Dict:
+        """Per-endpoint running and queued requests, if admission control is enabled"""
+        if self.admission is None:
+            return {'enabled': False}
+        return {'enabled': True, **self.admission.stats()}
+
+
+def get_services() -> ServiceContainer:
+    """Service container of the current app"""
+    return current_app.extensions[EXTENSION_NAME]
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+from utils.audio import PCMAudio
+from utils.lazy import lazy_import
+
+# Imported on first use, so starting a worker doesn't pay for it
+np = lazy_import('numpy')
+
+
+def frame_energy(frame: np.ndarray) -> float:
+    """RMS energy of a (frames, channels) block, on a [-1, 1] scale"""
+    audio = frame.astype(np.float32)
+    if frame.dtype == np.uint8:
+        audio = (audio - 128.0) / 128.0
+    elif frame.dtype.kind == 'i':
+        audio /= float(np.iinfo(frame.dtype).max + 1)
+    return float(np.sqrt(np.mean(np.square(audio))))
+
+
+class UtteranceSegmenter:
+    """
+    Energy-based VAD that splits incoming PCM into utterances.
+    
+    An utterance starts after min_speech_ms of speech (keeping preroll_ms
+    of audio before the onset) and ends after silence_ms of silence or
+    when it reaches max_segment_ms. While an utterance is in progress a
+    'partial' event with the audio so far is produced every
+    partial_interval_ms (None disables partials).
+    
+    Events are (kind, audio, start_ms) tuples, kind 'partial' or 'final'.
+    """
+
+    def __init__(self, sample_rate: int, frame_ms: int = 30,
+                 energy_threshold: float = 0.01, min_speech_ms: int = 90,
+                 silence_ms: int = 500, partial_interval_ms: Optional[int] = 500,
+                 max_segment_ms: int = 15000, preroll_ms: int = 300):
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.frame_size = max(int(sample_rate * frame_ms / 1000), 1)
+        self.energy_threshold = energy_threshold
+        self.min_speech_frames = max(min_speech_ms // frame_ms, 1)
+        self.silence_frames = max(silence_ms // frame_ms, 1)
+        self.partial_frames = max(partial_interval_ms // frame_ms, 1) if partial_interval_ms else None
+        self.max_segment_frames = max(max_segment_ms // frame_ms, 1)
+
+        self._pending = None
+        self._preroll = deque(maxlen=max(preroll_ms // frame_ms, self.min_speech_frames))
+        self._segment: List[np.ndarray] = []
+        self._in_speech = False
+        self._speech_run = 0
+        self._silence_run = 0
+        self._since_partial = 0
+        self._frame_index = 0
+        self._segment_start = 0
+        self.segments = 0
+
+    def feed(self, samples: np.ndarray) -> List[Tuple[str, PCMAudio, int]]:
+        """Add (frames, channels) samples; returns the events produced"""
+        if self._pending is not None and len(self._pending):
+            samples = np.concatenate([self._pending, samples])
+
+        events = []
+        usable = len(samples) - len(samples) % self.frame_size
+        for start in range(0, usable, self.frame_size):
+            event = self._process_frame(samples[start:start + self.frame_size])
+            if event is not None:
+                events.append(event)
+        self._pending = samples[usable:]
+        return events
+
+    def finish(self) -> List[Tuple[str, PCMAudio, int]]:
+        """End of stream: close whatever utterance is still open"""
+        if self._pending is not None and len(self._pending) and self._in_speech:
+            self._segment.append(self._pending)
+        self._pending = None
+        if self._in_speech:
+            return [self._finalize()]
+        return []
+
+    def _process_frame(self, frame: np.ndarray):
+        is_speech = frame_energy(frame) >= self.energy_threshold
+        self._frame_index += 1
+
+        if not self._in_speech:
+            self._preroll.append(frame)
+            self._speech_run = self._speech_run + 1 if is_speech else 0
+            if self._speech_run >= self.min_speech_frames:
+                # Start the utterance, keeping a little audio before the onset
+                self._in_speech = True
+                self._segment = list(self._preroll)
+                self._segment_start = self._frame_index - len(self._segment)
+                self._preroll.clear()
+                self._silence_run = 0
+                self._since_partial = len(self._segment)
+            return None
+
+        self._segment.append(frame)
+        self._silence_run = 0 if is_speech else self._silence_run + 1
+        self._since_partial += 1
+
+        if self._silence_run >= self.silence_frames or len(self._segment) >= self.max_segment_frames:
+            return self._finalize()
+        if self.partial_frames and self._since_partial >= self.partial_frames:
+            self._since_partial = 0
+            return self._event('partial')
+        return None
+
+    def _finalize(self):
+        event = self._event('final')
+        self.segments += 1
+        self._in_speech = False
+        self._speech_run = 0
+        self._segment = []
+        return event
+
+    def _event(self, kind: str):
+        audio = PCMAudio(np.concatenate(self._segment), self.sample_rate)
+        return kind, audio, self._segment_start * self.frame_ms
+
+
+def split_utterances(audio: PCMAudio, **vad_options) -> List[Tuple[PCMAudio, int]]:
+    """Split a whole clip into (utterance audio, start_ms) pairs"""
+    segmenter = UtteranceSegmenter(audio.sample_rate, partial_interval_ms=None, **vad_options)
+    events = segmenter.feed(audio.samples) + segmenter.finish()
+    return [(segment, start_ms) for _, segment, start_ms in events]
+
+
+class StreamingTranscriber:
+    """
+    Transcribes utterances from an UtteranceSegmenter incrementally.
+    
+    While an utterance is in progress a 'partial' transcript of the audio
+    so far is emitted every partial_interval_ms; when the utterance ends a
+    'final' transcript is emitted. Time to the first partial is bounded by
+    partial_interval_ms, not by the utterance length.
+    """
+
+    def __init__(self, transcribe: Callable[[PCMAudio], Dict], sample_rate: int, **vad_options):
+        self.transcribe = transcribe
+        self.segmenter = UtteranceSegmenter(sample_rate, **vad_options)
+
+    @property
+    def segments(self) -> int:
+        return self.segmenter.segments
+
+    def feed(self, samples: np.ndarray) -> List[Dict]:
+        """Add (frames, channels) samples; returns transcript events produced"""
+        segment = self.segments
+        return self._events(self.segmenter.feed(samples), segment)
+
+    def finish(self) -> List[Dict]:
+        """End of stream: transcribe whatever utterance is still open"""
+        segment = self.segments
+        return self._events(self.segmenter.finish(), segment)
+
+    def _events(self, events, segment: int) -> List[Dict]:
+        # Number segments as they were when each event was produced; one
+        # large chunk can hold several partials and finals
+        results = []
+        for kind, audio, start_ms in events:
+            results.append(self._event(kind, audio, start_ms, segment))
+            if kind == 'final':
+                segment += 1
+        return results
+
+    def _event(self, kind: str, audio: PCMAudio, start_ms: int, segment: int) -> Dict:
+        result = self.transcribe(audio)
+        return {
+            'type': kind,
+            'segment': segment,
+            'text': result.get('text', ''),
+            'confidence': result.get('confidence'),
+            'start_ms': start_ms,
+            'end_ms': start_ms + int(audio.duration * 1000)
+        }
@@ -0,0 +1,214 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from utils.cache import TTLCache
+
+AUDIO_EXTENSIONS = {
+    'audio/wav': '.wav',
+    'audio/ogg': '.ogg'
+}
+
+
+def tts_cache_key(text: str, language: str, mimetype: str = 'audio/wav',
+                  voice: Optional[Dict] = None) -> str:
+    """Content address of synthesized audio: hash of text, language and voice params"""
+    params = json.dumps([text.strip(), language, mimetype, voice or {}],
+                        ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(params.encode('utf-8')).hexdigest()
+
+
+class DiskAudioCache:
+    """
+    Size-capped directory of audio files named by their cache key.
+
+    Writes go to a temporary file which is renamed into place, so readers
+    never see partial audio. Reads bump the file's mtime and the least
+    recently used files are evicted once the directory exceeds max_bytes;
+    the LRU order survives restarts because it is rebuilt from mtimes.
+
+    Several worker processes may share the directory. Each one rebuilds
+    its view from the directory at most every rescan_interval seconds
+    when it writes, so max_bytes caps the whole directory; between
+    rescans it can be exceeded by what the other workers wrote.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024,
+                 rescan_interval: float = 30.0):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.rescan_interval = rescan_interval
+        self._lock = threading.Lock()
+        # key -> (path, size), least recently used first
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self._scan()
+
+    def _scan(self):
+        """Rebuild the entries and byte count from the files in the directory"""
+        self._scanned_at = time.monotonic()
+        self._entries.clear()
+        self._bytes = 0
+        files = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                key, ext = os.path.splitext(entry.name)
+                if ext not in AUDIO_EXTENSIONS.values() or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                files.append((stat.st_mtime, key, entry.path, stat.st_size))
+        for _, key, path, size in sorted(files):
+            self._entries[key] = (path, size)
+            self._bytes += size
+        self._evict()
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            _, (path, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def get_path(self, key: str) -> Optional[str]:
+        """Path of the cached file (marking it recently used) or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                path, size = entry
+                try:
+                    os.utime(path)
+                except FileNotFoundError:
+                    # Removed behind our back (another process or a cleanup job)
+                    del self._entries[key]
+                    self._bytes -= size
+                    entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, audio: bytes, mimetype: str = 'audio/wav') -> Optional[str]:
+        """Atomically store audio under key and return its path"""
+        if len(audio) > self.max_bytes:
+            return None
+        path = os.path.join(self.directory, key + AUDIO_EXTENSIONS.get(mimetype, '.audio'))
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(audio)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (path, len(audio))
+            self._bytes += len(audio)
+            if time.monotonic() - self._scanned_at >= self.rescan_interval:
+                # Also counts (and may evict) files of other workers
+                self._scan()
+            else:
+                self._evict()
+        return path
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+class TTSCache:
+    """
+    Two-tier cache of synthesized audio keyed by tts_cache_key().
+
+    An in-memory LRU with a byte budget sits in front of an optional
+    DiskAudioCache; disk hits are promoted into memory.
+    """
+
+    def __init__(self, memory: TTLCache, disk: Optional[DiskAudioCache] = None):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key: str) -> Optional[bytes]:
+        audio = self.memory.get(key)
+        if audio is None and self.disk is not None:
+            audio = self.disk.get(key)
+            if audio is not None:
+                self.memory.set(key, audio)
+        return audio
+
+    def get_path(self, key: str) -> Optional[str]:
+        """File holding the cached audio, for serving it with sendfile"""
+        if self.disk is None:
+            return None
+        return self.disk.get_path(key)
+
+    def set(self, key: str, audio: bytes, mimetype: str = 'audio/wav'):
+        self.memory.set(key, audio)
+        if self.disk is not None:
+            self.disk.set(key, audio, mimetype)
+
+    def __contains__(self, key: str) -> bool:
+        """Whether key is cached, without touching hit counters or LRU order"""
+        return key in self.memory or (self.disk is not None and key in self.disk)
+
+    def stats(self) -> Dict:
+        return {
+            'memory': self.memory.stats(),
+            'disk': self.disk.stats() if self.disk is not None else {'enabled': False}
+        }
+
+
+def create_tts_cache(config) -> Optional[TTSCache]:
+    """Build the TTS cache from config, or None when disabled"""
+    if not config.TTS_CACHE_ENABLED:
+        return None
+    memory = TTLCache(
+        max_entries=config.TTS_CACHE_MAX_ENTRIES,
+        max_bytes=config.TTS_CACHE_MAX_BYTES,
+        sizeof=len
+    )
+    disk = None
+    if config.TTS_CACHE_DIR:
+        disk = DiskAudioCache(config.TTS_CACHE_DIR, max_bytes=config.TTS_CACHE_DISK_MAX_BYTES,
+                              rescan_interval=config.TTS_CACHE_DISK_RESCAN_SECONDS)
+    return TTSCache(memory, disk)
@@ -0,0 +1,174 @@
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+_STOP = object()
+
+
+class WriteBehindWriter:
+    """
+    Logs translations and voice samples off the request path.
+    Rows go into a bounded queue; a background thread drains it and writes
+    them in batches, one transaction per batch (group commit).
+    
+    When the queue is full, policy 'block' waits up to block_timeout for
+    space and policy 'drop' drops the row immediately; dropped rows are counted.
+    """
+
+    def __init__(self, db, max_queue: int = 10000, batch_size: int = 200,
+                 flush_interval: float = 0.05, policy: str = 'block',
+                 block_timeout: Optional[float] = 1.0):
+        if policy not in ('block', 'drop'):
+            raise ValueError(f"Unsupported write-behind policy: {policy}")
+
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stats_lock = threading.Lock()
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.flushes = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='db-write-behind', daemon=True)
+        self._thread.start()
+
+    # ===== SAME INTERFACE AS DatabaseHelper.save_* =====
+
+    def save_translation(self, input_text: str, output_text: str,
+                         input_lang: str, output_lang: str,
+                         confidence: Optional[float] = None) -> bool:
+        """Queue a translation row; returns False if it was dropped"""
+        return self._enqueue('translation', {
+            'input_text': input_text,
+            'output_text': output_text,
+            'input_lang': input_lang,
+            'output_lang': output_lang,
+            'confidence': confidence,
+            'timestamp': datetime.now().isoformat()
+        })
+
+    def save_voice_sample(self, audio_path: str, language: str,
+                          transcription: str) -> bool:
+        """Queue a voice sample row; returns False if it was dropped"""
+        return self._enqueue('voice_sample', {
+            'audio_path': audio_path,
+            'language': language,
+            'transcription': transcription,
+            'timestamp': datetime.now().isoformat()
+        })
+
+    def _enqueue(self, table: str, row: Dict) -> bool:
+        if self._closed:
+            return False
+        try:
+            if self.policy == 'block':
+                self._queue.put((table, row), timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait((table, row))
+        except queue.Full:
+            with self._stats_lock:
+                self.dropped += 1
+            return False
+
+        with self._stats_lock:
+            self.enqueued += 1
+        return True
+
+    # ===== BACKGROUND FLUSHING =====
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            batch = []
+            stop = item is _STOP
+            if not stop:
+                batch.append(item)
+            while not stop and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+
+            if batch:
+                self._flush(batch)
+            if stop:
+                return
+
+    def _flush(self, batch):
+        translations = [row for table, row in batch if table == 'translation']
+        voice_samples = [row for table, row in batch if table == 'voice_sample']
+
+        start = time.perf_counter()
+        written = failed = 0
+        for rows, save in ((translations, self.db.save_translations),
+                           (voice_samples, self.db.save_voice_samples)):
+            if not rows:
+                continue
+            try:
+                save(rows)
+                written += len(rows)
+            except Exception:
+                failed += len(rows)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        with self._stats_lock:
+            self.written += written
+            self.failed += failed
+            self.flushes += 1
+            self.last_flush_ms = elapsed_ms
+            self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+            self._total_flush_ms += elapsed_ms
+
+    def close(self, timeout: Optional[float] = 10.0) -> bool:
+        """
+        Stop accepting rows and flush everything still queued.
+
+        Gives up after timeout seconds (e.g. when the database hangs);
+        returns False if rows may still be unwritten.
+        """
+        if self._closed:
+            return not self._thread.is_alive()
+        self._closed = True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            # Waits for space while the writer thread keeps draining the queue
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return False
+        self._thread.join(None if deadline is None else max(deadline - time.monotonic(), 0))
+        return not self._thread.is_alive()
+
+    def stats(self) -> Dict:
+        """Get queue depth, throughput and flush latency metrics"""
+        with self._stats_lock:
+            return {
+                'queue_depth': self._queue.qsize(),
+                'queue_capacity': self._queue.maxsize,
+                'policy': self.policy,
+                'enqueued': self.enqueued,
+                'written': self.written,
+                'dropped': self.dropped,
+                'failed': self.failed,
+                'flushes': self.flushes,
+                'last_flush_ms': round(self.last_flush_ms, 3),
+                'max_flush_ms': round(self.max_flush_ms, 3),
+                'avg_flush_ms': round(self._total_flush_ms / self.flushes, 3) if self.flushes else 0.0
+            }
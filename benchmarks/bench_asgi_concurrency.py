@@ -0,0 +1,313 @@
+"""
+Slow-upload load test of the WSGI app (Flask) against the ASGI app
+(Quart under uvicorn) with stub models of fixed latency.
+
+Both servers get the same budget of worker threads (--threads): the WSGI
+server handles each connection on one of them, the ASGI server only uses
+them for model calls. Two scenarios:
+
+    upload  clients upload a recording to /api/voice-to-text at a throttled
+            rate, like phones on a poor connection. Keep --audio-seconds
+            large enough that the body does not fit in the kernel's socket
+            buffer (~10s of 16kHz audio), otherwise a queued connection
+            finishes its upload before any thread picks it up.
+    stream  clients stream audio in real time to /api/voice-to-text/stream,
+            which holds a WSGI thread for the whole recording.
+
+Besides total request time, each run reports first_ms: for uploads the
+time from the last byte sent to the first response byte, for streams the
+time from the start of the stream to the first transcript event, i.e. how
+long a live user waits for feedback. The kernel buffers a good part of a
+queued connection's body, so total time alone understates the difference.
+
+Each server runs in its own subprocess; peak resident memory is sampled
+from /proc while the load runs.
+
+Usage:
+    python benchmarks/bench_asgi_concurrency.py [--scenario upload|stream]
+        [--clients 64] [--threads 8] [--audio-seconds 10] [--upload-seconds 5]
+        [--model-ms 50] [--duration 20]
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+
+CHILD = r'''
+import os, sys, time
+sys.path.insert(0, sys.argv[1])
+os.chdir(sys.argv[1])
+mode, port, threads, model_ms = sys.argv[2], int(sys.argv[3]), int(sys.argv[4]), float(sys.argv[5])
+
+from config import Config
+Config.ASYNC_MODEL_WORKERS = threads
+Config.ASR_CACHE_ENABLED = False
+Config.TRANSLATION_CACHE_ENABLED = False
+Config.TTS_CACHE_ENABLED = False
+Config.DEBUG = False
+Config.ADMISSION_ENABLED = False  # measure the servers, not the limits
+
+from utils.ml_integration import get_model_registry
+
+class StubASR:
+    version = "stub"
+    def transcribe(self, audio, language):
+        time.sleep(model_ms / 1000)
+        return {"text": "stub", "confidence": 1.0}
+
+get_model_registry().register("asr", StubASR)
+
+if mode == "wsgi":
+    import logging
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    from concurrent.futures import ThreadPoolExecutor
+    from werkzeug.serving import BaseWSGIServer
+    from app import create_app
+
+    class PooledWSGIServer(BaseWSGIServer):
+        """Werkzeug server with a fixed pool of connection threads"""
+        pool = ThreadPoolExecutor(max_workers=threads)
+
+        def process_request(self, request, client_address):
+            self.pool.submit(self._handle, request, client_address)
+
+        def _handle(self, request, client_address):
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    PooledWSGIServer("127.0.0.1", port, create_app()).serve_forever()
+else:
+    import uvicorn
+    from asgi import app
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning", backlog=1024)
+'''
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def synthetic_wav(seconds=10.0, sample_rate=16000):
+    """Tone bursts of 2s separated by 1s of silence"""
+    sys.path.insert(0, BACKEND)
+    import numpy as np
+    from utils.audio import encode_wav
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    tone = 0.3 * np.sin(2 * np.pi * 220 * t) * (t % 3 < 2)
+    return encode_wav((tone * 32767).astype(np.int16), sample_rate)
+
+
+def multipart_body(wav_bytes):
+    boundary = 'benchboundary'
+    body = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="input_language"\r\n\r\n'
+        f'garhwali\r\n'
+        f'--{boundary}\r\nContent-Disposition: form-data; name="audio_file"; filename="a.wav"\r\n'
+        f'Content-Type: audio/wav\r\n\r\n'
+    ).encode('latin-1') + wav_bytes + f'\r\n--{boundary}--\r\n'.encode('latin-1')
+    return body, f'multipart/form-data; boundary={boundary}'
+
+
+def read_response(sock, marker=b''):
+    """(status, time marker first appeared in the response; by default the first byte)"""
+    response = b''
+    first_seen = None
+    while True:
+        data = sock.recv(65536)
+        if not data:
+            break
+        response += data
+        if first_seen is None and data and marker in response:
+            first_seen = time.perf_counter()
+    return int(response.split(b' ', 2)[1]), first_seen or time.perf_counter()
+
+
+def slow_upload(port, body, content_type, upload_seconds, chunks=20):
+    """POST the body in evenly paced chunks; returns (status, seconds to first byte after upload)"""
+    sock = socket.create_connection(('127.0.0.1', port), timeout=300)
+    try:
+        sock.sendall(
+            f'POST /api/voice-to-text HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\n'
+            f'Content-Type: {content_type}\r\nContent-Length: {len(body)}\r\n'
+            'Connection: close\r\n\r\n'.encode('latin-1')
+        )
+        step = -(-len(body) // chunks)
+        for offset in range(0, len(body), step):
+            sock.sendall(body[offset:offset + step])
+            time.sleep(upload_seconds / chunks)
+        sent = time.perf_counter()
+        status, first_byte = read_response(sock)
+        return status, first_byte - sent
+    finally:
+        sock.close()
+
+
+def live_stream(port, wav_bytes, chunk_ms=100):
+    """Chunked POST to the streaming endpoint at real-time speed; returns (status, seconds to first event)"""
+    byte_rate = int.from_bytes(wav_bytes[28:32], 'little')
+    chunk_size = int(byte_rate * chunk_ms / 1000)
+    sock = socket.create_connection(('127.0.0.1', port), timeout=300)
+    result = {}
+
+    def read():
+        result['response'] = read_response(sock, marker=b'"type"')
+
+    # Read concurrently: events arrive while audio is still being sent
+    reader = threading.Thread(target=read, daemon=True)
+    try:
+        start = time.perf_counter()
+        reader.start()
+        sock.sendall(
+            f'POST /api/voice-to-text/stream HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\n'
+            'Content-Type: audio/wav\r\nTransfer-Encoding: chunked\r\n'
+            'Connection: close\r\n\r\n'.encode('latin-1')
+        )
+        sock.sendall(b'%x\r\n%s\r\n' % (44, wav_bytes[:44]))
+        for offset in range(44, len(wav_bytes), chunk_size):
+            chunk = wav_bytes[offset:offset + chunk_size]
+            sock.sendall(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+            time.sleep(chunk_ms / 1000)
+        sock.sendall(b'0\r\n\r\n')
+        reader.join()
+        status, first_byte = result['response']
+        return status, first_byte - start
+    finally:
+        sock.close()
+
+
+def rss_mb(pid):
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except FileNotFoundError:
+        pass
+    return 0.0
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q / 100 * len(values)))] if values else 0.0
+
+
+def run(mode, args, request):
+    port = free_port()
+    server = subprocess.Popen([sys.executable, '-c', CHILD, BACKEND, mode, str(port),
+                               str(args.threads), str(args.model_ms)])
+    try:
+        for _ in range(200):
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{port}/api/health', timeout=1)
+                break
+            except OSError:
+                time.sleep(0.05)
+
+        latencies, first, errors = [], [], []
+        peak_rss = [rss_mb(server.pid)]
+        deadline = time.perf_counter() + args.duration
+        lock = threading.Lock()
+
+        def client():
+            # Spread clients out so they don't upload in lockstep
+            time.sleep(random.uniform(0, args.upload_seconds))
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    status, first_seconds = request(port)
+                except OSError as e:
+                    status = str(e)
+                with lock:
+                    if status == 200:
+                        latencies.append(time.perf_counter() - start)
+                        first.append(first_seconds)
+                    else:
+                        errors.append(status)
+
+        def sample_rss():
+            while time.perf_counter() < deadline:
+                peak_rss.append(rss_mb(server.pid))
+                time.sleep(0.2)
+
+        threads = [threading.Thread(target=client) for _ in range(args.clients)]
+        threads.append(threading.Thread(target=sample_rss))
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        return {
+            'mode': mode,
+            'requests': len(latencies),
+            'errors': len(errors),
+            'rps': len(latencies) / elapsed,
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000,
+            'first_p50_ms': percentile(first, 50) * 1000,
+            'first_p99_ms': percentile(first, 99) * 1000,
+            'peak_rss_mb': max(peak_rss)
+        }
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--scenario', choices=('upload', 'stream'), default='upload')
+    parser.add_argument('--clients', type=int, default=64)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--audio-seconds', type=float, default=10.0)
+    parser.add_argument('--upload-seconds', type=float, default=5.0,
+                        help='time to send one upload (stream: always real time)')
+    parser.add_argument('--model-ms', type=float, default=50)
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    wav_bytes = synthetic_wav(args.audio_seconds)
+    if args.scenario == 'stream':
+        args.upload_seconds = args.audio_seconds
+
+        def request(port):
+            return live_stream(port, wav_bytes)
+    else:
+        body, content_type = multipart_body(wav_bytes)
+
+        def request(port):
+            return slow_upload(port, body, content_type, args.upload_seconds)
+
+    results = [run(mode, args, request) for mode in ('wsgi', 'asgi')]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"scenario: {args.scenario}  clients: {args.clients}  threads: {args.threads}  "
+          f"audio: {args.audio_seconds}s  upload: {args.upload_seconds}s  model: {args.model_ms}ms")
+    print(f"{'mode':>5} {'requests':>9} {'errors':>7} {'rps':>7} {'p50_ms':>8} {'p99_ms':>8} "
+          f"{'first_p50_ms':>13} {'first_p99_ms':>13} {'rss_mb':>7}")
+    for r in results:
+        print(f"{r['mode']:>5} {r['requests']:>9} {r['errors']:>7} {r['rps']:>7.1f} "
+              f"{r['p50_ms']:>8.0f} {r['p99_ms']:>8.0f} {r['first_p50_ms']:>13.0f} "
+              f"{r['first_p99_ms']:>13.0f} {r['peak_rss_mb']:>7.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+DatabaseHelper lookups at 1M rows: indexed storage versus the original
+list scans (get by id, recent translations, stats).
+
+Usage:
+    python benchmarks/bench_db_helper.py [rows]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from utils.db_helper import DatabaseHelper
+
+LANGUAGES = ['garhwali', 'kumaoni']
+
+
+class ListScanHelper(DatabaseHelper):
+    """The original list-backed lookups, for comparison"""
+
+    def __init__(self, rows):
+        super().__init__()
+        self.rows = rows
+
+    def get_translation_by_id(self, translation_id):
+        for translation in self.rows:
+            if translation['id'] == translation_id:
+                return translation
+        return None
+
+    def get_recent_translations(self, limit=10):
+        return sorted(self.rows, key=lambda x: x['timestamp'], reverse=True)[:limit]
+
+    def get_stats(self):
+        return {
+            'total_translations': len(self.rows),
+            'languages': {
+                language: len([t for t in self.rows if t['input_language'] == language])
+                for language in LANGUAGES
+            }
+        }
+
+
+def per_call_ms(fn, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1000
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(11)
+
+    db = DatabaseHelper()
+    start = time.perf_counter()
+    for i in range(rows):
+        db.save_translation(f'text {i}', f'out {i}', LANGUAGES[i % 2], 'hindi', 0.9)
+    insert_us = (time.perf_counter() - start) / rows * 1e6
+    legacy = ListScanHelper(list(db.translations.values()))
+
+    ids = [rng.randint(1, rows) for _ in range(1000)]
+    print(f"{rows} rows, insert {insert_us:.2f} us/row")
+    print(f"{'operation':>22} {'list_scan_ms':>13} {'indexed_ms':>11}")
+    for name, calls, old, new in [
+        ('get_translation_by_id', 5,
+         lambda: legacy.get_translation_by_id(ids[0]), lambda: db.get_translation_by_id(ids[0])),
+        ('get_recent(10)', 3, lambda: legacy.get_recent_translations(10), lambda: db.get_recent_translations(10)),
+        ('get_stats', 3, legacy.get_stats, db.get_stats),
+    ]:
+        print(f"{name:>22} {per_call_ms(old, calls):>13.3f} {per_call_ms(new, 1000):>11.5f}")
+
+
+if __name__ == '__main__':
+    main()
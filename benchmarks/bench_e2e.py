@@ -0,0 +1,431 @@
+"""
+End-to-end benchmark of the API endpoints with deterministic stub models.
+
+Drives /api/translate, /api/translate/batch, /api/voice-to-text,
+/api/text-to-speech and /api/voice-translate with a synthetic
+Garhwali/Kumaoni corpus and generated speech-like audio, either through
+create_app()'s test client (in-process, no network) or through a real
+local server started in a subprocess (werkzeug threaded WSGI server or
+uvicorn with the ASGI app).
+
+The ASR, translation and TTS models are replaced by stubs that sleep for
+a configurable latency and return deterministic outputs, so runs measure
+the API layer (parsing, caches, batching, pipeline, encoding, database
+writes) on top of a known model cost. Corpus and audio come from a seeded
+generator, so two runs with the same arguments send the same requests.
+
+Each endpoint gets --warmup untimed requests, then --requests timed ones
+from --concurrency closed-loop clients. Results are printed as JSON with
+throughput and p50/p95/p99 latency per endpoint and mode (a summary table
+goes to stderr); keep the files to compare runs over time.
+
+Usage:
+    python benchmarks/bench_e2e.py [--mode client|server|both] [--server wsgi|asgi]
+        [--endpoints translate,translate_batch,voice_to_text,text_to_speech,voice_translate]
+        [--requests 200] [--concurrency 8] [--warmup 10] [--seed 0]
+        [--asr-ms 30] [--translation-ms 5] [--translation-item-ms 0.2] [--tts-ms 20]
+        [--audio-seconds 3] [--batch-size 16] [--caches] [--output results.json]
+"""
+
+import argparse
+import http.client
+import io
+import itertools
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from datetime import datetime, timezone
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+BACKEND = os.path.join(ROOT, 'backend')
+sys.path.insert(0, BACKEND)
+
+ENDPOINTS = ('translate', 'translate_batch', 'voice_to_text', 'text_to_speech', 'voice_translate')
+
+GARHWALI_WORDS = ['म्यर', 'पेट', 'दुखाण', 'छ', 'केदारनाथ', 'सै', 'नजदीक', 'लोकल', 'मंदिर', 'कठां',
+                  'यख', 'असली', 'गढ़वाली', 'खान', 'मिल्ली', 'पाणी', 'डॉक्टर', 'ब्वारि', 'घौर', 'जाण']
+KUMAONI_WORDS = ['केदारनाथ', 'कै', 'पास', 'लोकल', 'मंदिर', 'कत', 'छ', 'यख', 'असली', 'कुमाऊँनी',
+                 'खान', 'कां', 'मिलछे', 'पाणि', 'डाक्टर', 'इज', 'घर', 'जांण', 'भल', 'आज']
+LANGUAGES = {'garhwali': GARHWALI_WORDS, 'kumaoni': KUMAONI_WORDS}
+OUTPUT_LANGUAGES = ('hindi', 'english')
+
+
+# ===== SYNTHETIC INPUTS =====
+
+def make_corpus(count, rng):
+    """(sentence, input language) pairs of 3-12 words"""
+    corpus = []
+    for _ in range(count):
+        language = rng.choice(sorted(LANGUAGES))
+        words = [rng.choice(LANGUAGES[language]) for _ in range(rng.randint(3, 12))]
+        corpus.append((' '.join(words) + rng.choice(['', '?', ' छ']), language))
+    return corpus
+
+
+def make_audio(seconds, rng, sample_rate=16000):
+    """16-bit mono WAV of voiced bursts (varying pitch) between pauses, over low noise"""
+    import numpy as np
+    from utils.audio import encode_wav
+    samples = []
+    total = int(seconds * sample_rate)
+    while len(samples) < total:
+        burst = int(rng.uniform(0.6, 1.8) * sample_rate)
+        pause = int(rng.uniform(0.3, 0.8) * sample_rate)
+        t = np.arange(burst) / sample_rate
+        pitch = rng.uniform(110, 260)
+        voiced = 0.3 * np.sin(2 * np.pi * pitch * t) * np.hanning(burst)
+        samples.extend(voiced.tolist() + [0.0] * pause)
+    noise = np.random.default_rng(rng.randint(0, 2 ** 32 - 1)).normal(0, 0.003, total)
+    pcm = np.clip(np.array(samples[:total]) + noise, -1, 1)
+    return encode_wav((pcm * 32767).astype(np.int16), sample_rate)
+
+
+class Request:
+    def __init__(self, path, json_body=None, form=None, audio=None, headers=None):
+        self.path = path
+        self.json_body = json_body
+        self.form = form or {}
+        self.audio = audio
+        self.headers = headers or {}
+
+
+def make_requests(endpoint, count, args, rng):
+    """Deterministic list of requests for one endpoint"""
+    corpus = make_corpus(max(count, 64), rng)
+    clips = [make_audio(args.audio_seconds, rng) for _ in range(8)]
+    requests = []
+    for i in range(count):
+        text, language = corpus[i % len(corpus)]
+        output_language = OUTPUT_LANGUAGES[i % len(OUTPUT_LANGUAGES)]
+        if endpoint == 'translate':
+            requests.append(Request('/api/translate', json_body={
+                'text': text, 'input_language': language, 'output_language': output_language}))
+        elif endpoint == 'translate_batch':
+            batch = [corpus[(i * args.batch_size + j) % len(corpus)][0] for j in range(args.batch_size)]
+            requests.append(Request('/api/translate/batch', json_body={
+                'texts': batch, 'input_language': language, 'output_language': output_language}))
+        elif endpoint == 'voice_to_text':
+            requests.append(Request('/api/voice-to-text', form={'input_language': language},
+                                    audio=clips[i % len(clips)]))
+        elif endpoint == 'text_to_speech':
+            requests.append(Request('/api/text-to-speech', json_body={'text': text, 'language': output_language}))
+        elif endpoint == 'voice_translate':
+            requests.append(Request('/api/voice-translate', audio=clips[i % len(clips)], form={
+                'input_language': language, 'output_language': output_language}))
+    return requests
+
+
+# ===== STUB MODELS =====
+
+class StubASR:
+    version = 'stub'
+
+    def __init__(self, latency_ms):
+        self.latency = latency_ms / 1000
+
+    def transcribe(self, audio, language):
+        time.sleep(self.latency)
+        words = LANGUAGES.get(language, GARHWALI_WORDS)
+        return {'text': ' '.join(words[:6]), 'confidence': 0.9}
+
+
+class StubTranslation:
+    version = 'stub'
+
+    def __init__(self, call_ms, item_ms):
+        self.call_ms = call_ms
+        self.item_ms = item_ms
+
+    def translate_batch(self, texts, input_lang, output_lang):
+        time.sleep((self.call_ms + self.item_ms * len(texts)) / 1000)
+        return [{'translated_text': ' '.join(reversed(text.split())), 'confidence': 0.8} for text in texts]
+
+
+class StubTTS:
+    version = 'stub'
+    formats = ('audio/wav',)
+
+    def __init__(self, latency_ms):
+        self.latency = latency_ms / 1000
+
+    def synthesize(self, text, language):
+        import numpy as np
+        from utils.audio import encode_wav
+        time.sleep(self.latency)
+        # 60ms of audio per character, like real speech output
+        return encode_wav(np.zeros(int(0.06 * 16000 * max(len(text), 1)), dtype=np.int16), 16000)
+
+    def synthesize_stream(self, text, language, mimetype='audio/wav'):
+        audio = self.synthesize(text, language)
+        for offset in range(0, len(audio), 32768):
+            yield audio[offset:offset + 32768]
+
+
+def configure(args):
+    """Apply benchmark config and register the stub models (before the app is created)"""
+    from config import Config
+    Config.DEBUG = False
+    Config.PRELOAD_MODELS = True
+    Config.PRELOAD_MODELS_IN_BACKGROUND = False
+    Config.TTS_CACHE_PREWARM = False
+    if not args.caches:
+        Config.TRANSLATION_CACHE_ENABLED = False
+        Config.ASR_CACHE_ENABLED = False
+        Config.TTS_CACHE_ENABLED = False
+
+    from utils.ml_integration import get_model_registry
+    registry = get_model_registry()
+    registry.register('asr', lambda: StubASR(args.asr_ms))
+    registry.register('translation', lambda: StubTranslation(args.translation_ms, args.translation_item_ms))
+    registry.register('tts', lambda: StubTTS(args.tts_ms))
+
+
+# ===== CLIENTS =====
+
+class TestClientTransport:
+    """Requests through create_app()'s test client, one client per thread"""
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def send(self, req):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        if req.audio is not None:
+            data = dict(req.form, audio_file=(io.BytesIO(req.audio), 'sample.wav'))
+            response = client.post(req.path, data=data, headers=req.headers)
+        else:
+            response = client.post(req.path, json=req.json_body, headers=req.headers)
+        response.get_data()
+        response.close()
+        return response.status_code
+
+
+class HTTPTransport:
+    """Requests over HTTP to a local server, one keep-alive connection per thread"""
+
+    def __init__(self, port):
+        self.port = port
+        self._local = threading.local()
+
+    def send(self, req):
+        if req.audio is not None:
+            body, content_type = _multipart_body(req.form, req.audio)
+        else:
+            body, content_type = json.dumps(req.json_body).encode('utf-8'), 'application/json'
+        headers = dict(req.headers, **{'Content-Type': content_type})
+        for attempt in range(2):
+            conn = getattr(self._local, 'conn', None)
+            if conn is None:
+                conn = self._local.conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=300)
+            try:
+                conn.request('POST', req.path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                if response.getheader('Connection', '').lower() == 'close':
+                    conn.close()
+                    self._local.conn = None
+                return response.status
+            except (http.client.HTTPException, OSError):
+                # Server closed the kept-alive connection; retry once on a new one
+                conn.close()
+                self._local.conn = None
+                if attempt:
+                    raise
+
+
+def _multipart_body(form, audio):
+    boundary = 'benche2eboundary'
+    parts = [
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode('utf-8')
+        for name, value in form.items()
+    ]
+    parts.append(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="audio_file"; filename="sample.wav"\r\n'
+        f'Content-Type: audio/wav\r\n\r\n'.encode('utf-8') + audio + b'\r\n'
+    )
+    parts.append(f'--{boundary}--\r\n'.encode('utf-8'))
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+# ===== LOAD =====
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q / 100 * len(values)))] if values else 0.0
+
+
+def drive(transport, requests, concurrency):
+    """Send requests from concurrency closed-loop clients; returns latencies and status counts"""
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+    counter = itertools.count()
+
+    def client():
+        while True:
+            i = next(counter)
+            if i >= len(requests):
+                return
+            start = time.perf_counter()
+            try:
+                status = transport.send(requests[i])
+            except Exception as e:
+                status = type(e).__name__
+            elapsed = time.perf_counter() - start
+            with lock:
+                statuses[status] = statuses.get(status, 0) + 1
+                if status == 200:
+                    latencies.append(elapsed)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, statuses, time.perf_counter() - start
+
+
+def run_endpoint(transport, mode, endpoint, args):
+    rng = random.Random(f'{args.seed}:{endpoint}')
+    requests = make_requests(endpoint, args.warmup + args.requests, args, rng)
+    drive(transport, requests[:args.warmup], args.concurrency)
+    latencies, statuses, wall = drive(transport, requests[args.warmup:], args.concurrency)
+    return {
+        'mode': mode,
+        'endpoint': endpoint,
+        'requests': args.requests,
+        'ok': len(latencies),
+        'errors': args.requests - len(latencies),
+        'statuses': {str(status): count for status, count in sorted(statuses.items(), key=str)},
+        'rps': round(len(latencies) / wall, 2),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'max_ms': round(max(latencies, default=0.0) * 1000, 2)
+    }
+
+
+def run_client_mode(args):
+    configure(args)
+    from app import create_app
+    transport = TestClientTransport(create_app())
+    return [run_endpoint(transport, 'client', endpoint, args) for endpoint in args.endpoints]
+
+
+def run_server_mode(args):
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    server = subprocess.Popen([sys.executable, os.path.abspath(__file__)] + sys.argv[1:] + ['--serve', str(port)])
+    try:
+        for _ in range(400):
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{port}/api/health', timeout=1)
+                break
+            except OSError:
+                if server.poll() is not None:
+                    raise RuntimeError('benchmark server exited during startup')
+                time.sleep(0.05)
+        transport = HTTPTransport(port)
+        mode = f'server-{args.server}'
+        return [run_endpoint(transport, mode, endpoint, args) for endpoint in args.endpoints]
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def serve(args):
+    """Child process of server mode: the app on a real local server"""
+    os.chdir(BACKEND)
+    configure(args)
+    if args.server == 'asgi':
+        import uvicorn
+        from asgi import app
+        uvicorn.run(app, host='127.0.0.1', port=args.serve, log_level='warning', backlog=1024)
+    else:
+        import logging
+        from werkzeug.serving import make_server
+        from app import create_app
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+        make_server('127.0.0.1', args.serve, create_app(), threaded=True).serve_forever()
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--mode', choices=('client', 'server', 'both'), default='both')
+    parser.add_argument('--server', choices=('wsgi', 'asgi'), default='wsgi')
+    parser.add_argument('--endpoints', default=','.join(ENDPOINTS))
+    parser.add_argument('--requests', type=int, default=200, help='timed requests per endpoint')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--asr-ms', type=float, default=30)
+    parser.add_argument('--translation-ms', type=float, default=5, help='per model call')
+    parser.add_argument('--translation-item-ms', type=float, default=0.2, help='per text in a call')
+    parser.add_argument('--tts-ms', type=float, default=20)
+    parser.add_argument('--audio-seconds', type=float, default=3.0)
+    parser.add_argument('--batch-size', type=int, default=16, help='texts per /api/translate/batch request')
+    parser.add_argument('--caches', action='store_true', help='keep the translation/ASR/TTS caches on')
+    parser.add_argument('--output', help='also write the JSON results to this file')
+    parser.add_argument('--serve', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    args.endpoints = [endpoint for endpoint in args.endpoints.split(',') if endpoint]
+    unknown = set(args.endpoints) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+
+    if args.serve:
+        serve(args)
+        return
+
+    results = []
+    if args.mode in ('server', 'both'):
+        results += run_server_mode(args)
+    if args.mode in ('client', 'both'):
+        results += run_client_mode(args)
+
+    report = {
+        'benchmark': 'e2e',
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'args': {name: value for name, value in vars(args).items() if name not in ('serve', 'output')},
+        'results': results
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+
+    print(f"{'mode':>12} {'endpoint':>16} {'ok':>5} {'err':>4} {'req/s':>8} {'p50_ms':>8} "
+          f"{'p95_ms':>8} {'p99_ms':>8}", file=sys.stderr)
+    for r in results:
+        print(f"{r['mode']:>12} {r['endpoint']:>16} {r['ok']:>5} {r['errors']:>4} {r['rps']:>8.1f} "
+              f"{r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Per-call latency of approximate phrase lookup as the phrasebook grows.
+
+Compares a brute-force scan (bounded grapheme edit distance against every
+key, tightening the bound as closer keys are found) with the trigram
+FuzzyIndex on synthetic Garhwali-like phrasebooks. Queries are keys with
+ASR-style damage: a dropped matra or anusvara, a lost space, or one
+syllable swapped. A quarter of the queries match nothing, which is the
+worst case for both. Both methods must return the same distance for
+every query.
+
+Usage:
+    python benchmarks/bench_fuzzy_index.py
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ml'))
+
+from translation.fuzzy_index import FuzzyIndex, edit_distance, graphemes
+
+SIZES = [1000, 10000, 100000]
+QUERIES = 400
+MAX_RATIO = 0.25
+CONSONANTS = ['क', 'ख', 'ग', 'घ', 'च', 'छ', 'ज', 'ट', 'ठ', 'ड', 'ण', 'त', 'थ', 'द', 'ध',
+              'न', 'प', 'फ', 'ब', 'भ', 'म', 'य', 'र', 'ल', 'व', 'स', 'ह', 'म्य', 'क्ष']
+MARKS = ['', '', 'ा', 'ि', 'ी', 'ु', 'ू', 'े', 'ै', 'ो', 'ं']
+
+
+def make_word(rng):
+    return ''.join(rng.choice(CONSONANTS) + rng.choice(MARKS) for _ in range(rng.randint(2, 4)))
+
+
+def make_phrasebook(size, rng):
+    phrases = set()
+    while len(phrases) < size:
+        phrases.add(' '.join(make_word(rng) for _ in range(rng.randint(3, 6))))
+    return list(phrases)
+
+
+def damage(phrase, rng):
+    """One or two ASR-style errors"""
+    for _ in range(rng.randint(1, 2)):
+        kind = rng.choice(('matra', 'space', 'syllable'))
+        clusters = graphemes(phrase)
+        if kind == 'matra':
+            marked = [i for i, c in enumerate(clusters) if len(c) > 1 and c[-1] in ''.join(MARKS)]
+            if marked:
+                i = rng.choice(marked)
+                clusters[i] = clusters[i][:-1]
+        elif kind == 'space' and ' ' in phrase:
+            clusters.remove(' ')
+        else:
+            i = rng.randrange(len(clusters))
+            clusters[i] = rng.choice(CONSONANTS) + rng.choice(MARKS)
+        phrase = ''.join(clusters)
+    return phrase
+
+
+def brute_force(keys, text):
+    """Closest key by scanning all of them; keys are pre-split grapheme lists"""
+    query = graphemes(text)
+    limit = int(len(query) * MAX_RATIO)
+    best = None
+    for key in keys:
+        distance = edit_distance(query, key, limit)
+        if distance <= limit:
+            best = distance
+            if distance == 0:
+                break
+            limit = distance - 1
+    return best
+
+
+def latencies(fn, queries):
+    samples = []
+    results = []
+    for q in queries:
+        start = time.perf_counter()
+        results.append(fn(q))
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return statistics.mean(samples), samples[int(len(samples) * 0.99) - 1], results
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'phrases':>8} {'build_ms':>10} {'brute_us':>10} {'index_us':>10} {'index_p99_us':>13} {'found':>6}")
+    for size in SIZES:
+        phrases = make_phrasebook(size, rng)
+        queries = [damage(rng.choice(phrases), rng) for _ in range(QUERIES * 3 // 4)]
+        queries += [' '.join(make_word(rng) for _ in range(4)) for _ in range(QUERIES // 4)]
+
+        start = time.perf_counter()
+        index = FuzzyIndex(phrases, max_ratio=MAX_RATIO)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        keys = [graphemes(phrase) for phrase in phrases]
+        # The scan is slow; time it on a sample at the largest sizes
+        brute_queries = queries[::max(1, size // 10000)]
+        brute_us, _, expected = latencies(lambda q: brute_force(keys, q), brute_queries)
+        index_us, index_p99, matches = latencies(index.search, queries)
+
+        distances = [match.distance if match else None for match in matches]
+        mismatches = [q for q, d, e in zip(brute_queries, distances[::max(1, size // 10000)], expected) if d != e]
+        if mismatches:
+            raise SystemExit(f'FuzzyIndex disagrees with the scan on {len(mismatches)} queries, e.g. {mismatches[0]!r}')
+        found = sum(d is not None for d in distances) / len(queries)
+        print(f"{size:>8} {build_ms:>10.1f} {brute_us:>10.1f} {index_us:>10.1f} {index_p99:>13.1f} {found:>6.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+Translation throughput and latency with models in-process versus in the
+inference worker pool (utils/inference_pool.py).
+
+The stub model is CPU-bound Python that holds the GIL: a fixed cost per
+model call plus a cost per text, like a seq2seq model's per-batch
+overhead. In-process, concurrent request threads serialize on the GIL and
+each pay the per-call cost; the pool batches their calls dynamically and
+runs them in separate processes.
+
+Usage:
+    python benchmarks/bench_inference_pool.py [--threads 32] [--requests 2000]
+        [--workers 2] [--call-ms 5] [--item-ms 0.5]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+sys.path.insert(0, BACKEND)
+
+from config import Config
+from utils.ml_integration import MLIntegration
+from utils.model_registry import ModelRegistry
+
+CALL_MS = float(os.environ.get('BENCH_CALL_MS', 5))
+ITEM_MS = float(os.environ.get('BENCH_ITEM_MS', 0.5))
+
+
+def busy(ms):
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        pass
+
+
+class StubTranslationModel:
+    version = 'stub'
+
+    def translate_batch(self, texts, input_lang, output_lang):
+        busy(CALL_MS + ITEM_MS * len(texts))
+        return [{'translated_text': text[::-1], 'confidence': 1.0} for text in texts]
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q / 100 * len(values)))]
+
+
+def drive(ml, threads, requests):
+    latencies = []
+    lock = threading.Lock()
+    counter = iter(range(requests))
+
+    def client():
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            start = time.perf_counter()
+            ml.translate_text(f'phrase number {i}', 'garhwali', 'hindi')
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+
+    workers = [threading.Thread(target=client) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    wall = time.perf_counter() - start
+    return requests / wall, percentile(latencies, 50) * 1000, percentile(latencies, 99) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=5)
+    parser.add_argument('--call-ms', type=float, default=CALL_MS)
+    parser.add_argument('--item-ms', type=float, default=ITEM_MS)
+    args = parser.parse_args()
+    # Worker processes re-import this module and read the costs from the environment
+    os.environ['BENCH_CALL_MS'] = str(args.call_ms)
+    os.environ['BENCH_ITEM_MS'] = str(args.item_ms)
+    globals().update(CALL_MS=args.call_ms, ITEM_MS=args.item_ms)
+
+    from utils.inference_pool import InferenceServer, create_remote_loaders
+
+    class BenchConfig(Config):
+        TRANSLATION_CACHE_ENABLED = False
+        TRANSLATION_BATCHER_ENABLED = False  # compare the pool's batching only
+        ASR_CACHE_ENABLED = False
+        TTS_CACHE_ENABLED = False
+        INFERENCE_SOCKET = os.path.join(tempfile.mkdtemp(), 'inference.sock')
+        INFERENCE_POOL_AUTOSTART = False
+        INFERENCE_POOL = dict(Config.INFERENCE_POOL, translation={
+            'workers': args.workers,
+            'max_batch_size': args.max_batch_size,
+            'max_wait_ms': args.max_wait_ms
+        })
+
+    print(f"threads: {args.threads}  requests: {args.requests}  model: {args.call_ms}ms/call "
+          f"+ {args.item_ms}ms/text  pool: {args.workers} workers, batch <= {args.max_batch_size}, "
+          f"wait <= {args.max_wait_ms}ms")
+    print(f"{'backend':>10} {'req/s':>8} {'p50_ms':>8} {'p99_ms':>8}")
+
+    inprocess = MLIntegration(BenchConfig, registry=ModelRegistry({'translation': StubTranslationModel}))
+    rps, p50, p99 = drive(inprocess, args.threads, args.requests)
+    print(f"{'inprocess':>10} {rps:>8.0f} {p50:>8.1f} {p99:>8.1f}")
+
+    server = InferenceServer(BenchConfig, loaders={'translation': StubTranslationModel})
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    while not os.path.exists(BenchConfig.INFERENCE_SOCKET):
+        time.sleep(0.01)
+    registry = ModelRegistry(create_remote_loaders(BenchConfig))
+    registry.get('translation')  # waits for a worker to load the model
+    pooled = MLIntegration(BenchConfig, registry=registry)
+    rps, p50, p99 = drive(pooled, args.threads, args.requests)
+    print(f"{'pool':>10} {rps:>8.0f} {p50:>8.1f} {p99:>8.1f}")
+
+    stats = server.pools['translation'].stats()
+    print(f"pool batches: {stats['batches']}  avg batch size: {stats['avg_batch_size']}  "
+          f"max: {stats['max_batch_size_seen']}")
+    server.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""
+Throughput and p50/p99 latency of single /api/translate-style calls
+(MLIntegration.translate_text) with and without the micro-batcher
+(utils/micro_batcher.py) under synthetic concurrent load.
+
+The stub model stands in for one accelerator: calls are serialized on a
+lock and cost a fixed overhead per call plus a little per text, sleeping
+rather than spinning so the GIL is free in between. Without the batcher
+every request pays the per-call overhead in turn; with it, requests that
+arrive while a batch runs share the next call.
+
+Each client thread sends one request at a time for --duration seconds.
+Texts are unique so the translation cache never answers.
+
+Usage:
+    python benchmarks/bench_micro_batcher.py [--threads 1,8,32,64]
+        [--duration 5] [--call-ms 10] [--item-ms 0.2] [--max-wait-ms 0,2,5]
+        [--max-batch-size 16] [--workers 1] [--json]
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+sys.path.insert(0, BACKEND)
+
+from config import Config
+from utils.ml_integration import MLIntegration
+from utils.model_registry import ModelRegistry
+
+
+class StubTranslationModel:
+    version = 'stub'
+    call_ms = 10.0
+    item_ms = 0.2
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def translate_batch(self, texts, input_lang, output_lang):
+        with self.lock:
+            self.calls += 1
+            time.sleep((self.call_ms + self.item_ms * len(texts)) / 1000)
+        return [{'translated_text': text[::-1], 'confidence': 1.0} for text in texts]
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q / 100 * len(values)))] if values else 0.0
+
+
+def drive(ml, threads, duration):
+    latencies = []
+    lock = threading.Lock()
+    counter = itertools.count()
+    deadline = time.perf_counter() + duration
+
+    def client():
+        local = []
+        while time.perf_counter() < deadline:
+            i = next(counter)
+            # Alternate language pairs so the batcher has several groups
+            pair = ('garhwali', 'hindi') if i % 4 else ('kumaoni', 'english')
+            start = time.perf_counter()
+            ml.translate_text(f'synthetic phrase {i}', *pair)
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=client) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    wall = time.perf_counter() - start
+    return {
+        'requests': len(latencies),
+        'rps': len(latencies) / wall,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000
+    }
+
+
+def run(threads, duration, max_wait_ms, max_batch_size, workers):
+    class BenchConfig(Config):
+        TRANSLATION_CACHE_ENABLED = False
+        TRANSLATION_BATCHER_ENABLED = max_wait_ms is not None
+        TRANSLATION_BATCHER_MAX_WAIT_MS = max_wait_ms or 0
+        TRANSLATION_BATCHER_MAX_BATCH_SIZE = max_batch_size
+        TRANSLATION_BATCHER_WORKERS = workers
+        TRANSLATION_MICRO_BATCH_SIZE = max_batch_size
+        ASR_CACHE_ENABLED = False
+        TTS_CACHE_ENABLED = False
+
+    model = StubTranslationModel()
+    ml = MLIntegration(BenchConfig, registry=ModelRegistry({'translation': lambda: model}))
+    result = drive(ml, threads, duration)
+    result.update(
+        threads=threads,
+        batcher='off' if max_wait_ms is None else f'{max_wait_ms:g}ms',
+        model_calls=model.calls,
+        avg_batch=result['requests'] / model.calls if model.calls else 0.0
+    )
+    if ml.translation_batcher is not None:
+        ml.translation_batcher.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--threads', default='1,8,32,64', help='comma-separated client counts')
+    parser.add_argument('--duration', type=float, default=5, help='seconds per run')
+    parser.add_argument('--call-ms', type=float, default=StubTranslationModel.call_ms)
+    parser.add_argument('--item-ms', type=float, default=StubTranslationModel.item_ms)
+    parser.add_argument('--max-wait-ms', default='0,2,5', help='comma-separated batcher waits')
+    parser.add_argument('--max-batch-size', type=int, default=Config.TRANSLATION_BATCHER_MAX_BATCH_SIZE)
+    parser.add_argument('--workers', type=int, default=Config.TRANSLATION_BATCHER_WORKERS)
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+    StubTranslationModel.call_ms = args.call_ms
+    StubTranslationModel.item_ms = args.item_ms
+
+    waits = [None] + [float(wait) for wait in args.max_wait_ms.split(',')]
+    results = [run(int(threads), args.duration, wait, args.max_batch_size, args.workers)
+               for threads in args.threads.split(',') for wait in waits]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"model: {args.call_ms}ms/call + {args.item_ms}ms/text, serialized  "
+          f"batch <= {args.max_batch_size}, {args.workers} batcher workers  {args.duration}s per run")
+    print(f"{'threads':>7} {'batcher':>8} {'req/s':>8} {'p50_ms':>8} {'p99_ms':>8} {'avg_batch':>10}")
+    for r in results:
+        print(f"{r['threads']:>7} {r['batcher']:>8} {r['rps']:>8.0f} {r['p50_ms']:>8.1f} "
+              f"{r['p99_ms']:>8.1f} {r['avg_batch']:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Per-call cost of text normalization: the old replace/split chains against
+translation.normalize.normalize_text.
+
+    translator  text.strip().replace("?", "").replace("।", "")
+    backend     ' '.join(text.replace('?', '').replace('।', '').split())
+    normalize   normalize_text(text), which also does NFC, joiners and
+                whitespace variants; repeated texts hit its memo
+    first_seen  the same without the memo, i.e. a text seen the first time
+
+Inputs are grouped by kind: clean ASR-style text, text ending in
+punctuation (the usual typed query), and messy text (double spaces, tabs,
+NBSP, ZWJ, precomposed nukta letters). For each group the script reports
+nanoseconds per call and the peak memory allocated during one call
+(tracemalloc), as a proxy for the intermediate copies made.
+
+Usage:
+    python benchmarks/bench_normalize.py [--calls 200000]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ml'))
+
+from translation import normalize
+from translation.normalize import normalize_text
+
+INPUTS = {
+    'clean': [
+        'म्यर पेट दुखाण छ',
+        'केदारनाथ सै नजदीक लोकल मंदिर कठां छ',
+        'डॉक्टर कत मिलछ',
+    ],
+    'punctuated': [
+        'केदारनाथ सै नजदीक लोकल मंदिर कठां छ?',
+        'यख असली गढ़वाली खान कठां मिल्ली?',
+        'म्यर पेट दुखाण छ।',
+    ],
+    'messy': [
+        '  यख असली  गढ़वाली खान\tकठां मिल्ली । ',
+        'केदारनाथ\u00a0कै पास लोकल मंदिर कत छ?',
+        'क्\u200dष गढ\u093cवाली \u095c',
+    ],
+}
+
+
+def translator_chain(text):
+    return text.strip().replace("?", "").replace("।", "")
+
+
+def backend_chain(text):
+    return ' '.join(text.replace('?', '').replace('।', '').split())
+
+
+METHODS = {
+    'translator': translator_chain,
+    'backend': backend_chain,
+    'normalize': normalize_text,
+    # Every call a text not seen before (memo bypassed)
+    'first_seen': lambda text: normalize._normalize(text, True),
+}
+
+
+def ns_per_call(fn, texts, calls):
+    # Best of 5 runs per text, to keep scheduler noise out of the numbers
+    per_text = max(1, calls // len(texts))
+    total = sum(min(timeit.repeat(lambda: fn(text), number=per_text // 5 or 1, repeat=5)) * 5
+                for text in texts)
+    return total / (per_text * len(texts)) * 1e9
+
+
+def peak_bytes(fn, texts):
+    # Fresh copies, so no method benefits from objects another one cached
+    peaks = []
+    for text in texts:
+        text = ''.join(list(text))
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        fn(text)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+        tracemalloc.stop()
+    return sum(peaks) / len(peaks)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--calls', type=int, default=200000, help='calls per method and input group')
+    args = parser.parse_args()
+
+    print(f"{'inputs':>11} {'method':>11} {'ns_per_call':>12} {'peak_bytes':>11}")
+    for group, texts in INPUTS.items():
+        for name, fn in METHODS.items():
+            ns = ns_per_call(fn, texts, args.calls)
+            peak = peak_bytes(fn, texts)
+            print(f"{group:>11} {name:>11} {ns:>12.0f} {peak:>11.0f}")
+
+    print()
+    for texts in INPUTS.values():
+        for text in texts:
+            print(f'{text!r} -> {normalize_text(text)!r}')
+
+
+if __name__ == '__main__':
+    main()
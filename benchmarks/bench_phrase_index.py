@@ -0,0 +1,70 @@
+"""
+Per-call latency of phrase lookup as the phrasebook grows.
+
+Compares the old linear `key in text` scan with the prebuilt
+PhraseIndex automaton on synthetic Garhwali-like phrasebooks.
+
+Usage:
+    python benchmarks/bench_phrase_index.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ml'))
+
+from translation.phrase_index import PhraseIndex
+
+SIZES = [100, 1000, 10000, 100000]
+QUERIES = 200
+SYLLABLES = ['क', 'का', 'कि', 'ख', 'ग', 'घ', 'च', 'छ', 'ज', 'ट', 'ठ', 'ड', 'ण', 'त', 'थ',
+             'द', 'ध', 'न', 'प', 'फ', 'ब', 'भ', 'म', 'य', 'र', 'ल', 'व', 'स', 'ह', 'णी', 'लो']
+
+
+def make_word(rng):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def make_phrasebook(size, rng):
+    phrases = set()
+    while len(phrases) < size:
+        phrases.add(' '.join(make_word(rng) for _ in range(rng.randint(1, 4))))
+    return list(phrases)
+
+
+def linear_scan(phrases, text):
+    for key in phrases:
+        if key in text:
+            return key
+    return None
+
+
+def time_per_call(fn, queries):
+    start = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'phrases':>8} {'build_ms':>10} {'linear_us':>12} {'index_us':>10}")
+    for size in SIZES:
+        phrases = make_phrasebook(size, rng)
+        # Half the queries contain a phrase, half are misses (worst case for the scan)
+        queries = [f"{make_word(rng)} {rng.choice(phrases)} {make_word(rng)}" for _ in range(QUERIES // 2)]
+        queries += [' '.join(make_word(rng) for _ in range(5)) for _ in range(QUERIES // 2)]
+
+        start = time.perf_counter()
+        index = PhraseIndex(phrases)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        linear_us = time_per_call(lambda q: linear_scan(phrases, q), queries)
+        index_us = time_per_call(index.find_longest, queries)
+        print(f"{size:>8} {build_ms:>10.1f} {linear_us:>12.1f} {index_us:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
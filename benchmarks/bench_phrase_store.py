@@ -0,0 +1,92 @@
+"""
+Startup time and resident memory of loading the phrasebook as JSON
+versus opening the compiled mmap phrase store.
+
+Each variant runs in a fresh subprocess so import-time work and resident memory
+are measured in isolation.
+
+Usage:
+    python benchmarks/bench_phrase_store.py [phrases_per_language]
+"""
+
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+ML_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ml')
+sys.path.insert(0, ML_PATH)
+
+from translation.phrase_store import compile_phrases
+
+LETTERS = 'कखगघचछजझटठडढणतथदधनपफबभमयरलवसहािीुूेैोौं'
+
+CHILD = r'''
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+start = time.perf_counter()
+if sys.argv[2] == "json":
+    with open(sys.argv[3], encoding="utf-8") as f:
+        phrases = json.load(f)
+else:
+    from translation.phrase_store import PhraseStore
+    phrases = PhraseStore(sys.argv[3])
+loaded = time.perf_counter()
+phrases["garhwali"][sys.argv[4]]
+first = time.perf_counter()
+print(json.dumps({
+    "load_ms": (loaded - start) * 1000,
+    "first_lookup_ms": (first - loaded) * 1000,
+    "rss_mb": rss_mb()
+}))
+'''
+
+
+def make_phrasebook(per_language, rng):
+    def phrase():
+        return ' '.join(''.join(rng.choice(LETTERS) for _ in range(rng.randint(2, 6)))
+                        for _ in range(rng.randint(1, 5)))
+    return {
+        language: {phrase(): {"hi": phrase(), "en": f"phrase {i}"} for i in range(per_language)}
+        for language in ("garhwali", "kumaoni")
+    }
+
+
+def run(mode, path, key):
+    out = subprocess.check_output([sys.executable, '-c', CHILD, ML_PATH, mode, path, key])
+    return json.loads(out)
+
+
+def main():
+    per_language = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    phrases = make_phrasebook(per_language, random.Random(7))
+    key = next(iter(phrases["garhwali"]))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'sample_phrases.json')
+        store_path = os.path.join(tmp, 'sample_phrases.store')
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(phrases, f, ensure_ascii=False)
+        compile_phrases(phrases, store_path)
+
+        print(f"phrases: {2 * per_language}  json: {os.path.getsize(json_path) / 1e6:.1f} MB  "
+              f"store: {os.path.getsize(store_path) / 1e6:.1f} MB")
+        print(f"{'format':>6} {'load_ms':>9} {'first_lookup_ms':>16} {'rss_mb':>7}")
+        for mode, path in (("json", json_path), ("store", store_path)):
+            result = run(mode, path, key)
+            print(f"{mode:>6} {result['load_ms']:>9.2f} {result['first_lookup_ms']:>16.3f} "
+                  f"{result['rss_mb']:>7.1f}")
+
+
+if __name__ == '__main__':
+    main()
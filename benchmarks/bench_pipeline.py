@@ -0,0 +1,58 @@
+"""
+End-to-end latency of the staged ASR → MT → TTS pipeline versus running
+the stages one after another, using stub stages with fixed latencies.
+
+With one worker per stage, N segments take about sum(stages) + (N - 1) x
+slowest stage instead of N x sum(stages); more workers on the slowest
+stage bring it closer still.
+
+Usage:
+    python benchmarks/bench_pipeline.py [segments]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from utils.pipeline import StagedPipeline
+
+STAGE_LATENCY_MS = {'asr': 120, 'translation': 40, 'tts': 80}
+
+
+def stub(name):
+    def handler(state):
+        time.sleep(STAGE_LATENCY_MS[name] / 1000)
+        return f'{name}({state["item"]})'
+    return handler
+
+
+def main():
+    segments = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    handlers = {name: stub(name) for name in STAGE_LATENCY_MS}
+    items = list(range(segments))
+    stage_sum = sum(STAGE_LATENCY_MS.values())
+    slowest = max(STAGE_LATENCY_MS.values())
+
+    print(f"{segments} segments, stage latencies {STAGE_LATENCY_MS} ms")
+    print(f"{'mode':>28} {'wall_ms':>9} {'ideal_ms':>9}")
+
+    start = time.perf_counter()
+    for item in items:
+        state = {'item': item}
+        for name in STAGE_LATENCY_MS:
+            state[name] = handlers[name](state)
+    sequential = (time.perf_counter() - start) * 1000
+    print(f"{'sequential':>28} {sequential:>9.0f} {segments * stage_sum:>9}")
+
+    for workers in (1, 2, 4):
+        pipeline = StagedPipeline([(name, workers) for name in STAGE_LATENCY_MS])
+        _, timings = pipeline.run(items, handlers)
+        ideal = stage_sum + (-(-segments // workers) - 1) * slowest
+        print(f"{f'pipelined, {workers} worker(s)/stage':>28} {timings['wall_ms']:>9.0f} {ideal:>9}")
+        pipeline.shutdown()
+
+
+if __name__ == '__main__':
+    main()
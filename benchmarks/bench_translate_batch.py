@@ -0,0 +1,76 @@
+"""
+Throughput of per-item translate_text calls versus translate_batch.
+
+Uses a local stub seq2seq model whose cost is a fixed per-call overhead
+plus a per-token cost over the padded batch (batch size x longest input),
+which is how a real encoder-decoder behaves on CPU/GPU.
+
+Usage:
+    python benchmarks/bench_translate_batch.py [num_texts]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from config import Config
+from utils.ml_integration import MLIntegration
+from utils.model_registry import ModelRegistry
+
+CALL_OVERHEAD_S = 0.004
+TOKEN_COST_S = 0.00002
+WORDS = ['म्यर', 'पेट', 'दुखाण', 'छ', 'केदारनाथ', 'सै', 'नजदीक', 'लोकल', 'मंदिर', 'कठां',
+         'यख', 'असली', 'गढ़वाली', 'खान', 'मिल्ली', 'पाणी', 'कैसो', 'डॉक्टर']
+
+
+class BenchConfig(Config):
+    TRANSLATION_CACHE_ENABLED = False
+
+
+class StubSeq2SeqModel:
+    """Sleeps for overhead + cost of the padded batch"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def translate_batch(self, texts, input_lang, output_lang):
+        self.calls += 1
+        padded_tokens = len(texts) * max(len(t) for t in texts)
+        time.sleep(CALL_OVERHEAD_S + TOKEN_COST_S * padded_tokens)
+        return [{'translated_text': t[::-1], 'confidence': 0.9} for t in texts]
+
+
+def make_texts(count, rng):
+    unique = [' '.join(rng.choice(WORDS) for _ in range(rng.randint(2, 12))) for _ in range(count)]
+    # Roughly a third of the traffic repeats an earlier phrase
+    return [rng.choice(unique[:max(i, 1)]) if rng.random() < 0.3 else unique[i] for i in range(count)]
+
+
+def run(label, fn, texts, model):
+    start = time.perf_counter()
+    fn(texts)
+    elapsed = time.perf_counter() - start
+    print(f"{label:>10} {elapsed * 1000:>10.1f} {len(texts) / elapsed:>12.1f} {model.calls:>11}")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    texts = make_texts(count, random.Random(3))
+
+    print(f"{count} texts, micro-batch size {BenchConfig.TRANSLATION_MICRO_BATCH_SIZE}")
+    print(f"{'mode':>10} {'total_ms':>10} {'texts_per_s':>12} {'model_calls':>11}")
+
+    per_item = MLIntegration(BenchConfig, registry=ModelRegistry({'translation': StubSeq2SeqModel}))
+    run('per-item', lambda ts: [per_item.translate_text(t, 'garhwali', 'hindi') for t in ts],
+        texts, per_item.models.get('translation'))
+
+    batched = MLIntegration(BenchConfig, registry=ModelRegistry({'translation': StubSeq2SeqModel}))
+    run('batched', lambda ts: batched.translate_batch(ts, 'garhwali', 'hindi'),
+        texts, batched.models.get('translation'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Startup regression check: how long it takes to import the app.
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters from
+backend/, takes the median total over --runs, and prints the slowest
+packages by self time. Exits with status 1 when the median is over
+--budget-ms or when a module that should load lazily (--forbid, numpy by
+default) was imported at startup, so it can gate CI:
+
+    python benchmarks/check_import_time.py --budget-ms 400
+    python benchmarks/check_import_time.py --module asgi --budget-ms 600
+
+One unreported run comes first so bytecode compilation isn't counted.
+Budgets are machine dependent; pick one from a few runs on the CI host.
+
+Usage:
+    python benchmarks/check_import_time.py [--module app] [--runs 5]
+        [--budget-ms 400] [--forbid numpy] [--top 10] [--json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+
+CHILD = '''
+import json, sys
+import {module}
+print(json.dumps(sorted(name for name in {forbid!r} if name in sys.modules)))
+'''
+
+
+def measure(module, forbid):
+    """One cold import; returns (total_us, {package: self_us}, forbidden modules loaded)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHILD.format(module=module, forbid=forbid)],
+        cwd=BACKEND, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f'importing {module} failed')
+
+    total = 0
+    packages = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        name = name.strip()
+        package = name.split('.')[0]
+        packages[package] = packages.get(package, 0) + int(self_us)
+        if name == module:
+            total = int(cumulative_us)
+    loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    return total, packages, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--module', default='app', help='module to import from backend/ (app or asgi)')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=400.0)
+    parser.add_argument('--forbid', default='numpy',
+                        help='comma separated modules that must not be imported at startup')
+    parser.add_argument('--top', type=int, default=10, help='packages listed by self time')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args()
+
+    forbid = [name for name in args.forbid.split(',') if name]
+    measure(args.module, forbid)  # writes __pycache__
+
+    totals = []
+    packages = {}
+    loaded = set()
+    for _ in range(args.runs):
+        total, run_packages, run_loaded = measure(args.module, forbid)
+        totals.append(total)
+        loaded.update(run_loaded)
+        for package, self_us in run_packages.items():
+            packages.setdefault(package, []).append(self_us)
+
+    median_ms = statistics.median(totals) / 1000
+    top = sorted(((statistics.median(times) / 1000, package) for package, times in packages.items()),
+                 reverse=True)[:args.top]
+    failures = []
+    if median_ms > args.budget_ms:
+        failures.append(f'import {args.module} took {median_ms:.1f}ms, budget {args.budget_ms:.0f}ms')
+    for name in sorted(loaded):
+        failures.append(f'{name} was imported at startup')
+
+    report = {
+        'module': args.module,
+        'python': sys.version.split()[0],
+        'runs': args.runs,
+        'median_ms': round(median_ms, 1),
+        'min_ms': round(min(totals) / 1000, 1),
+        'max_ms': round(max(totals) / 1000, 1),
+        'budget_ms': args.budget_ms,
+        'top_packages_ms': {package: round(ms, 1) for ms, package in top},
+        'failures': failures
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"import {args.module}: median {report['median_ms']}ms "
+              f"(min {report['min_ms']}, max {report['max_ms']}, budget {args.budget_ms:.0f}ms)")
+        print(f"{'package':>24} {'self_ms':>8}")
+        for ms, package in top:
+            print(f'{package:>24} {ms:8.1f}')
+        for failure in failures:
+            print(f'FAIL: {failure}')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Replay a WAV file at real-time speed into /api/voice-to-text/stream and
+measure time-to-first-word for each utterance.
+
+Audio is sent as a chunked POST while the response is read concurrently,
+like a live microphone client. Without --wav, a synthetic recording of
+utterances of increasing length (1s, 3s, 6s tones separated by silence)
+is used, so you can check that time-to-first-word stays flat.
+
+Usage:
+    python benchmarks/replay_stream.py                # starts a local server
+    python benchmarks/replay_stream.py --url http://127.0.0.1:5000 --wav sample.wav
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+sys.path.insert(0, BACKEND)
+
+STREAM_PATH = '/api/voice-to-text/stream?input_language=garhwali'
+
+
+def synthetic_wav(utterances=(1.0, 3.0, 6.0), gap=1.0, sample_rate=16000):
+    from utils.audio import encode_wav
+    parts = [np.zeros(int(gap * sample_rate))]
+    for seconds in utterances:
+        t = np.arange(int(seconds * sample_rate)) / sample_rate
+        parts.append(0.3 * np.sin(2 * np.pi * 220 * t) * 32767)
+        parts.append(np.zeros(int(gap * sample_rate)))
+    return encode_wav(np.concatenate(parts).astype(np.int16), sample_rate)
+
+
+def start_local_server():
+    os.chdir(BACKEND)
+    from werkzeug.serving import make_server
+    from app import create_app
+    server = make_server('127.0.0.1', 0, create_app(), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'http://127.0.0.1:{server.server_port}'
+
+
+def read_line(f):
+    return f.readline().decode('latin-1').rstrip('\r\n')
+
+
+def replay(url, wav_bytes, chunk_ms):
+    # Byte rate from the WAV header (bytes 28-31)
+    byte_rate = int.from_bytes(wav_bytes[28:32], 'little')
+    chunk_size = max(int(byte_rate * chunk_ms / 1000), 1)
+
+    parsed = urlparse(url)
+    sock = socket.create_connection((parsed.hostname, parsed.port or 80))
+    sock.sendall(
+        f'POST {STREAM_PATH} HTTP/1.1\r\nHost: {parsed.netloc}\r\n'
+        'Content-Type: audio/wav\r\nTransfer-Encoding: chunked\r\n\r\n'.encode('latin-1')
+    )
+    start = time.perf_counter()
+
+    def send():
+        # First chunk carries the header; then pace audio at real time
+        sock.sendall(b'%x\r\n%s\r\n' % (44, wav_bytes[:44]))
+        for i, offset in enumerate(range(44, len(wav_bytes), chunk_size)):
+            delay = start + i * chunk_ms / 1000 - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            chunk = wav_bytes[offset:offset + chunk_size]
+            sock.sendall(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+        sock.sendall(b'0\r\n\r\n')
+
+    sender = threading.Thread(target=send, daemon=True)
+    sender.start()
+
+    f = sock.makefile('rb')
+    status = read_line(f)
+    headers = {}
+    while True:
+        line = read_line(f)
+        if not line:
+            break
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    events = []
+    buffered = b''
+    chunked = headers.get('transfer-encoding') == 'chunked'
+    while True:
+        if chunked:
+            size = int(read_line(f), 16)
+            if size == 0:
+                break
+            data = f.read(size)
+            f.read(2)
+        else:
+            data = f.read1(4096)
+            if not data:
+                break
+        buffered += data
+        while b'\n' in buffered:
+            line, buffered = buffered.split(b'\n', 1)
+            event = json.loads(line)
+            event['arrival_ms'] = (time.perf_counter() - start) * 1000
+            events.append(event)
+
+    sender.join()
+    sock.close()
+    return status, events
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', help='server base URL (default: start a local server)')
+    parser.add_argument('--wav', help='WAV file to replay (default: synthetic utterances)')
+    parser.add_argument('--chunk-ms', type=int, default=100)
+    args = parser.parse_args()
+
+    if args.wav:
+        with open(args.wav, 'rb') as f:
+            wav_bytes = f.read()
+    else:
+        wav_bytes = synthetic_wav()
+    url = args.url or start_local_server()
+
+    status, events = replay(url, wav_bytes, args.chunk_ms)
+    print(status)
+
+    first_word = {}
+    for event in events:
+        if event['type'] in ('partial', 'final'):
+            first_word.setdefault(event['segment'], event)
+        print(json.dumps(event, ensure_ascii=False))
+
+    print(f"\n{'segment':>7} {'speech_start_ms':>15} {'utterance_ms':>12} {'time_to_first_word_ms':>21}")
+    finals = {e['segment']: e for e in events if e['type'] == 'final'}
+    for segment, event in sorted(first_word.items()):
+        final = finals.get(segment, event)
+        print(f"{segment:>7} {event['start_ms']:>15} {final['end_ms'] - final['start_ms']:>12} "
+              f"{event['arrival_ms'] - event['start_ms']:>21.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,16 @@
 import whisper
 
-model = whisper.load_model("base")
 
-audio_path = "mlsample_audio/garhwali_sample.wav"
+def main():
+    model = whisper.load_model("base")
 
-result = model.transcribe(audio_path)
+    audio_path = "mlsample_audio/garhwali_sample.wav"
 
-print("Detected Text:")
-print(result["text"])
+    result = model.transcribe(audio_path)
+
+    print("Detected Text:")
+    print(result["text"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Translation module for Garhwali and Kumaoni"""
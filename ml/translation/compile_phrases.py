@@ -0,0 +1,32 @@
+"""
+Compile sample_phrases.json into the mmap phrase store used by the translator.
+
+Usage (from the repository root):
+    python ml/translation/compile_phrases.py [ml/sample_phrases.json] [ml/sample_phrases.store]
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from translation.phrase_store import compile_phrases
+
+DEFAULT_SOURCE = os.path.join("ml", "sample_phrases.json")
+DEFAULT_TARGET = os.path.join("ml", "sample_phrases.store")
+
+
+def main(argv):
+    source = argv[1] if len(argv) > 1 else DEFAULT_SOURCE
+    target = argv[2] if len(argv) > 2 else DEFAULT_TARGET
+
+    with open(source, encoding="utf-8") as f:
+        phrases = json.load(f)
+
+    count = compile_phrases(phrases, target)
+    print(f"Compiled {count} phrases from {source} into {target}")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
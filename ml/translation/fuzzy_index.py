@@ -0,0 +1,219 @@
+"""
+Approximate phrase matching for the phrasebook translator.
+
+ASR output is often one matra, halant or space away from a phrasebook
+key. FuzzyIndex finds the closest key by edit distance counted in
+grapheme clusters (a consonant with its matras, or a conjunct), so a
+missing matra costs 1 no matter how many code points it has.
+
+Keys are indexed by their grapheme trigrams. Within distance k, a key
+must share at least one of the query's rarest trigrams once those cover
+more than k * 3 trigram occurrences (each edit destroys at most 3).
+Only keys from those short posting lists are verified with a banded edit
+distance, so a lookup touches a few dozen keys rather than the whole
+phrasebook.
+
+Like PhraseIndex, keys are referred to by position in the source
+sequence and only the matched key is read back from it.
+"""
+
+import re
+from array import array
+from collections.abc import Sequence
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+Q = 3
+
+# A cluster is any character followed by its combining marks (Devanagari
+# signs, generic diacritics, ZWJ/ZWNJ) and by virama + consonant pairs
+_MARKS = '\u0300-\u036f\u0900-\u0903\u093a-\u093c\u093e-\u094f\u0951-\u0957\u0962\u0963\u200c\u200d'
+_CONSONANTS = '\u0915-\u0939\u0958-\u095f\u0978-\u097f'
+_CLUSTER = re.compile(f'.(?:\u094d[\u200c\u200d]?[{_CONSONANTS}]|[{_MARKS}])*', re.S)
+
+# Symbols of the encoded form: one code point per grapheme cluster
+_PAD = '\x00'
+_UNKNOWN = '\x01'
+_FIRST_SYMBOL = 2
+
+
+class FuzzyMatch(NamedTuple):
+    phrase: str
+    distance: int  # in grapheme clusters
+    similarity: float  # 1 - distance / clusters in the longer string
+
+
+def graphemes(text: str) -> List[str]:
+    """Split text into grapheme clusters (letter + marks, conjuncts)"""
+    return _CLUSTER.findall(text)
+
+
+def edit_distance(a, b, max_distance: Optional[int] = None) -> int:
+    """
+    Levenshtein distance between two sequences (strings or grapheme lists).
+
+    With max_distance, max_distance + 1 is returned as soon as the
+    distance must exceed it.
+    """
+    if max_distance is None:
+        max_distance = max(len(a), len(b))
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if not a:
+        return len(b)
+    return _bit_distance(_pattern_masks(a), len(a), b, max_distance)
+
+
+def _pattern_masks(pattern) -> Dict:
+    """Item -> bit mask of its positions in the pattern"""
+    masks = {}
+    for i, item in enumerate(pattern):
+        masks[item] = masks.get(item, 0) | (1 << i)
+    return masks
+
+
+def _bit_distance(masks: Dict, m: int, text, max_distance: int) -> int:
+    """
+    Bit-parallel Levenshtein distance (Myers 1999, Hyyro's global variant)
+    of an m-item pattern, given as its position masks, against text.
+
+    A column of the DP table is held in two bit vectors of vertical +1/-1
+    deltas, so each text item costs a handful of integer operations
+    instead of m cell updates.
+    """
+    n = len(text)
+    limit = max_distance + 1
+    if abs(m - n) > max_distance:
+        return limit
+    full = (1 << m) - 1
+    last = 1 << (m - 1)
+    positive, negative = full, 0
+    score = m
+    for j, item in enumerate(text, 1):
+        eq = masks.get(item, 0)
+        xv = eq | negative
+        xh = (((eq & positive) + positive) ^ positive) | eq
+        horizontal_positive = negative | (~(xh | positive) & full)
+        horizontal_negative = positive & xh
+        if horizontal_positive & last:
+            score += 1
+        elif horizontal_negative & last:
+            score -= 1
+        # Each of the remaining items can lower the distance by at most 1
+        if score - (n - j) >= limit:
+            return limit
+        horizontal_positive = ((horizontal_positive << 1) | 1) & full
+        horizontal_negative = (horizontal_negative << 1) & full
+        positive = horizontal_negative | (~(xv | horizontal_positive) & full)
+        negative = horizontal_positive & xv
+    return score if score < limit else limit
+
+
+class FuzzyIndex:
+    """Trigram inverted index over phrase keys, matched on grapheme edit distance"""
+
+    def __init__(self, phrases: Iterable[str], max_ratio: float = 0.25):
+        """
+        Args:
+            phrases: phrasebook keys
+            max_ratio: default distance limit as a fraction of the query's
+                grapheme count (0.25: one edit per four clusters)
+        """
+        self.max_ratio = max_ratio
+        self._symbols: Dict[str, str] = {}
+        self._phrases = phrases if isinstance(phrases, Sequence) else list(phrases)
+        # Position in self._phrases of each indexed key
+        self._positions = array('i')
+        self._encoded: List[str] = []
+        self._exact: Dict[str, int] = {}
+        self._postings: Dict[str, List[int]] = {}
+        postings = self._postings
+
+        for position, phrase in enumerate(self._phrases):
+            encoded = self._encode(phrase, add=True)
+            if not encoded or encoded in self._exact:
+                continue
+            pid = self._exact[encoded] = len(self._positions)
+            self._positions.append(position)
+            self._encoded.append(encoded)
+            for gram in set(_trigrams(encoded)):
+                postings.setdefault(gram, []).append(pid)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def _encode(self, text: str, add: bool = False) -> str:
+        symbols = self._symbols
+        out = []
+        for cluster in graphemes(text):
+            symbol = symbols.get(cluster)
+            if symbol is None:
+                if not add:
+                    out.append(_UNKNOWN)
+                    continue
+                code = _FIRST_SYMBOL + len(symbols)
+                # Skip the surrogate range, which can't be used in a str
+                symbol = symbols[cluster] = chr(code if code < 0xD800 else code + 0x800)
+            out.append(symbol)
+        return ''.join(out)
+
+    def search(self, text: str, max_distance: Optional[int] = None) -> Optional[FuzzyMatch]:
+        """
+        Closest phrase within max_distance grapheme edits, or None.
+
+        Among equally close phrases the one sharing more trigrams with the
+        text wins, then the one added first. max_distance defaults to
+        max_ratio times the query's grapheme count.
+        """
+        query = self._encode(text)
+        if not query:
+            return None
+        pid = self._exact.get(query)
+        if pid is not None:
+            return FuzzyMatch(self._phrases[self._positions[pid]], 0, 1.0)
+
+        grams = _trigrams(query)
+        if max_distance is None:
+            max_distance = int(len(query) * self.max_ratio)
+        # Beyond this even a key sharing no trigram could be in range
+        max_distance = min(max_distance, (len(grams) - 1) // Q)
+        if max_distance < 1:
+            return None
+
+        counts = {}
+        for gram in grams:
+            counts[gram] = counts.get(gram, 0) + 1
+        postings = self._postings
+        empty = ()
+        # Candidate -> prefix trigrams it shares with the query
+        shared = {}
+        covered = 0
+        for gram in sorted(counts, key=lambda g: len(postings.get(g, empty))):
+            for pid in postings.get(gram, empty):
+                shared[pid] = shared.get(pid, 0) + 1
+            covered += counts[gram]
+            if covered > max_distance * Q:
+                break
+
+        # Likely matches first, so the bound tightens early and most of
+        # the remaining distance computations stop after a few rows
+        encoded = self._encoded
+        masks = _pattern_masks(query)
+        best = None
+        best_distance = limit = max_distance
+        for pid in sorted(shared, key=lambda pid: (-shared[pid], pid)):
+            distance = _bit_distance(masks, len(query), encoded[pid], limit)
+            if distance <= limit:
+                best, best_distance = pid, distance
+                if distance == 1:
+                    break
+                limit = distance - 1
+        if best is None:
+            return None
+        longest = max(len(query), len(encoded[best]))
+        return FuzzyMatch(self._phrases[self._positions[best]], best_distance, 1.0 - best_distance / longest)
+
+
+def _trigrams(encoded: str) -> List[str]:
+    padded = _PAD * (Q - 1) + encoded + _PAD * (Q - 1)
+    return [padded[i:i + Q] for i in range(len(padded) - Q + 1)]
+
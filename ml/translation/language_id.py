@@ -0,0 +1,119 @@
+"""
+Scored Garhwali/Kumaoni language identifier.
+
+The input is tokenized once. Every token is looked up in one combined
+marker index and every character n-gram in one combined n-gram index,
+each mapping to a per-language weight vector. Both languages are scored
+together, so lookup cost depends on the input length only, not on how
+many markers or sample phrases were indexed.
+"""
+
+from typing import Dict, Iterable, List
+
+GARHWALI_MARKERS = ["पाणी", "कैसो", "कठां", "म्यर"]
+KUMAONI_MARKERS = ["पानी", "कसो", "कत", "म्यर"]
+
+
+class LanguageIdentifier:
+    """Marker + character n-gram language identifier."""
+
+    def __init__(self, markers: Dict[str, Iterable[str]], ngram_size: int = 3,
+                 marker_weight: float = 1.0, ngram_weight: float = 0.5):
+        self.languages: List[str] = list(markers)
+        self.ngram_size = ngram_size
+        self.marker_weight = marker_weight
+        self.ngram_weight = ngram_weight
+        self._lang_pos = {language: i for i, language in enumerate(self.languages)}
+        self._marker_counts: Dict[str, List[int]] = {}
+        self._ngram_counts: Dict[str, List[int]] = {}
+        # Normalised weight vectors, rebuilt lazily after new data is added
+        self._marker_index: Dict[str, List[float]] = {}
+        self._ngram_index: Dict[str, List[float]] = {}
+        self._dirty = True
+
+        for language, words in markers.items():
+            for word in words:
+                self._count(self._marker_counts, word, language)
+            self.add_samples(language, words)
+
+    def _count(self, table: Dict[str, List[int]], key: str, language: str):
+        counts = table.get(key)
+        if counts is None:
+            counts = table[key] = [0] * len(self.languages)
+        counts[self._lang_pos[language]] += 1
+        self._dirty = True
+
+    def _ngrams(self, token: str) -> List[str]:
+        padded = f" {token} "
+        n = self.ngram_size
+        return [padded[i:i + n] for i in range(max(len(padded) - n + 1, 1))]
+
+    def add_samples(self, language: str, texts: Iterable[str]):
+        """Add known text in a language (e.g. phrasebook keys) as n-gram evidence."""
+        for text in texts:
+            for token in text.split():
+                for gram in self._ngrams(token):
+                    self._count(self._ngram_counts, gram, language)
+
+    @staticmethod
+    def _normalise(table: Dict[str, List[int]]) -> Dict[str, List[float]]:
+        # Each key contributes a total weight of 1 split across languages,
+        # so a marker shared by both languages is neutral evidence.
+        index = {}
+        for key, counts in table.items():
+            total = sum(counts)
+            index[key] = [count / total for count in counts]
+        return index
+
+    def _rebuild(self):
+        self._marker_index = self._normalise(self._marker_counts)
+        self._ngram_index = self._normalise(self._ngram_counts)
+        self._dirty = False
+
+    def identify(self, text: str) -> dict:
+        """
+        Identify the language of a text.
+
+        Returns:
+            dict with 'language' ('unknown' when there is no evidence or a
+            tie), per-language 'scores' and a 'confidence' in [0, 1]
+        """
+        if self._dirty:
+            self._rebuild()
+
+        marker_index, ngram_index = self._marker_index, self._ngram_index
+        marker_scores = [0.0] * len(self.languages)
+        ngram_scores = [0.0] * len(self.languages)
+        ngram_total = 0
+
+        for token in text.split():
+            weights = marker_index.get(token)
+            if weights is not None:
+                for i, weight in enumerate(weights):
+                    marker_scores[i] += weight
+            for gram in self._ngrams(token):
+                ngram_total += 1
+                weights = ngram_index.get(gram)
+                if weights is not None:
+                    for i, weight in enumerate(weights):
+                        ngram_scores[i] += weight
+
+        scores = {}
+        for i, language in enumerate(self.languages):
+            ngram_score = ngram_scores[i] / ngram_total if ngram_total else 0.0
+            scores[language] = round(
+                self.marker_weight * marker_scores[i] + self.ngram_weight * ngram_score, 4
+            )
+
+        ranked = sorted(scores.values(), reverse=True)
+        total = sum(ranked)
+        if total == 0 or (len(ranked) > 1 and ranked[0] == ranked[1]):
+            language = "unknown"
+        else:
+            language = max(scores, key=scores.get)
+
+        return {
+            "language": language,
+            "scores": scores,
+            "confidence": round(ranked[0] / total, 4) if total else 0.0
+        }
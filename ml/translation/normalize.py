@@ -0,0 +1,88 @@
+"""
+Text normalization shared by the translator, the backend's phrase lookups
+and its cache keys.
+
+Text that renders the same should get the same key: Unicode NFC (so a
+precomposed nukta letter such as U+095C equals ड + nukta), no invisible
+joiners, any kind of whitespace collapsed to one space, and sentence
+punctuation treated as a word break.
+
+Lookup texts repeat a lot, so results for short texts are memoized.
+Otherwise most input is printable text with single spaces, and the common
+path is a few C-level scans (`in`, isprintable, the NFC check) with at
+most one or two copies. str.translate tables are not used: outside ASCII CPython
+looks every character up in the table, which on Devanagari costs several
+times more than these scans.
+"""
+
+import functools
+import re
+import unicodedata
+
+# Sentence punctuation, removed for phrase lookup (kept for speech)
+PUNCTUATION = '?।॥|'
+
+# Zero-width characters that only affect rendering: ZWSP, ZWNJ, ZWJ,
+# word joiner, BOM, soft hyphen
+INVISIBLE = '\u200b\u200c\u200d\u2060\ufeff\u00ad'
+
+NUKTA = '\u093c'
+# A nukta that NFC would change: one that composes with न, र or ळ, one
+# after virama or a Vedic accent (reordered), or one next to a character
+# from another script. The nukta in letters like ढ़ or ड़ is left alone.
+# Starts with the nukta itself so re can scan for it as a literal
+_NUKTA_NFC = re.compile('\u093c(?:(?<=[\u0928\u0930\u0933\u094d\u0951-\u0954\u0080-\u08ff\u0980-\uffff]\u093c)'
+                        '|[\u0080-\u08ff\u0980-\uffff])')
+
+
+# Texts up to this length are memoized
+MEMO_MAX_LENGTH = 512
+MEMO_SIZE = 8192
+
+
+def normalize_text(text: str, strip_punctuation: bool = True) -> str:
+    """
+    Canonical form of text for phrase lookup and cache keys.
+
+    Args:
+        text: input text
+        strip_punctuation: replace PUNCTUATION with a space; pass False
+            where punctuation matters, e.g. text to be spoken
+
+    Returns:
+        NFC text without joiners, single-spaced, with no leading or
+        trailing space
+    """
+    if len(text) <= MEMO_MAX_LENGTH:
+        return _normalize_memo(text, strip_punctuation)
+    return _normalize(text, strip_punctuation)
+
+
+def _normalize(text: str, strip_punctuation: bool) -> str:
+    if strip_punctuation:
+        for mark in PUNCTUATION:
+            if mark in text:
+                text = text.replace(mark, ' ')
+    if not text.isprintable():
+        # Whitespace other than ' ' and the invisible characters are all
+        # non-printable, so printable text skips this
+        for ch in INVISIBLE:
+            if ch in text:
+                text = text.replace(ch, '')
+        text = ' '.join(text.split())
+    elif '  ' in text:
+        text = ' '.join(text.split())
+    elif text[:1] == ' ' or text[-1:] == ' ':
+        text = text.strip(' ')
+
+    # is_normalized() falls back to a full normalization for any text with
+    # a nukta, which is most Garhwali; check the nukta positions with the
+    # regex and the rest of the text without them
+    if NUKTA in text:
+        nfc = _NUKTA_NFC.search(text) is None and unicodedata.is_normalized('NFC', text.replace(NUKTA, ''))
+    else:
+        nfc = unicodedata.is_normalized('NFC', text)
+    return text if nfc else unicodedata.normalize('NFC', text)
+
+
+_normalize_memo = functools.lru_cache(maxsize=MEMO_SIZE)(_normalize)
@@ -0,0 +1,116 @@
+"""
+Multi-pattern phrase matcher for the phrasebook translator.
+
+An Aho-Corasick automaton is built once over all phrase keys of a
+language, so finding the best phrase inside an input takes a single
+pass over the input instead of one substring search per phrase.
+
+Phrases are referred to by their position in the sequence the index was
+built from, so an index over a PhraseStore section holds no copies of
+the keys; the matched key is read back from the store.
+"""
+
+from array import array
+from collections.abc import Sequence
+from typing import Iterable, List, Optional, Tuple
+
+# Transitions are stored in one flat dict keyed by (node << _SHIFT) | ord(ch)
+# which is far smaller than a dict per trie node for large phrasebooks.
+_SHIFT = 21
+
+
+class PhraseIndex:
+    """Aho-Corasick automaton over phrase keys (character level)."""
+
+    def __init__(self, phrases: Iterable[str]):
+        self._goto = {}
+        self._fail = array('i', [0])
+        # Position of the longest phrase ending at each node (-1 = none)
+        self._out = array('i', [-1])
+        self._phrases = phrases if isinstance(phrases, Sequence) else list(phrases)
+        self._lengths = array('i', [0]) * len(self._phrases)
+        self._count = 0
+
+        for position, phrase in enumerate(self._phrases):
+            self._add(position, phrase)
+        self._build()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _add(self, position: int, phrase: str):
+        if not phrase:
+            return
+        node = 0
+        for ch in phrase:
+            key = (node << _SHIFT) | ord(ch)
+            child = self._goto.get(key)
+            if child is None:
+                child = len(self._fail)
+                self._goto[key] = child
+                self._fail.append(0)
+                self._out.append(-1)
+            node = child
+        if self._out[node] == -1:
+            self._out[node] = position
+            self._lengths[position] = len(phrase)
+            self._count += 1
+
+    def _build(self):
+        """Compute failure links breadth-first."""
+        children = {}
+        for key, child in self._goto.items():
+            children.setdefault(key >> _SHIFT, []).append((key & ((1 << _SHIFT) - 1), child))
+
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = [child for _, child in children.get(0, [])]
+        for node in queue:
+            for ch, child in children.get(node, []):
+                state = fail[node]
+                while state and ((state << _SHIFT) | ch) not in goto:
+                    state = fail[state]
+                fail[child] = goto.get((state << _SHIFT) | ch, 0)
+                if out[child] == -1:
+                    out[child] = out[fail[child]]
+                queue.append(child)
+
+    def find_all(self, text: str) -> List[Tuple[int, str]]:
+        """
+        Find the longest phrase ending at every position of the text.
+
+        Returns:
+            list of (start_index, phrase) tuples in order of occurrence
+        """
+        goto, fail, out, lengths = self._goto, self._fail, self._out, self._lengths
+        matches = []
+        node = 0
+        for i, ch in enumerate(text):
+            code = ord(ch)
+            while node and ((node << _SHIFT) | code) not in goto:
+                node = fail[node]
+            node = goto.get((node << _SHIFT) | code, 0)
+            pid = out[node]
+            if pid != -1:
+                matches.append((i + 1 - lengths[pid], self._phrases[pid]))
+        return matches
+
+    def find_longest(self, text: str) -> Optional[str]:
+        """
+        Return the longest phrase contained in the text, or None.
+
+        Ties are broken in favour of the phrase that occurs first.
+        """
+        goto, fail, out, lengths = self._goto, self._fail, self._out, self._lengths
+        best = -1
+        best_len = 0
+        node = 0
+        for ch in text:
+            code = ord(ch)
+            while node and ((node << _SHIFT) | code) not in goto:
+                node = fail[node]
+            node = goto.get((node << _SHIFT) | code, 0)
+            pid = out[node]
+            if pid != -1 and lengths[pid] > best_len:
+                best = pid
+                best_len = lengths[pid]
+        return self._phrases[best] if best != -1 else None
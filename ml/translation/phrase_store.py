@@ -0,0 +1,205 @@
+"""
+Compact on-disk phrase store read through mmap.
+
+The store is compiled offline from sample_phrases.json. Records are
+sorted by (language, key) and located through an offsets table, so
+opening the store costs one mmap call and lookups are binary searches
+over the mapped file. The mapping is read-only, so forked workers share
+the same pages through the OS page cache instead of each holding its own
+copy of the parsed JSON.
+
+Layout (little-endian):
+    magic   8 bytes   b'PHRSTOR1'
+    count   uint32    number of records
+    offsets uint32 * (count + 1), relative to the start of the data section
+    data    records "language \\x1f key \\x1f json(value)" in UTF-8
+"""
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+from collections.abc import Mapping, Sequence
+
+from translation.normalize import normalize_text
+
+MAGIC = b'PHRSTOR1'
+SEP = b'\x1f'
+_HEADER = struct.Struct('<8sI')
+_OFFSET = struct.Struct('<I')
+
+
+def compile_phrases(phrases: dict, path: str) -> int:
+    """
+    Write a {language: {key: value}} phrasebook to a store file.
+
+    Keys are stored normalized (normalize_text), the form the translator
+    looks them up in; keys that normalize the same keep the last value.
+
+    The file is written to a temporary name and renamed into place, so
+    running workers never see a half-written store.
+
+    Returns:
+        number of records written
+    """
+    normalized = {
+        language: {normalize_text(key): value for key, value in entries.items()}
+        for language, entries in phrases.items()
+    }
+    records = sorted(
+        SEP.join((language.encode('utf-8'), key.encode('utf-8'),
+                  json.dumps(value, ensure_ascii=False).encode('utf-8')))
+        for language, entries in normalized.items()
+        for key, value in entries.items()
+    )
+
+    offsets = [0]
+    for record in records:
+        offsets.append(offsets[-1] + len(record))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, len(records)))
+            f.write(struct.pack(f'<{len(offsets)}I', *offsets))
+            for record in records:
+                f.write(record)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    return len(records)
+
+
+class PhraseStore(Mapping):
+    """Read-only {language: {key: value}} view over a compiled store file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self._count = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"Not a phrase store: {path}")
+        self._offsets_start = _HEADER.size
+        self._data_start = self._offsets_start + _OFFSET.size * (self._count + 1)
+        self._sections = {}
+
+        # Language boundaries are found once; there are only a handful
+        index = 0
+        while index < self._count:
+            language = self._language_at(index)
+            end = self._lower_bound(language.encode('utf-8') + b'\x20')
+            self._sections[language] = PhraseSection(self, index, end)
+            index = end
+
+    def close(self):
+        self._mm.close()
+
+    def _bounds(self, index: int):
+        start = _OFFSET.unpack_from(self._mm, self._offsets_start + index * _OFFSET.size)[0]
+        end = _OFFSET.unpack_from(self._mm, self._offsets_start + (index + 1) * _OFFSET.size)[0]
+        return self._data_start + start, self._data_start + end
+
+    def _prefix(self, index: int) -> bytes:
+        """Return the "language \\x1f key" part of a record."""
+        start, end = self._bounds(index)
+        value_sep = self._mm.rfind(SEP, start, end)
+        return self._mm[start:value_sep]
+
+    def _language_at(self, index: int) -> str:
+        start, end = self._bounds(index)
+        return self._mm[start:self._mm.find(SEP, start, end)].decode('utf-8')
+
+    def _lower_bound(self, prefix: bytes, lo: int = 0, hi: int = None) -> int:
+        hi = self._count if hi is None else hi
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._prefix(mid) < prefix:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _key_at(self, index: int) -> str:
+        prefix = self._prefix(index)
+        return prefix[prefix.find(SEP) + 1:].decode('utf-8')
+
+    def _value_at(self, index: int):
+        start, end = self._bounds(index)
+        value_sep = self._mm.rfind(SEP, start, end)
+        return json.loads(self._mm[value_sep + 1:end].decode('utf-8'))
+
+    def __getitem__(self, language: str) -> 'PhraseSection':
+        return self._sections[language]
+
+    def __iter__(self):
+        return iter(self._sections)
+
+    def __len__(self) -> int:
+        return len(self._sections)
+
+
+class PhraseSection(Mapping):
+    """Read-only {key: value} view of one language in a PhraseStore."""
+
+    def __init__(self, store: PhraseStore, start: int, end: int):
+        self._store = store
+        self._start = start
+        self._end = end
+        self._language = store._language_at(start).encode('utf-8')
+
+    def _find(self, key: str) -> int:
+        target = self._language + SEP + key.encode('utf-8')
+        index = self._store._lower_bound(target, self._start, self._end)
+        if index < self._end and self._store._prefix(index) == target:
+            return index
+        return -1
+
+    def __getitem__(self, key: str):
+        index = self._find(key)
+        if index == -1:
+            raise KeyError(key)
+        return self._store._value_at(index)
+
+    def __contains__(self, key) -> bool:
+        return isinstance(key, str) and self._find(key) != -1
+
+    def __iter__(self):
+        for index in range(self._start, self._end):
+            yield self._store._key_at(index)
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def key_sequence(self) -> 'PhraseKeys':
+        """Keys in stored order, addressable by position."""
+        return PhraseKeys(self._store, self._start, self._end)
+
+
+class PhraseKeys(Sequence):
+    """
+    Positional view of the keys of one PhraseSection.
+
+    Indexes built over it keep positions instead of key strings, and a
+    key is decoded from the mapping only when a lookup returns it, so
+    the keys themselves stay in the shared page cache.
+    """
+
+    def __init__(self, store: PhraseStore, start: int, end: int):
+        self._store = store
+        self._start = start
+        self._end = end
+
+    def __getitem__(self, position: int) -> str:
+        if not 0 <= position < self._end - self._start:
+            raise IndexError(position)
+        return self._store._key_at(self._start + position)
+
+    def __len__(self) -> int:
+        return self._end - self._start
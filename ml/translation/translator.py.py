@@ -1,35 +1,116 @@
 import json
 import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from translation.fuzzy_index import FuzzyIndex
+from translation.language_id import GARHWALI_MARKERS, KUMAONI_MARKERS, LanguageIdentifier
+from translation.normalize import normalize_text
+from translation.phrase_index import PhraseIndex
+from translation.phrase_store import PhraseStore
 
 DATA_PATH = os.path.join("ml", "sample_phrases.json")
+# Compiled with ml/translation/compile_phrases.py
+STORE_PATH = os.path.join("ml", "sample_phrases.store")
+
+# Loaded lazily on first use, not at import time
+_phrases = None
+_phrase_indexes = {}
+_fuzzy_indexes = {}
+_language_identifier = None
+# Guards the lazy globals above, so concurrent first requests build them once
+_lock = threading.RLock()
 
 def load_phrases():
-    with open(DATA_PATH, encoding="utf-8") as f:
-        return json.load(f)
+    """
+    Open the compiled phrase store if it is up to date,
+    otherwise fall back to parsing the JSON file.
+    """
+    if os.path.exists(STORE_PATH) and (
+            not os.path.exists(DATA_PATH)
+            or os.path.getmtime(STORE_PATH) >= os.path.getmtime(DATA_PATH)):
+        return PhraseStore(STORE_PATH)
 
-PHRASES = load_phrases()
+    with open(DATA_PATH, encoding="utf-8") as f:
+        phrases = json.load(f)
+    # Same key form as the compiled store
+    return {
+        language: {normalize_text(key): value for key, value in entries.items()}
+        for language, entries in phrases.items()
+    }
 
-def normalize_text(text):
-    return text.strip().replace("?", "").replace("।", "")
+def get_phrases():
+    global _phrases
+    if _phrases is None:
+        with _lock:
+            if _phrases is None:
+                _phrases = load_phrases()
+    return _phrases
 
-def detect_language(text):
+def _phrase_keys(language):
+    """
+    Keys of a language for building an index. For the compiled store this
+    is a positional view, so the index holds record positions rather than
+    a private copy of every key.
+    """
+    section = get_phrases()[language]
+    if hasattr(section, "key_sequence"):
+        return section.key_sequence()
+    return list(section)
+
+def _get_index(indexes, language, build):
+    index = indexes.get(language)
+    if index is None:
+        with _lock:
+            index = indexes.get(language)
+            if index is None:
+                index = indexes[language] = build(_phrase_keys(language))
+    return index
+
+def get_phrase_index(language):
+    """One matcher per language, built once on first use"""
+    return _get_index(_phrase_indexes, language, PhraseIndex)
+
+def get_fuzzy_index(language):
+    """Approximate matcher over the phrase keys of a language, built once on first use"""
+    return _get_index(_fuzzy_indexes, language, FuzzyIndex)
+
+def get_language_identifier():
+    global _language_identifier
+    if _language_identifier is not None:
+        return _language_identifier
+    with _lock:
+        if _language_identifier is not None:
+            return _language_identifier
+        identifier = LanguageIdentifier({
+            "garhwali": GARHWALI_MARKERS,
+            "kumaoni": KUMAONI_MARKERS
+        })
+        phrases = get_phrases()
+        for language in identifier.languages:
+            identifier.add_samples(language, phrases.get(language, {}))
+        _language_identifier = identifier
+    return _language_identifier
+
+def __getattr__(name):
+    # Backwards compatible module attribute, loaded on first access
+    if name == "PHRASES":
+        return get_phrases()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def identify_language(text):
     """
-    Very simple keyword-based language detection.
+    Keyword and character n-gram based language identification.
     This simulates early-stage NLP language identification
     for low-resource languages.
+    Returns the detected language with per-language scores and a confidence.
     """
-    garhwali_markers = ["पाणी", "कैसो", "कठां", "म्यर"]
-    kumaoni_markers = ["पानी", "कसो", "कत", "म्यर"]
+    return get_language_identifier().identify(text)
 
-    for word in garhwali_markers:
-        if word in text:
-            return "garhwali"
-
-    for word in kumaoni_markers:
-        if word in text:
-            return "kumaoni"
-
-    return "unknown"
+def detect_language(text):
+    return identify_language(text)["language"]
 
 def translate(text, language=None):
     """
@@ -41,7 +122,9 @@ def translate(text, language=None):
     if not language or language == "auto":
         language = detect_language(text)
 
-    if language not in PHRASES:
+    phrases = get_phrases()
+
+    if language not in phrases:
         return {
             "hindi": "भाषा पहचानी नहीं जा सकी",
             "english": "Language could not be detected",
@@ -49,16 +132,27 @@ def translate(text, language=None):
             "language_detected": language
         }
 
-    phrases = PHRASES[language]
+    phrases = phrases[language]
+    key = get_phrase_index(language).find_longest(text)
 
-    for key in phrases:
-        if key in text:
-            return {
-                "hindi": phrases[key]["hi"],
-                "english": phrases[key]["en"],
-                "confidence": 0.85,
-                "language_detected": language
-            }
+    if key is not None:
+        return {
+            "hindi": phrases[key]["hi"],
+            "english": phrases[key]["en"],
+            "confidence": 0.85,
+            "language_detected": language
+        }
+
+    # Near miss of a whole phrase, e.g. ASR dropped a matra or a space;
+    # confidence falls with the edit distance
+    match = get_fuzzy_index(language).search(text)
+    if match is not None:
+        return {
+            "hindi": phrases[match.phrase]["hi"],
+            "english": phrases[match.phrase]["en"],
+            "confidence": round(0.85 * match.similarity, 2),
+            "language_detected": language
+        }
 
     return {
         "hindi": "अनुवाद उपलब्ध नहीं है",